@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark polityk dispatchu na nagranych rundach
+
+Odtwarza snapshoty rund (oczekujące zamówienia + dostępni kurierzy)
+zapisane przez `python main.py --record-snapshots KATALOG` i uruchamia
+na nich każdą zarejestrowaną politykę z DispatchStrategyFactory.
+
+Raport dla każdej polityki:
+- czas rozwiązania rundy (percentyle p50 / p90 / p99, w milisekundach)
+- łączny dystans dojazdu kurierów do restauracji
+- łączny koszt przydziału (w jednostkach kosztu snapshotu - ETA lub dystans)
+- liczba nieprzydzielonych zamówień (także rundy za duże dla polityki)
+
+Uruchomienie:
+    python main.py --no-visual --record-snapshots snapshots
+    python benchmark_dispatch.py snapshots
+    python benchmark_dispatch.py snapshots --policies greedy optimal --repeat 5
+"""
+
+import argparse
+import sys
+import os
+import time
+
+import numpy as np
+
+# Dodaj ścieżkę do projektu
+project_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_dir)
+
+from factories.dispatch_factory import DispatchStrategyFactory
+from services.dispatch_snapshot import list_dispatch_snapshots, load_dispatch_snapshot
+
+
+def parse_arguments():
+    """
+    Parsuje argumenty linii poleceń
+    
+    Returns:
+        argparse.Namespace: Argumenty
+    """
+    parser = argparse.ArgumentParser(description='Benchmark polityk dispatchu na nagranych rundach')
+    
+    parser.add_argument(
+        'snapshots',
+        type=str,
+        help='Katalog ze snapshotami .npz (lub pojedynczy plik)'
+    )
+    
+    parser.add_argument(
+        '--policies', '-p',
+        nargs='+',
+        choices=DispatchStrategyFactory.available_policies(),
+        default=DispatchStrategyFactory.available_policies(),
+        help='Polityki do porównania (domyślnie: wszystkie)'
+    )
+    
+    parser.add_argument(
+        '--repeat', '-r',
+        type=int,
+        default=1,
+        help='Powtórzenia każdej rundy (czas to minimum z powtórzeń)'
+    )
+    
+    return parser.parse_args()
+
+
+def benchmark_policy(name: str, snapshot_paths: list, repeat: int) -> dict:
+    """
+    Uruchamia politykę na wszystkich snapshotach
+    
+    Każde powtórzenie dostaje świeży kontekst - liczenie macierzy
+    kosztów jest częścią czasu rozwiązania, tak jak w symulacji.
+    
+    Args:
+        name: Nazwa polityki (klucz DispatchStrategyFactory)
+        snapshot_paths: Pliki snapshotów
+        repeat: Liczba powtórzeń rundy
+    
+    Returns:
+        dict: Wyniki polityki
+    """
+    strategy = DispatchStrategyFactory.create(name)
+    
+    solve_times = []
+    total_distance = 0.0
+    total_cost = 0.0
+    unassigned = 0
+    too_big = 0
+    
+    for path in snapshot_paths:
+        context = load_dispatch_snapshot(path)
+        if not strategy.can_solve(context.num_orders, context.num_couriers):
+            unassigned += context.num_orders
+            too_big += 1
+            continue
+        
+        best_time = float('inf')
+        for _ in range(max(repeat, 1)):
+            context = load_dispatch_snapshot(path)
+            started = time.perf_counter()
+            pairs = strategy.assign(context)
+            best_time = min(best_time, time.perf_counter() - started)
+        solve_times.append(best_time)
+        
+        unassigned += context.num_orders - len(pairs)
+        if pairs:
+            rows = np.array([order_index for order_index, _ in pairs])
+            cols = np.array([courier_index for _, courier_index in pairs])
+            total_distance += float(np.hypot(*(context.pickup_xy[rows] - context.courier_xy[cols]).T).sum())
+            total_cost += float(context.cost_matrix()[rows, cols].sum())
+    
+    times_ms = np.array(solve_times) * 1000
+    percentiles = np.percentile(times_ms, [50, 90, 99]) if len(times_ms) else np.zeros(3)
+    
+    return {
+        'policy': strategy.get_name(),
+        'rounds': len(solve_times),
+        'too_big': too_big,
+        'p50_ms': percentiles[0],
+        'p90_ms': percentiles[1],
+        'p99_ms': percentiles[2],
+        'total_pickup_distance': total_distance,
+        'total_cost': total_cost,
+        'unassigned_orders': unassigned
+    }
+
+
+def print_report(results: list, num_snapshots: int):
+    """
+    Wyświetla tabelę wyników
+    
+    Args:
+        results: Wyniki benchmark_policy
+        num_snapshots: Liczba snapshotów
+    """
+    print("\n" + "=" * 100)
+    print(f"BENCHMARK DISPATCHU ({num_snapshots} rund)")
+    print("=" * 100)
+    print(f"{'Polityka':<36} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'Dystans':>12} {'Koszt':>12} {'Nieprzydz.':>10}")
+    print("-" * 100)
+    for result in results:
+        print(f"{result['policy']:<36} {result['p50_ms']:>8.2f} {result['p90_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['total_pickup_distance']:>12.1f} "
+              f"{result['total_cost']:>12.1f} {result['unassigned_orders']:>10}")
+        if result['too_big']:
+            print(f"  (rundy za duże dla polityki: {result['too_big']})")
+    print("=" * 100)
+
+
+def main():
+    """Główna funkcja programu"""
+    args = parse_arguments()
+    
+    snapshot_paths = list_dispatch_snapshots(args.snapshots)
+    if not snapshot_paths:
+        print(f"[Benchmark] Brak snapshotów w {args.snapshots}")
+        return 1
+    
+    print(f"[Benchmark] Snapshoty: {len(snapshot_paths)}, polityki: {', '.join(args.policies)}")
+    
+    results = [benchmark_policy(name, snapshot_paths, args.repeat) for name in args.policies]
+    print_report(results, len(snapshot_paths))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
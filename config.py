@@ -7,6 +7,19 @@ MAP_WIDTH = 800
 MAP_HEIGHT = 600
 GRID_SIZE = 50  # rozmiar siatki dla routingu
 
+# Sieć ulic (skrzyżowania w węzłach siatki GRID_SIZE, trasy A*)
+BIKER_ROUTING = "grid"  # grid (najpierw X, potem Y) / street (graf ulic: zamknięte skrzyżowania, jednokierunkowe)
+STREET_BLOCKED_NODES = [(7, 5), (8, 5), (7, 6), (8, 6)]  # zamknięte skrzyżowania (kolumna, wiersz) - park w centrum
+STREET_ONE_WAY = [((0, 3), (16, 3)), ((12, 12), (12, 0))]  # ulice jednokierunkowe ((kolumna, wiersz) od, do)
+ROUTE_CACHE_SIZE = 4096  # max tras (skrzyżowanie -> skrzyżowanie, typ kuriera) w cache LRU
+ROUTE_TABLE_MAX_CUSTOMERS = 64  # max tablic tras do klientów z puli (LRU; 0 = tylko restauracje, z CH zawsze 0)
+STREET_CH_PATH = None  # plik indeksu hierarchii kontrakcji (.npz, budowany gdy brak) - None = bez CH (duże mapy)
+
+# Zatłoczenie ulic (liczniki kurierów w komórkach siatki GRID_SIZE)
+CONGESTION_ENABLED = False  # True = prędkość zależy od liczby kurierów w komórce
+CONGESTION_SPEED_FACTORS = (1.0, 1.0, 1.0, 0.9, 0.8, 0.7, 0.6)  # mnożnik prędkości wg liczby kurierów w komórce (ostatni dla większych)
+CONGESTION_COURIER_TYPES = ("biker",)  # typy kurierów jeżdżących ulicami (drony lecą nad korkami)
+
 # Parametry symulacji
 NUM_RESTAURANTS = 5
 NUM_COURIERS = 10
@@ -23,6 +36,41 @@ PRICE_PER_KM = 0.015  # $/jednostka - cena za dystans (dystans w pikselach!)
 COURIER_BASE_SPEED = 10.0  # jednostek/step (pikseli na krok)
 ACCIDENT_RECOVERY_TIME = 50  # steps - czas nieaktywności po wypadku
 
+# Dispatch (przydział zamówień do kurierów)
+DISPATCH_POLICY = "greedy"  # greedy (najbliższy kurier FIFO) / optimal (algorytm węgierski)
+DISPATCH_OPTIMAL_MAX_PAIRS = 40000  # max zamówienia x kurierzy dla optimal (powyżej: greedy)
+DISPATCH_GREEDY_MAX_PAIRS = 250000  # max zamówienia x kurierzy dla macierzy greedy (powyżej: indeks przestrzenny)
+DISPATCH_TIME_BUDGET_US = 2000  # budżet czasu rundy dla anytime (mikrosekundy; ulepszenia po przydziale zachłannym)
+DISPATCH_COST = "eta"  # eta (czas dojazdu wg routingu, prędkości i pogody) / distance (odległość euklidesowa)
+DISPATCH_LOOKAHEAD_ETA = 5.0  # kurier kończący dostawę w tylu krokach też jest kandydatem (0 = wyłączone)
+DISPATCH_WINDOW_STEPS = 1  # co ile kroków zbierać rundę przydziału (1 = każdy krok)
+DISPATCH_WINDOW_QUEUE_THRESHOLD = 20  # tyle oczekujących zamówień zamyka okno wcześniej
+DISPATCH_ZONES = (4, 4)  # siatka stref (kolumny, wiersze) dla rund za dużych na jedną macierz ((1, 1) = bez stref)
+DISPATCH_ZONE_WORKERS = 1  # procesy rozwiązujące strefy (1 = bez puli, w procesie głównym; None = liczba rdzeni)
+DISPATCH_AUDIT_LOG = None  # plik binarnego dziennika przydziałów (None = wyłączony)
+DISPATCH_AUDIT_BLOCK_SIZE = 4096  # rekordów w bloku zapisu dziennika
+DISPATCH_SNAPSHOT_DIR = None  # katalog snapshotów rund do benchmark_dispatch.py (None = wyłączony)
+DISPATCH_SNAPSHOT_INTERVAL = 10  # zapisuj co N-tą rundę dispatchu
+
+# Indeks przestrzenny dostępnych kurierów (dispatch)
+SPATIAL_INDEX_COURIERS_PER_CELL = 4  # docelowa liczba kurierów na kubełek siatki
+SPATIAL_INDEX_MIN_CELL_SIZE = 10.0  # minimalny rozmiar kubełka (jednostki mapy)
+
+# Ruch floty jednym wywołaniem NumPy (RoutingStrategy.advance_batch)
+BATCH_MOVE_MIN_COURIERS = 64  # mniejsze grupy kurierów jednej strategii ruszają się pojedynczo
+
+# Repozycjonowanie wolnych kurierów w stronę restauracji z popytem
+REPOSITION_ENABLED = False  # True = wolni kurierzy jadą w stronę restauracji z popytem (co REPOSITION_INTERVAL kroków)
+REPOSITION_INTERVAL = 20  # co ile kroków przeliczać cele wolnych kurierów
+REPOSITION_DEMAND_HALF_LIFE = 200  # po tylu krokach zamówienie waży połowę w popycie restauracji
+REPOSITION_ARRIVAL_RADIUS = 30.0  # kurier tak blisko restauracji zostaje na miejscu
+
+# Zmiany floty w trakcie symulacji (zmiany kurierów, dołączanie w szczycie)
+FLEET_CHANGES = []  # (krok, zmiana liczby kurierów): dodatnia = nowi kurierzy, ujemna = koniec zmiany
+
+# Odzyskiwanie zamówień po wypadku kuriera
+ORDER_MAX_REQUEUES = 3  # ile razy zamówienie może wrócić do kolejki zanim zostanie anulowane
+
 # Czas przygotowania jedzenia w restauracji
 RESTAURANT_PREPARATION_TIME_MIN = 20  # min kroków (szybka restauracja)
 RESTAURANT_PREPARATION_TIME_MAX = 50  # max kroków (wolna restauracja)
@@ -48,6 +96,15 @@ WEATHER_ACCIDENT_PROBABILITY = {
     'ice': 0.015       # 1.5% (najwyższe ryzyko)
 }
 
+# Typy kurierów uziemionych w danej pogodzie (drony nie latają w deszczu i śniegu)
+WEATHER_GROUNDED_COURIER_TYPES = {
+    'clear': (),
+    'rain': ('drone',),
+    'snow': ('drone',),
+    'frost': (),
+    'ice': ()
+}
+
 # Mnożniki ceny dla różnych warunków pogodowych
 WEATHER_PRICE_MULTIPLIERS = {
     'clear': 1.0,
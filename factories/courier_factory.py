@@ -11,6 +11,7 @@ from models.location import Location
 from states.idle_state import IdleState
 from strategies.direct_route import DirectRoute
 from strategies.grid_route import GridRoute
+from strategies.street_route import StreetRoute
 
 import config
 
@@ -39,6 +40,12 @@ class CourierFactory:
     
     _name_index = 0
     
+    # Strategie routingu rowerzystów (config.BIKER_ROUTING)
+    BIKER_ROUTING_STRATEGIES = {
+        'grid': GridRoute,
+        'street': StreetRoute
+    }
+    
     @staticmethod
     def create(location: Location = None, name: str = None, speed: float = None, routing_strategy=None) -> Courier:
         """
@@ -125,10 +132,15 @@ class CourierFactory:
     
     @staticmethod
     def create_biker() -> Courier:
-        """Tworzy rowerzystę - ulice w siatce"""
+        """Tworzy rowerzystę - ulice w siatce (GridRoute) lub w grafie ulic (StreetRoute)"""
+        if config.BIKER_ROUTING not in CourierFactory.BIKER_ROUTING_STRATEGIES:
+            raise ValueError(f"Nieznany routing rowerzystów: '{config.BIKER_ROUTING}'. "
+                             f"Dostępne: {', '.join(CourierFactory.BIKER_ROUTING_STRATEGIES)}")
+        
         location = CourierFactory._random_location()
         name = CourierFactory._generate_name()
-        courier = Courier(name + " Rower", location, 8.0, GridRoute(), courier_type="biker")
+        routing = CourierFactory.BIKER_ROUTING_STRATEGIES[config.BIKER_ROUTING]()
+        courier = Courier(name + " Rower", location, 8.0, routing, courier_type="biker")
         courier.set_state(IdleState())
         return courier
     
@@ -0,0 +1,58 @@
+"""
+Factory: Tworzy strategie przydziału zamówień (dispatch)
+
+Wzorzec Factory Method + Strategy Pattern
+"""
+
+from typing import List
+from strategies.anytime_dispatch import AnytimeDispatch
+from strategies.dispatch_strategy import DispatchStrategy
+from strategies.greedy_dispatch import GreedyDispatch
+from strategies.optimal_dispatch import OptimalDispatch
+
+
+class DispatchStrategyFactory:
+    """
+    Fabryka strategii dispatchu
+    
+    Wzorce projektowe:
+    - Factory Pattern: wybór polityki dispatchu po nazwie (CLI / config)
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko tworzenie strategii dispatchu
+    - Open/Closed: nowa polityka = nowy wpis w POLICIES
+    """
+    
+    # Nazwa polityki -> klasa strategii
+    POLICIES = {
+        'greedy': GreedyDispatch,
+        'optimal': OptimalDispatch,
+        'anytime': AnytimeDispatch
+    }
+    
+    @staticmethod
+    def create(name: str) -> DispatchStrategy:
+        """
+        Tworzy strategię dispatchu
+        
+        Args:
+            name: Nazwa polityki (klucz POLICIES)
+        
+        Returns:
+            DispatchStrategy: Strategia dispatchu
+        """
+        if name not in DispatchStrategyFactory.POLICIES:
+            raise ValueError(f"Nieznana polityka dispatchu: {name} "
+                             f"(dostępne: {', '.join(DispatchStrategyFactory.available_policies())})")
+        
+        return DispatchStrategyFactory.POLICIES[name]()
+    
+    @staticmethod
+    def available_policies() -> List[str]:
+        """
+        Zwraca nazwy dostępnych polityk
+        
+        Returns:
+            list: Nazwy polityk
+        """
+        return list(DispatchStrategyFactory.POLICIES.keys())
@@ -37,6 +37,7 @@ project_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_dir)
 
 from simulation.simulation_engine import SimulationEngine
+from factories.dispatch_factory import DispatchStrategyFactory
 import config
 
 
@@ -118,6 +119,35 @@ Przykłady:
         help='Wymuś warunek pogodowy na start (domyślnie: losowo)'
     )
     
+    parser.add_argument(
+        '--dispatch', '-d',
+        type=str,
+        choices=DispatchStrategyFactory.available_policies(),
+        default=config.DISPATCH_POLICY,
+        help=f'Polityka przydziału zamówień (domyślnie: {config.DISPATCH_POLICY})'
+    )
+    
+    parser.add_argument(
+        '--trace', '-t',
+        type=str,
+        default=None,
+        help='Odtwórz zamówienia z pliku CSV/.npy (step, restaurant_id, customer_x, customer_y)'
+    )
+    
+    parser.add_argument(
+        '--audit-log', '-a',
+        type=str,
+        default=config.DISPATCH_AUDIT_LOG,
+        help='Zapisuj przydziały dispatchu do binarnego dziennika (analiza offline)'
+    )
+    
+    parser.add_argument(
+        '--record-snapshots',
+        type=str,
+        default=config.DISPATCH_SNAPSHOT_DIR,
+        help='Zapisuj rundy dispatchu do katalogu (.npz) dla benchmark_dispatch.py'
+    )
+    
     return parser.parse_args()
 
 
@@ -182,8 +212,15 @@ def main():
     print(f"  • Kroki:        {steps_info}")
     print(f"  • Kurierzy:     {args.couriers}")
     print(f"  • Restauracje:  {args.restaurants}")
+    print(f"  • Dispatch:     {args.dispatch}")
     print(f"  • Wizualizacja: {'NIE' if args.no_visual else 'TAK (Pygame)'}")
     print(f"  • Prędkość:     {args.speed}x")
+    if args.trace:
+        print(f"  • Zamówienia:   z pliku {args.trace}")
+    if args.audit_log:
+        print(f"  • Dziennik:     {args.audit_log}")
+    if args.record_snapshots:
+        print(f"  • Snapshoty:    {args.record_snapshots}")
     if args.weather:
         print(f"  • Pogoda:       {args.weather} (wymuszona)")
     else:
@@ -195,7 +232,11 @@ def main():
         engine = SimulationEngine(
             num_couriers=args.couriers,
             num_restaurants=args.restaurants,
-            time_scale=args.speed
+            time_scale=args.speed,
+            order_trace_path=args.trace,
+            dispatch_policy=args.dispatch,
+            dispatch_audit_path=args.audit_log,
+            dispatch_snapshot_dir=args.record_snapshots
         )
         
         # Ustaw pogodę jeśli wymuszono
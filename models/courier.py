@@ -5,13 +5,14 @@ Reprezentuje kuriera dostarczającego zamówienia.
 Wykorzystuje wzorzec State do zarządzania stanami kuriera.
 """
 
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 from models.location import Location
 
 # Unikamy circular imports
 if TYPE_CHECKING:
     from states.courier_state import CourierState
     from models.order import Order
+    from routing.route_leg import RouteLeg
 
 
 class Courier:
@@ -44,8 +45,9 @@ class Courier:
         self.id = Courier._id_counter
         
         self.name = name
-        self.location = location
+        self.location = location.copy()  # Własna kopia - przesuwana w miejscu
         self.base_speed = base_speed
+        self.speed_factor = 1.0  # mnożnik prędkości z zatłoczenia ulic (CongestionMap)
         self.courier_type = courier_type  # NOWE - typ kuriera dla wizualizacji
         
         # Strategia routingu (Strategy Pattern!)
@@ -57,11 +59,24 @@ class Courier:
         # Stan (ustawiany przez Factory)
         self._state: Optional['CourierState'] = None
         
+        # Obserwator zmian stanu (CourierManager utrzymuje zbiory dostępnych/aktywnych)
+        self._state_listener = None
+        
         # Aktualne zamówienie (jeśli przypisane)
         self.current_order: Optional['Order'] = None
         
-        # Cel ruchu (zależny od stanu)
-        self.target_location: Optional[Location] = None
+        # Cel ruchu (zależny od stanu) i pozostały dystans do niego wg strategii routingu
+        self._target_location: Optional[Location] = None
+        self.remaining_distance = 0.0
+        
+        # Odcinek trasy do celu liczony raz (strategie z plan_leg, np. sieć ulic)
+        self._leg: Optional['RouteLeg'] = None
+        
+        # Krok policzony zbiorczo dla floty (CourierManager) - (x, y, przebyty dystans)
+        self._batch_step: Optional[Tuple[float, float, float]] = None
+        
+        # Zamówienie w kolejce - podjęte zaraz po bieżącej dostawie (look-ahead dispatch)
+        self.next_order: Optional['Order'] = None
         
         # Statystyki
         self.total_deliveries = 0
@@ -84,8 +99,21 @@ class Courier:
         Args:
             state: Nowy stan
         """
+        previous_state = self._state
         self._state = state
         self._state.on_enter(self)
+        
+        if self._state_listener is not None:
+            self._state_listener.on_courier_state_changed(self, previous_state, state)
+    
+    def set_state_listener(self, listener):
+        """
+        Ustawia obserwatora zmian stanu
+        
+        Args:
+            listener: Obiekt z metodą on_courier_state_changed(courier, previous, state)
+        """
+        self._state_listener = listener
     
     def update(self, weather_condition):
         """
@@ -97,6 +125,9 @@ class Courier:
         if self._state:
             self._state.update(self, weather_condition)
     
+        # Krok zbiorczy ważny tylko w tym kroku (np. po wypadku nieużyty)
+        self._batch_step = None
+    
     def assign_order(self, order: 'Order'):
         """
         Przypisuje zamówienie do kuriera
@@ -123,6 +154,61 @@ class Courier:
         """Rejestruje wypadek kuriera"""
         self.accidents += 1
     
+    @property
+    def target_location(self) -> Optional[Location]:
+        """Cel ruchu (zależny od stanu)"""
+        return self._target_location
+    
+    @target_location.setter
+    def target_location(self, location: Optional[Location]):
+        """Zmiana celu unieważnia odcinek trasy - nowy liczony przy następnym ruchu"""
+        if location is not self._target_location:
+            self._target_location = location
+            self._leg = None
+            self._batch_step = None
+    
+    def set_target(self, location: Optional[Location]):
+        """
+        Ustawia cel ruchu i liczy dystans do niego (raz, na początku odcinka)
+        
+        Args:
+            location: Nowy cel (None = brak celu)
+        """
+        self.target_location = location
+        if location is None:
+            self.remaining_distance = 0.0
+            return
+        
+        self._leg = self.routing_strategy.plan_leg(self.location, location)
+        if self._leg is not None:
+            self.remaining_distance = self._leg.length
+        else:
+            self.remaining_distance = self.routing_strategy.calculate_distance(self.location, location)
+    
+    def current_speed(self, weather_condition) -> float:
+        """
+        Prędkość w tym kroku: bazowa z modyfikatorem pogody i zatłoczenia
+        
+        Args:
+            weather_condition: Aktualny warunek pogodowy
+        
+        Returns:
+            float: Prędkość (jednostek/krok)
+        """
+        return self.base_speed * weather_condition.get_speed_multiplier() * self.speed_factor
+    
+    def remaining_eta(self, speed_multiplier: float = 1.0) -> float:
+        """
+        Szacowany czas (w krokach) do osiągnięcia bieżącego celu
+        
+        Args:
+            speed_multiplier: Mnożnik prędkości (pogoda)
+        
+        Returns:
+            float: Liczba kroków
+        """
+        return self.remaining_distance / (self.base_speed * speed_multiplier)
+    
     def move_towards_target(self, speed: float):
         """
         Przesuwa kuriera w kierunku celu UŻYWAJĄC STRATEGII ROUTINGU
@@ -133,18 +219,75 @@ class Courier:
         - Rowerzysta: po gridzie ulic (GridRoute)
         - Samochód: autostrada (HighwayRoute)
         
+        Lokalizacja jest przesuwana w miejscu, a strategia zwraca przebyty
+        dystans - krok kuriera to kilka operacji na liczbach, bez alokacji.
+        Strategie z odcinkiem trasy (plan_leg) liczą trasę raz na początku
+        odcinka, a krok to tylko przesunięcie postępu na łamanej.
+        Przy dużej flocie krok liczy wcześniej CourierManager dla wszystkich
+        kurierów strategii naraz (set_batch_step) - tu jest tylko przepisywany.
+        
         Args:
             speed: Prędkość ruchu (zmodyfikowana przez pogodę)
         """
         if self.target_location:
-            distance_moved = speed
-            old_location = self.location
+            if self._batch_step is not None:
+                # Krok policzony już dla całej floty (RoutingStrategy.advance_batch)
+                self.location.x, self.location.y, distance_moved = self._batch_step
+                self._batch_step = None
+                self.total_distance_traveled += distance_moved
+                self.remaining_distance = max(0.0, self.remaining_distance - distance_moved)
+                return
+            
+            if self.ensure_leg():
+                distance_moved = self._leg.advance(self.location, speed)
+                self.total_distance_traveled += distance_moved
+                self.remaining_distance = self._leg.remaining
+                return
+            
             # NOWE - używamy routing_strategy do poruszania się!
-            self.location = self.routing_strategy.move_towards(self.location, self.target_location, distance_moved)
+            distance_moved = self.routing_strategy.advance(self.location, self.target_location, speed)
             
-            # Aktualizuj statystykę dystansu
-            actual_distance = old_location.distance_to(self.location)
-            self.total_distance_traveled += actual_distance
+            # Aktualizuj statystykę dystansu (wzdłuż trasy strategii)
+            self.total_distance_traveled += distance_moved
+            
+            # Strategia przesuwa o `speed` wzdłuż swojej trasy (mniej tylko na końcu)
+            self.remaining_distance = max(0.0, self.remaining_distance - distance_moved)
+    
+    def ensure_leg(self) -> bool:
+        """
+        Wyznacza odcinek trasy do celu, jeśli strategia go używa (plan_leg)
+        
+        Returns:
+            bool: True gdy kurier jedzie po odcinku trasy (bez kroku advance)
+        """
+        if self._leg is None and self.target_location is not None:
+            self._leg = self.routing_strategy.plan_leg(self.location, self.target_location)
+        return self._leg is not None
+    
+    def set_batch_step(self, x: float, y: float, distance_moved: float):
+        """
+        Zapamiętuje krok policzony zbiorczo - użyty przez move_towards_target w tym kroku
+        
+        Args:
+            x: Nowa współrzędna X
+            y: Nowa współrzędna Y
+            distance_moved: Przebyty dystans wzdłuż trasy strategii
+        """
+        self._batch_step = (x, y, distance_moved)
+    
+    def estimate_time_to(self, location: Location, speed_multiplier: float = 1.0) -> float:
+        """
+        Szacowany czas dotarcia (w krokach) zgodnie ze strategią routingu
+        
+        Args:
+            location: Cel
+            speed_multiplier: Mnożnik prędkości (pogoda)
+        
+        Returns:
+            float: Liczba kroków
+        """
+        distance = self.routing_strategy.calculate_distance(self.location, location)
+        return distance / (self.base_speed * speed_multiplier)
     
     def has_reached_target(self, threshold: float = 5.0) -> bool:
         """
@@ -159,7 +302,12 @@ class Courier:
         if self.target_location is None:
             return False
         
-        return self.location.distance_to(self.target_location) < threshold
+        # Odcinek trasy - dotarcie to koniec łamanej
+        if self._leg is not None:
+            return self._leg.finished
+        
+        # Kwadraty odległości - bez sqrt
+        return self.location.distance_squared_to(self.target_location) < threshold * threshold
     
     @property
     def state_name(self) -> str:
@@ -12,10 +12,15 @@ class Location:
     """
     Reprezentuje punkt na mapie 2D
     
+    Klasa ze __slots__ (bez słownika atrybutów) - lokalizacja kuriera jest
+    przesuwana w miejscu w każdym kroku symulacji, bez tworzenia obiektów.
+    
     Zasady SOLID:
     - Single Responsibility: tylko reprezentacja lokalizacji i podstawowe operacje
     """
     
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float, y: float):
         """
         Inicjalizuje lokalizację
@@ -41,6 +46,20 @@ class Location:
         dy = self.y - other.y
         return math.sqrt(dx * dx + dy * dy)
     
+    def distance_squared_to(self, other: 'Location') -> float:
+        """
+        Kwadrat odległości euklidesowej (porównania bez sqrt)
+        
+        Args:
+            other: Docelowa lokalizacja
+            
+        Returns:
+            float: Kwadrat odległości
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+    
     def manhattan_distance_to(self, other: 'Location') -> float:
         """
         Oblicza odległość Manhattan do innej lokalizacji
@@ -64,18 +83,45 @@ class Location:
         Returns:
             Location: Nowa lokalizacja
         """
-        current_distance = self.distance_to(target)
+        moved = self.copy()
+        moved.advance_towards(target, distance)
+        return moved
         
-        # Jeśli jesteśmy wystarczająco blisko, zwróć cel
+    def advance_towards(self, target: 'Location', distance: float) -> float:
+        """
+        Przesuwa tę lokalizację (w miejscu) w linii prostej w kierunku celu
+        
+        Args:
+            target: Cel ruchu
+            distance: Maksymalny dystans przesunięcia
+            
+        Returns:
+            float: Faktycznie przebyty dystans (mniejszy tylko przy dotarciu do celu)
+        """
+        dx = target.x - self.x
+        dy = target.y - self.y
+        current_distance = math.sqrt(dx * dx + dy * dy)
+        
+        # Jeśli jesteśmy wystarczająco blisko, stań w celu
         if current_distance <= distance:
-            return Location(target.x, target.y)
+            self.x = target.x
+            self.y = target.y
+            return current_distance
         
-        # Oblicz wektor kierunku (znormalizowany)
+        # Przesuń o znormalizowany wektor kierunku
         ratio = distance / current_distance
-        new_x = self.x + (target.x - self.x) * ratio
-        new_y = self.y + (target.y - self.y) * ratio
+        self.x += dx * ratio
+        self.y += dy * ratio
+        return distance
+        
+    def copy(self) -> 'Location':
+        """
+        Kopia lokalizacji (niezależna od przesunięć oryginału)
         
-        return Location(new_x, new_y)
+        Returns:
+            Location: Nowa lokalizacja o tych samych współrzędnych
+        """
+        return Location(self.x, self.y)
     
     def to_tuple(self) -> Tuple[float, float]:
         """
@@ -9,6 +9,7 @@ from typing import Optional
 from models.location import Location
 from models.restaurant import Restaurant
 from models.customer import Customer
+import config
 
 
 class OrderStatus:
@@ -73,6 +74,10 @@ class Order:
         # Kurier (przypisany później)
         self.courier_id: Optional[int] = None
         
+        # Odzyskiwanie po wypadku kuriera
+        self.requeue_count = 0  # ile razy wróciło do kolejki (priorytet)
+        self.recovery_location: Optional[Location] = None  # miejsce wypadku z jedzeniem
+        
         # Rejestruj w restauracji i u klienta
         restaurant.register_order()
         customer.register_order()
@@ -106,9 +111,50 @@ class Order:
         """Anuluje zamówienie (np. wypadek kuriera)"""
         self.status = OrderStatus.CANCELLED
     
+    def release(self):
+        """
+        Zwalnia zamówienie czekające w kolejce kuriera (bez liczenia powrotu)
+        
+        Kurier miał wypadek zanim zaczął to zamówienie - jedzenie nadal
+        czeka w restauracji, więc nie jest to utrata zamówienia.
+        """
+        self.status = OrderStatus.PENDING
+        self.courier_id = None
+        self.assigned_at = None
+    
+    def requeue(self, recovery_location: Optional[Location] = None) -> bool:
+        """
+        Przywraca zamówienie do kolejki po wypadku kuriera
+        
+        Zamówienie nieodebrane wraca jako zwykłe PENDING. Zamówienie już
+        odebrane czeka na nowego kuriera w miejscu wypadku (recovery_location).
+        Po przekroczeniu ORDER_MAX_REQUEUES zamówienie jest anulowane.
+        
+        Args:
+            recovery_location: Miejsce wypadku (None = odbiór z restauracji)
+            
+        Returns:
+            bool: True jeśli wróciło do kolejki, False jeśli anulowane
+        """
+        if self.requeue_count >= config.ORDER_MAX_REQUEUES:
+            self.cancel()
+            return False
+        
+        self.requeue_count += 1
+        self.status = OrderStatus.PENDING
+        self.courier_id = None
+        self.assigned_at = None
+        
+        if recovery_location is not None:
+            self.recovery_location = recovery_location
+        
+        return True
+    
     @property
     def pickup_location(self) -> Location:
-        """Lokalizacja odbioru (restauracja)"""
+        """Lokalizacja odbioru (restauracja lub miejsce wypadku poprzedniego kuriera)"""
+        if self.recovery_location is not None:
+            return self.recovery_location
         return self.restaurant.location
     
     @property
@@ -24,6 +24,7 @@ class OrderTracker(Observer):
         self.total_orders = 0
         self.delivered_orders = 0
         self.cancelled_orders = 0
+        self.requeued_orders = 0  # powroty do kolejki po wypadkach
         self.pending_orders = 0
         
         # Lista czasów dostaw (w sekundach)
@@ -55,6 +56,12 @@ class OrderTracker(Observer):
         
         elif event_type == 'order_cancelled':
             self._handle_order_cancelled(event)
+        
+        elif event_type == 'order_requeued':
+            self._handle_order_requeued(event)
+    
+        elif event_type == 'order_released':
+            self._handle_order_released(event)
     
     def _handle_order_created(self, event: Dict[str, Any]):
         """Obsługuje utworzenie zamówienia"""
@@ -96,6 +103,22 @@ class OrderTracker(Observer):
         if order_id in self.active_orders:
             del self.active_orders[order_id]
     
+    def _handle_order_requeued(self, event: Dict[str, Any]):
+        """Obsługuje powrót zamówienia do kolejki (wypadek kuriera)"""
+        self.requeued_orders += 1
+        
+        order_id = event.get('order_id')
+        if order_id in self.active_orders:
+            self.active_orders[order_id] = 'pending'
+            self.pending_orders += 1
+    
+    def _handle_order_released(self, event: Dict[str, Any]):
+        """Obsługuje zwolnienie zamówienia z kolejki kuriera (bez liczenia powrotu)"""
+        order_id = event.get('order_id')
+        if order_id in self.active_orders:
+            self.active_orders[order_id] = 'pending'
+            self.pending_orders += 1
+    
     def get_average_delivery_time(self) -> float:
         """
         Oblicza średni czas dostawy
@@ -119,6 +142,7 @@ class OrderTracker(Observer):
             'total_orders': self.total_orders,
             'delivered_orders': self.delivered_orders,
             'cancelled_orders': self.cancelled_orders,
+            'requeued_orders': self.requeued_orders,
             'pending_orders': self.pending_orders,
             'active_orders': len(self.active_orders),
             'average_delivery_time': self.get_average_delivery_time(),
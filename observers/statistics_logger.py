@@ -87,11 +87,30 @@ class StatisticsLogger(Observer):
                    f"Courier: {event.get('courier_name')} | "
                    f"Earnings: ${event.get('earnings', 0):.2f}")
         
+        elif event_type == 'order_requeued':
+            where = "accident site" if event.get('picked_up') else "restaurant"
+            return (f"[{timestamp}] ORDER REQUEUED: #{event.get('order_id')} | "
+                   f"Courier: {event.get('courier_name')} | "
+                   f"Pickup: {where} | "
+                   f"Requeues: {event.get('requeue_count')}")
+        
+        elif event_type == 'order_released':
+            return (f"[{timestamp}] ORDER RELEASED: #{event.get('order_id')} | "
+                   f"Courier: {event.get('courier_name')}")
+        
         elif event_type == 'accident':
             return (f"[{timestamp}] 🚨 ACCIDENT: Courier {event.get('courier_name')} | "
                    f"Weather: {event.get('weather')} | "
                    f"Location: ({event.get('location_x', 0):.0f}, {event.get('location_y', 0):.0f})")
         
+        elif event_type == 'courier_added':
+            return (f"[{timestamp}] COURIER ADDED: {event.get('courier_name')} | "
+                   f"Fleet: {event.get('fleet_size')}")
+        
+        elif event_type == 'courier_retired':
+            return (f"[{timestamp}] COURIER RETIRED: {event.get('courier_name')} | "
+                   f"Fleet: {event.get('fleet_size')}")
+        
         elif event_type == 'weather_change':
             return (f"[{timestamp}] ⛅ WEATHER CHANGE: {event.get('display_name')} | "
                    f"Step: {event.get('step')}")
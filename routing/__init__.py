@@ -0,0 +1 @@
+"""Sieć ulic i wyszukiwanie tras (graf CSR, A*)"""
@@ -0,0 +1,130 @@
+"""
+Wyszukiwanie tras w grafie ulic (A* z heurystyką Manhattan)
+
+Heurystyka Manhattan jest dopuszczalna i spójna: krawędź łączy sąsiednie
+skrzyżowania siatki, więc żadna trasa nie jest krótsza niż dystans
+Manhattan między jej końcami.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from routing.street_graph import StreetGraph
+
+
+def astar(graph: StreetGraph, sources: Dict[int, float], targets: Dict[int, float]) -> Tuple[float, List[int]]:
+    """
+    Najkrótsza trasa z jednego z węzłów startowych do jednego z węzłów docelowych
+    
+    Kilka węzłów startowych (rogi kwartału, w którym stoi kurier) z kosztem
+    dojazdu do nich i kilka docelowych (rogi kwartału celu) z kosztem
+    dojazdu od nich do celu - A* wybiera najlepszą parę. Heurystyka to
+    minimum po celach z dystansu Manhattan do celu plus kosztu dojazdu.
+    
+    Args:
+        graph: Graf ulic
+        sources: Węzeł startowy -> koszt dojazdu do niego
+        targets: Węzeł docelowy -> koszt dojazdu od niego do celu
+    
+    Returns:
+        tuple: (długość trasy z dojazdami, lista węzłów) lub (inf, []) gdy cel jest nieosiągalny
+    """
+    node_x, node_y = graph.node_x, graph.node_y
+    exits = [(node_x[node], node_y[node], cost) for node, cost in targets.items()]
+    
+    def estimate(node: int) -> float:
+        x, y = node_x[node], node_y[node]
+        return min(abs(x - exit_x) + abs(y - exit_y) + cost for exit_x, exit_y, cost in exits)
+    
+    best: Dict[int, float] = {}
+    parent: Dict[int, int] = {}
+    heap = []
+    for node, cost in sources.items():
+        best[node] = cost
+        parent[node] = -1
+        heapq.heappush(heap, (cost + estimate(node), cost, node))
+    
+    # Wpis z ujemnym numerem -1 - n to dojechanie do celu od węzła docelowego n
+    closed = set()
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node < 0:
+            path = [-1 - node]
+            while parent[path[-1]] != -1:
+                path.append(parent[path[-1]])
+            path.reverse()
+            return cost, path
+        if node in closed:
+            continue
+        closed.add(node)
+        
+        if node in targets:
+            finish_cost = cost + targets[node]
+            heapq.heappush(heap, (finish_cost, finish_cost, -1 - node))
+        
+        for neighbor, length in graph.neighbors(node):
+            new_cost = cost + length
+            if new_cost < best.get(neighbor, math.inf):
+                best[neighbor] = new_cost
+                parent[neighbor] = node
+                heapq.heappush(heap, (new_cost + estimate(neighbor), new_cost, neighbor))
+    
+    return math.inf, []
+
+
+def distances_to(graph: StreetGraph, targets: Dict[int, float]) -> np.ndarray:
+    """
+    Długości najkrótszych tras ze wszystkich węzłów do celu
+    
+    Dijkstra na grafie odwróconym - jeden przebieg zamiast A* dla każdej
+    pary (np. macierz kosztów dispatchu: wielu kurierów, jedna restauracja).
+    
+    Args:
+        graph: Graf ulic
+        targets: Węzeł docelowy -> koszt dojazdu od niego do celu
+    
+    Returns:
+        np.ndarray: Odległość każdego węzła do celu (inf = nieosiągalny)
+    """
+    return shortest_path_tree(graph, targets, reverse=True)[0]
+
+
+def shortest_path_tree(graph: StreetGraph, seeds: Dict[int, float],
+                       reverse: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drzewo najkrótszych tras (Dijkstra) od punktu lub do punktu
+    
+    reverse=False: trasy z seeds do wszystkich węzłów, via[n] to poprzednik
+    n na trasie. reverse=True: trasy ze wszystkich węzłów do seeds (graf
+    odwrócony), via[n] to następny węzeł trasy z n. Węzły seeds mają via -1.
+    
+    Args:
+        graph: Graf ulic
+        seeds: Węzeł początkowy (końcowy dla reverse) -> koszt dojazdu
+        reverse: Czy liczyć trasy do seeds zamiast z seeds
+    
+    Returns:
+        tuple: (odległości (N,) - inf = nieosiągalny, via (N,) int32)
+    """
+    adjacency = graph.reverse_neighbors if reverse else graph.neighbors
+    distance = [math.inf] * graph.num_nodes
+    via = [-1] * graph.num_nodes
+    heap = []
+    for node, cost in seeds.items():
+        distance[node] = cost
+        heap.append((cost, node))
+    heapq.heapify(heap)
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if cost > distance[node]:
+            continue
+        for neighbor, length in adjacency(node):
+            new_cost = cost + length
+            if new_cost < distance[neighbor]:
+                distance[neighbor] = new_cost
+                via[neighbor] = node
+                heapq.heappush(heap, (new_cost, neighbor))
+    return np.array(distance), np.array(via, dtype=np.int32)
@@ -0,0 +1,460 @@
+"""
+Hierarchia kontrakcji (Contraction Hierarchies) dla dużych grafów ulic
+
+Przy mapie w skali miasta A* dla każdego odcinka staje się wąskim gardłem.
+Indeks budowany jest raz dla mapy: węzły są "kontraktowane" w kolejności
+ważności, a w miejsce usuniętych tras dodawane są skróty. Zapytanie to
+dwa małe przeszukiwania "w górę" hierarchii (od startu i od celu), które
+spotykają się w najważniejszym węźle trasy - zamiast przeszukiwania
+całego grafu.
+
+- distance(): sama długość trasy (ETA dispatchu, cena) - bez rozwijania skrótów
+- route(): trasa ze skrzyżowaniami - skróty rozwijane dopiero, gdy kurier
+  rusza w drogę
+- distance_matrix(): wiele startów x wiele celów (kubełki celów)
+
+Indeks zapisywany jest do pliku .npz razem z odciskiem grafu - zmiana
+mapy (zamknięte skrzyżowania, ulice jednokierunkowe) wymusza przebudowę.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+from routing.street_graph import StreetGraph
+
+
+class ContractionHierarchy:
+    """
+    Indeks CH: ranga węzłów i grafy krawędzi "w górę" w formacie CSR
+    
+    Krawędź (także skrót) u -> w trafia do grafu w przód węzła u, gdy
+    rank[w] > rank[u], a w przeciwnym razie do grafu wstecz węzła w
+    (przeszukiwanie od celu idzie po niej od w do u). middle to węzeł
+    pominięty przez skrót (-1 = zwykła ulica).
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko indeks i zapytania o najkrótsze trasy
+    """
+    
+    # Limit węzłów rozstrzyganych w przeszukiwaniu świadka przy kontrakcji
+    WITNESS_SETTLE_LIMIT = 60
+    
+    _default: Optional['ContractionHierarchy'] = None
+    
+    def __init__(
+        self,
+        rank: np.ndarray,
+        forward: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        backward: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        fingerprint: str
+    ):
+        """
+        Args:
+            rank: Ranga węzłów (N,) - kolejność kontrakcji
+            forward: Graf w przód (indptr, indices, weights, middle)
+            backward: Graf wstecz (indptr, indices, weights, middle)
+            fingerprint: Odcisk grafu, dla którego zbudowano indeks
+        """
+        self.rank = rank
+        self.forward = forward
+        self.backward = backward
+        self.fingerprint = fingerprint
+        self.num_nodes = len(rank)
+        
+        # Listy sąsiedztwa dla pętli zapytań i słownik skrótów do rozwijania tras
+        self._up = self._adjacency_lists(*forward[:3])
+        self._down = self._adjacency_lists(*backward[:3])
+        self._middle: Dict[Tuple[int, int], int] = {}
+        for source, (indptr, indices, _, middle) in ((True, forward), (False, backward)):
+            bounds, targets, middles = indptr.tolist(), indices.tolist(), middle.tolist()
+            for node in range(self.num_nodes):
+                for edge in range(bounds[node], bounds[node + 1]):
+                    if middles[edge] >= 0:
+                        key = (node, targets[edge]) if source else (targets[edge], node)
+                        self._middle[key] = middles[edge]
+    
+    @classmethod
+    def default(cls) -> Optional['ContractionHierarchy']:
+        """
+        Indeks CH grafu ulic mapy (STREET_CH_PATH; None = CH wyłączone)
+        
+        Returns:
+            ContractionHierarchy: Wczytany lub zbudowany indeks, albo None
+        """
+        if cls._default is None and config.STREET_CH_PATH:
+            cls._default = cls.for_graph(StreetGraph.default(), config.STREET_CH_PATH)
+        return cls._default
+    
+    @classmethod
+    def for_graph(cls, graph: StreetGraph, path: str) -> 'ContractionHierarchy':
+        """
+        Wczytuje indeks z pliku, a gdy go brak lub jest dla innego grafu - buduje i zapisuje
+        
+        Args:
+            graph: Graf ulic
+            path: Ścieżka do pliku .npz
+        
+        Returns:
+            ContractionHierarchy: Indeks zgodny z grafem
+        """
+        if os.path.exists(path):
+            hierarchy = cls.load(path)
+            if hierarchy.fingerprint == graph_fingerprint(graph):
+                print(f"[CH] Wczytano indeks {path} ({hierarchy.num_shortcuts} skrótów)")
+                return hierarchy
+            print(f"[CH] Indeks {path} jest dla innego grafu - przebudowa")
+        
+        hierarchy = cls.build(graph)
+        hierarchy.save(path)
+        print(f"[CH] Zbudowano indeks {path} ({hierarchy.num_shortcuts} skrótów)")
+        return hierarchy
+    
+    @classmethod
+    def build(cls, graph: StreetGraph) -> 'ContractionHierarchy':
+        """
+        Buduje indeks: kontrakcja węzłów w kolejności różnicy krawędzi
+        
+        Priorytet węzła to podwojona różnica krawędzi (dodane skróty minus
+        usunięte krawędzie) plus liczba już kontraktowanych sąsiadów i ich
+        poziom w hierarchii - mapa kontraktowana jest równomiernie, co na
+        siatce ulic skraca przeszukiwania w górę. Priorytety są aktualizowane
+        leniwie przy zdjęciu węzła z kolejki.
+        
+        Args:
+            graph: Graf ulic
+        
+        Returns:
+            ContractionHierarchy: Nowy indeks
+        """
+        n = graph.num_nodes
+        # Krawędzie (także skróty): węzeł -> {sąsiad: (długość, węzeł pośredni)}
+        out_edges: List[Dict[int, Tuple[float, int]]] = [
+            {neighbor: (length, -1) for neighbor, length in graph.neighbors(node)} for node in range(n)
+        ]
+        in_edges: List[Dict[int, Tuple[float, int]]] = [
+            {previous: (length, -1) for previous, length in graph.reverse_neighbors(node)} for node in range(n)
+        ]
+        contracted = [False] * n
+        deleted_neighbors = [0] * n
+        level = [0] * n
+        rank = np.zeros(n, dtype=np.int32)
+        
+        def shortcuts_of(node: int) -> List[Tuple[int, int, float]]:
+            shortcuts = []
+            incoming = [(u, w) for u, (w, _) in in_edges[node].items() if not contracted[u]]
+            outgoing = [(v, w) for v, (w, _) in out_edges[node].items() if not contracted[v]]
+            if not incoming or not outgoing:
+                return shortcuts
+            max_out = max(length for _, length in outgoing)
+            for source, in_length in incoming:
+                limit = in_length + max_out
+                witness = _witness_distances(out_edges, contracted, source, node, limit,
+                                             cls.WITNESS_SETTLE_LIMIT)
+                for target, out_length in outgoing:
+                    if target == source:
+                        continue
+                    via = in_length + out_length
+                    if witness.get(target, math.inf) > via:
+                        shortcuts.append((source, target, via))
+            return shortcuts
+        
+        def priority(node: int) -> int:
+            removed = (sum(1 for u in in_edges[node] if not contracted[u]) +
+                       sum(1 for v in out_edges[node] if not contracted[v]))
+            return 2 * (len(shortcuts_of(node)) - removed) + deleted_neighbors[node] + level[node]
+        
+        heap = [(priority(node), node) for node in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, node = heapq.heappop(heap)
+            if contracted[node]:
+                continue
+            current = priority(node)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+            
+            for source, target, length in shortcuts_of(node):
+                if length < out_edges[source].get(target, (math.inf, -1))[0]:
+                    out_edges[source][target] = (length, node)
+                    in_edges[target][source] = (length, node)
+            
+            contracted[node] = True
+            rank[node] = order
+            order += 1
+            for neighbor in set(in_edges[node]) | set(out_edges[node]):
+                deleted_neighbors[neighbor] += 1
+                level[neighbor] = max(level[neighbor], level[node] + 1)
+        
+        forward, backward = [], []
+        for source in range(n):
+            for target, (length, middle) in out_edges[source].items():
+                if rank[target] > rank[source]:
+                    forward.append((source, target, length, middle))
+                else:
+                    backward.append((target, source, length, middle))
+        
+        return cls(rank, _to_csr(forward, n), _to_csr(backward, n), graph_fingerprint(graph))
+    
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        """
+        Wczytuje indeks z pliku .npz
+        
+        Args:
+            path: Ścieżka do pliku zapisanego przez save()
+        
+        Returns:
+            ContractionHierarchy: Indeks
+        """
+        with np.load(path) as data:
+            return cls(
+                data['rank'],
+                tuple(data[f'forward_{name}'] for name in ('indptr', 'indices', 'weights', 'middle')),
+                tuple(data[f'backward_{name}'] for name in ('indptr', 'indices', 'weights', 'middle')),
+                str(data['fingerprint'])
+            )
+    
+    def save(self, path: str):
+        """
+        Zapisuje indeks do pliku .npz
+        
+        Args:
+            path: Ścieżka do pliku
+        """
+        arrays = {'rank': self.rank, 'fingerprint': np.array(self.fingerprint)}
+        for prefix, csr in (('forward', self.forward), ('backward', self.backward)):
+            for name, array in zip(('indptr', 'indices', 'weights', 'middle'), csr):
+                arrays[f'{prefix}_{name}'] = array
+        np.savez_compressed(path, **arrays)
+    
+    @property
+    def num_shortcuts(self) -> int:
+        """Liczba skrótów w indeksie"""
+        return len(self._middle)
+    
+    def distance(self, sources: Dict[int, float], targets: Dict[int, float]) -> float:
+        """
+        Długość najkrótszej trasy (bez rozwijania skrótów)
+        
+        Args:
+            sources: Węzeł startowy -> koszt dojazdu do niego
+            targets: Węzeł docelowy -> koszt dojazdu od niego do celu
+        
+        Returns:
+            float: Długość trasy (inf = nieosiągalny)
+        """
+        return self._search(sources, targets)[0]
+    
+    def route(self, sources: Dict[int, float], targets: Dict[int, float]) -> Tuple[float, List[int]]:
+        """
+        Najkrótsza trasa z rozwiniętymi skrótami
+        
+        Args:
+            sources: Węzeł startowy -> koszt dojazdu do niego
+            targets: Węzeł docelowy -> koszt dojazdu od niego do celu
+        
+        Returns:
+            tuple: (długość trasy, skrzyżowania) lub (inf, []) gdy cel jest nieosiągalny
+        """
+        length, meet, forward_parent, backward_parent = self._search(sources, targets)
+        if meet < 0:
+            return math.inf, []
+        
+        up_path = [meet]
+        while forward_parent[up_path[-1]] != -1:
+            up_path.append(forward_parent[up_path[-1]])
+        up_path.reverse()
+        down_path = [meet]
+        while backward_parent[down_path[-1]] != -1:
+            down_path.append(backward_parent[down_path[-1]])
+        
+        hierarchy_path = up_path + down_path[1:]
+        nodes = [hierarchy_path[0]]
+        for source, target in zip(hierarchy_path, hierarchy_path[1:]):
+            self._unpack(source, target, nodes)
+        return length, nodes
+    
+    def distance_matrix(self, sources: Sequence[Dict[int, float]],
+                        targets: Sequence[Dict[int, float]]) -> np.ndarray:
+        """
+        Długości tras wszystkich par (wiele startów x wiele celów)
+        
+        Przeszukiwanie wstecz od każdego celu zostawia w węzłach kubełki
+        (cel, odległość); przeszukiwanie w przód od startu sprawdza kubełki
+        odwiedzonych węzłów - jedno małe przeszukiwanie na punkt.
+        
+        Args:
+            sources: Dla każdego startu: węzeł -> koszt dojazdu
+            targets: Dla każdego celu: węzeł -> koszt dojazdu od węzła do celu
+        
+        Returns:
+            np.ndarray: Macierz (len(targets), len(sources))
+        """
+        buckets: Dict[int, List[Tuple[int, float]]] = {}
+        for target_index, target in enumerate(targets):
+            for node, cost in _upward_distances(self._down, target).items():
+                buckets.setdefault(node, []).append((target_index, cost))
+        
+        matrix = np.full((len(targets), len(sources)), np.inf)
+        for source_index, source in enumerate(sources):
+            column = matrix[:, source_index]
+            for node, cost in _upward_distances(self._up, source).items():
+                for target_index, target_cost in buckets.get(node, ()):
+                    if cost + target_cost < column[target_index]:
+                        column[target_index] = cost + target_cost
+        return matrix
+    
+    def _search(self, sources: Dict[int, float],
+                targets: Dict[int, float]) -> Tuple[float, int, Dict[int, int], Dict[int, int]]:
+        """
+        Dwukierunkowe przeszukiwanie w górę hierarchii
+        
+        Returns:
+            tuple: (długość, węzeł spotkania (-1 = brak), rodzice w przód, rodzice wstecz)
+        """
+        distance = ({}, {})
+        parent = ({}, {})
+        heaps = ([], [])
+        for side, seeds in enumerate((sources, targets)):
+            for node, cost in seeds.items():
+                distance[side][node] = cost
+                parent[side][node] = -1
+                heaps[side].append((cost, node))
+            heapq.heapify(heaps[side])
+        
+        best, meet = math.inf, -1
+        adjacency = (self._up, self._down)
+        while heaps[0] or heaps[1]:
+            # Strona z mniejszym kluczem; koniec, gdy obie kolejki nie mogą poprawić wyniku
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            cost, node = heapq.heappop(heaps[side])
+            if cost >= best:
+                heaps[side].clear()
+                continue
+            if cost > distance[side][node]:
+                continue
+            
+            other = distance[1 - side].get(node)
+            if other is not None and cost + other < best:
+                best, meet = cost + other, node
+            
+            for neighbor, length in adjacency[side][node]:
+                new_cost = cost + length
+                if new_cost < distance[side].get(neighbor, math.inf):
+                    distance[side][neighbor] = new_cost
+                    parent[side][neighbor] = node
+                    heapq.heappush(heaps[side], (new_cost, neighbor))
+        
+        return best, meet, parent[0], parent[1]
+    
+    def _unpack(self, source: int, target: int, nodes: List[int]):
+        """Dopisuje do nodes skrzyżowania krawędzi source -> target (bez source), rozwijając skróty"""
+        stack = [(source, target)]
+        while stack:
+            edge_source, edge_target = stack.pop()
+            middle = self._middle.get((edge_source, edge_target), -1)
+            if middle < 0:
+                nodes.append(edge_target)
+            else:
+                stack.append((middle, edge_target))
+                stack.append((edge_source, middle))
+    
+    @staticmethod
+    def _adjacency_lists(indptr: np.ndarray, indices: np.ndarray,
+                         weights: np.ndarray) -> List[List[Tuple[int, float]]]:
+        """Listy (sąsiad, długość) per węzeł z tablic CSR"""
+        bounds, targets, lengths = indptr.tolist(), indices.tolist(), weights.tolist()
+        return [list(zip(targets[bounds[node]:bounds[node + 1]], lengths[bounds[node]:bounds[node + 1]]))
+                for node in range(len(bounds) - 1)]
+    
+    def __repr__(self) -> str:
+        return f"ContractionHierarchy(nodes={self.num_nodes}, shortcuts={self.num_shortcuts})"
+
+
+def graph_fingerprint(graph: StreetGraph) -> str:
+    """
+    Odcisk grafu ulic (wymiary i krawędzie) - zgodność indeksu z mapą
+    
+    Args:
+        graph: Graf ulic
+    
+    Returns:
+        str: Skrót SHA-1
+    """
+    digest = hashlib.sha1(f"{graph.columns}x{graph.rows}x{graph.spacing}".encode())
+    for array in (graph.indptr, graph.indices, graph.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _witness_distances(out_edges: List[Dict[int, Tuple[float, int]]], contracted: List[bool],
+                       source: int, skipped: int, limit: float, settle_limit: int) -> Dict[int, float]:
+    """
+    Ograniczona Dijkstra od source z pominięciem kontraktowanego węzła
+    
+    Trasa świadka nie krótsza niż trasa przez skipped oznacza potrzebę
+    skrótu. Przerwanie po settle_limit węzłach najwyżej dodaje zbędny skrót.
+    
+    Returns:
+        dict: Węzeł -> znaleziona odległość (tylko do limit)
+    """
+    distance = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < settle_limit:
+        cost, node = heapq.heappop(heap)
+        if cost > distance[node]:
+            continue
+        if cost > limit:
+            break
+        settled += 1
+        for neighbor, (length, _) in out_edges[node].items():
+            if neighbor == skipped or contracted[neighbor]:
+                continue
+            new_cost = cost + length
+            if new_cost < distance.get(neighbor, math.inf):
+                distance[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+    return distance
+
+
+def _upward_distances(adjacency: List[List[Tuple[int, float]]], seeds: Dict[int, float]) -> Dict[int, float]:
+    """Pełne przeszukiwanie w górę hierarchii od seeds - odległości odwiedzonych węzłów"""
+    distance = dict(seeds)
+    heap = [(cost, node) for node, cost in seeds.items()]
+    heapq.heapify(heap)
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if cost > distance[node]:
+            continue
+        for neighbor, length in adjacency[node]:
+            new_cost = cost + length
+            if new_cost < distance.get(neighbor, math.inf):
+                distance[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+    return distance
+
+
+def _to_csr(edges: List[Tuple[int, int, float, int]],
+            num_nodes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zamienia listę krawędzi (od, do, długość, węzeł pośredni) na tablice CSR
+    
+    Returns:
+        tuple: (indptr, indices, weights, middle)
+    """
+    edge_array = np.array([(source, target, middle) for source, target, _, middle in edges],
+                          dtype=np.int32).reshape(-1, 3)
+    weights = np.array([length for _, _, length, _ in edges], dtype=np.float64)
+    order = np.argsort(edge_array[:, 0], kind='stable')
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(edge_array[:, 0], minlength=num_nodes), out=indptr[1:])
+    return indptr, edge_array[order, 1], weights[order], edge_array[order, 2]
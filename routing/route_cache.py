@@ -0,0 +1,127 @@
+"""
+Ograniczony cache LRU tras między skrzyżowaniami
+
+Pozycje kurierów zmieniają się w sposób ciągły, więc trasy od nich nie da
+się policzyć z góry - ale po przyciągnięciu do skrzyżowań siatki te same
+odcinki (restauracja -> okolica klienta) powtarzają się bez przerwy.
+Cache trzyma ostatnio używane trasy (skrzyżowanie startowe, skrzyżowanie
+docelowe, typ kuriera) i zlicza trafienia, żeby było widać jego skuteczność.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import config
+
+
+# Klucz trasy: (skrzyżowanie startowe, skrzyżowanie docelowe, typ kuriera)
+RouteKey = Tuple[int, int, str]
+
+# Trasa: (długość, kolejne skrzyżowania) - (inf, ()) gdy cel nieosiągalny
+CachedRoute = Tuple[float, Tuple[int, ...]]
+
+
+class RouteCache:
+    """
+    Cache LRU tras o stałej pojemności
+    
+    Trafienie przesuwa trasę na koniec kolejki, a po przekroczeniu
+    pojemności usuwana jest trasa najdawniej używana.
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko przechowywanie ostatnio używanych tras
+    """
+    
+    _default: Optional['RouteCache'] = None
+    
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Maksymalna liczba tras w cache
+        """
+        if capacity <= 0:
+            raise ValueError(f"Pojemność cache tras musi być dodatnia: {capacity}")
+        
+        self.capacity = capacity
+        self._routes: 'OrderedDict[RouteKey, CachedRoute]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def default(cls) -> 'RouteCache':
+        """
+        Cache tras grafu ulic mapy (współdzielony przez kurierów)
+        
+        Returns:
+            RouteCache: Cache o pojemności ROUTE_CACHE_SIZE
+        """
+        if cls._default is None:
+            cls._default = cls(config.ROUTE_CACHE_SIZE)
+        return cls._default
+    
+    def get(self, origin: int, destination: int, courier_type: str) -> Optional[CachedRoute]:
+        """
+        Zwraca trasę z cache (i oznacza ją jako ostatnio używaną)
+        
+        Args:
+            origin: Skrzyżowanie startowe
+            destination: Skrzyżowanie docelowe
+            courier_type: Typ kuriera
+        
+        Returns:
+            tuple: (długość, skrzyżowania) lub None gdy trasy nie ma w cache
+        """
+        key = (origin, destination, courier_type)
+        route = self._routes.get(key)
+        if route is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._routes.move_to_end(key)
+        return route
+    
+    def put(self, origin: int, destination: int, courier_type: str, route: CachedRoute):
+        """
+        Zapisuje trasę, usuwając najdawniej używaną po przekroczeniu pojemności
+        
+        Args:
+            origin: Skrzyżowanie startowe
+            destination: Skrzyżowanie docelowe
+            courier_type: Typ kuriera
+            route: (długość, skrzyżowania)
+        """
+        key = (origin, destination, courier_type)
+        self._routes[key] = route
+        self._routes.move_to_end(key)
+        if len(self._routes) > self.capacity:
+            self._routes.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Usuwa wszystkie trasy (liczniki zostają)"""
+        self._routes.clear()
+    
+    def __len__(self) -> int:
+        return len(self._routes)
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki cache
+        
+        Returns:
+            dict: Rozmiar, pojemność, trafienia, chybienia, usunięcia i skuteczność
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._routes),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def __repr__(self) -> str:
+        return f"RouteCache(size={len(self._routes)}/{self.capacity}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,88 @@
+"""
+Odcinek trasy kuriera jako łamana z długościami narastającymi
+
+Trasa liczona jest raz, na początku odcinka (do restauracji, do klienta).
+W każdym kroku rośnie tylko skalar progress, a pozycja to interpolacja
+na łamanej - bez ponownego wyznaczania trasy.
+"""
+
+import math
+from typing import List, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.location import Location
+
+
+class RouteLeg:
+    """
+    Łamana odcinka z postępem mierzonym długością łuku
+    
+    cumulative[i] to długość trasy od początku do wierzchołka i, więc
+    pozostały dystans to length - progress, a dotarcie to progress >= length.
+    """
+    
+    __slots__ = ('xs', 'ys', 'cumulative', 'length', 'progress', '_segment')
+    
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        """
+        Args:
+            points: Wierzchołki łamanej (pierwszy = start, ostatni = cel)
+        """
+        self.xs: List[float] = [x for x, _ in points]
+        self.ys: List[float] = [y for _, y in points]
+        self.cumulative: List[float] = [0.0]
+        for i in range(1, len(points)):
+            segment = math.hypot(self.xs[i] - self.xs[i - 1], self.ys[i] - self.ys[i - 1])
+            self.cumulative.append(self.cumulative[-1] + segment)
+        self.length = self.cumulative[-1]
+        self.progress = 0.0
+        self._segment = 0
+    
+    @property
+    def remaining(self) -> float:
+        """Dystans do końca odcinka"""
+        return self.length - self.progress
+    
+    @property
+    def finished(self) -> bool:
+        """Czy kurier dotarł do końca odcinka"""
+        return self.progress >= self.length
+    
+    def advance(self, location: 'Location', distance: float) -> float:
+        """
+        Przesuwa postęp o distance i ustawia lokalizację w miejscu
+        
+        Args:
+            location: Lokalizacja kuriera (modyfikowana)
+            distance: Maksymalny dystans przesunięcia
+        
+        Returns:
+            float: Przebyty dystans (mniejszy tylko na końcu odcinka)
+        """
+        remaining = self.length - self.progress
+        if remaining <= 0.0:
+            return 0.0
+        if distance >= remaining:
+            # Koniec odcinka - dokładnie w celu
+            self.progress = self.length
+            location.x = self.xs[-1]
+            location.y = self.ys[-1]
+            return remaining
+        self.progress += distance
+        
+        # Postęp tylko rośnie - wskaźnik odcinka przesuwa się do przodu (zamortyzowane O(1))
+        cumulative = self.cumulative
+        segment = self._segment
+        last = len(cumulative) - 2
+        while segment < last and cumulative[segment + 1] < self.progress:
+            segment += 1
+        self._segment = segment
+        
+        start, end = cumulative[segment], cumulative[segment + 1]
+        ratio = (self.progress - start) / (end - start) if end > start else 1.0
+        location.x = self.xs[segment] + (self.xs[segment + 1] - self.xs[segment]) * ratio
+        location.y = self.ys[segment] + (self.ys[segment + 1] - self.ys[segment]) * ratio
+        return distance
+    
+    def __repr__(self) -> str:
+        return f"RouteLeg(points={len(self.xs)}, progress={self.progress:.1f}/{self.length:.1f})"
@@ -0,0 +1,239 @@
+"""
+Tablica tras do stałych punktów mapy (restauracje, klienci z puli)
+
+Restauracje są stałe, a klienci z customer_pool wracają w 70% zamówień -
+zamiast szukać trasy od nowa dla każdego odcinka, drzewa najkrótszych
+tras do tych punktów liczone są raz (przy budowie świata, klient - przy
+pierwszym zamówieniu). Odcinek do restauracji lub klienta to wtedy
+odczyt z tablic zamiast A*, a ETA dispatchu i cena zamówienia pochodzą
+z tych samych tablic. Tablice restauracji są stałe, a tablic klientów
+jest najwyżej ROUTE_TABLE_MAX_CUSTOMERS (LRU) - każda to tablica na
+wszystkie skrzyżowania grafu.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from routing.astar import shortest_path_tree
+from routing.street_graph import StreetGraph
+import config
+
+if TYPE_CHECKING:
+    from models.location import Location
+
+
+# Klucz punktu mapy w tablicy (x, y)
+PointKey = Tuple[float, float]
+
+
+class RouteTable:
+    """
+    Tablice odległości i następnych skrzyżowań do (i od) stałych punktów
+    
+    Dla punktu P:
+    - to[P] = (odległość, next_hop): trasa z każdego skrzyżowania do P,
+      next_hop[n] to kolejne skrzyżowanie (-1 = stąd zjazd do P)
+    - from[P] (tylko restauracje) = (odległość, parent): trasa z P do
+      każdego skrzyżowania, parent[n] to poprzednie skrzyżowanie
+      (-1 = tu trasa wjeżdża z P do sieci)
+    Odległości zawierają dojazd między punktem a rogiem jego kwartału.
+    Tablice do klientów tworzą cache LRU - odczyt przesuwa tablicę na
+    koniec kolejki, a po przekroczeniu limitu usuwana jest najdawniej
+    używana (klient bez tablicy dostaje trasę jak każdy inny punkt).
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko przechowywanie i odczyt tras
+    """
+    
+    _default: Optional['RouteTable'] = None
+    
+    def __init__(self, graph: StreetGraph, max_customers: Optional[int] = None):
+        """
+        Args:
+            graph: Graf ulic
+            max_customers: Limit tablic do klientów (None = ROUTE_TABLE_MAX_CUSTOMERS, 0 = bez nich)
+        """
+        self.graph = graph
+        self.max_customers = max_customers if max_customers is not None else config.ROUTE_TABLE_MAX_CUSTOMERS
+        self._to: Dict[PointKey, Tuple[np.ndarray, np.ndarray]] = {}
+        self._from: Dict[PointKey, Tuple[np.ndarray, np.ndarray]] = {}
+        self._customers: 'OrderedDict[PointKey, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self.evictions = 0
+    
+    @classmethod
+    def default(cls) -> 'RouteTable':
+        """
+        Tablica tras grafu ulic mapy (współdzielona przez kurierów i wycenę)
+        
+        Returns:
+            RouteTable: Tablica dla StreetGraph.default()
+        """
+        if cls._default is None:
+            cls._default = cls(StreetGraph.default())
+        return cls._default
+    
+    @property
+    def num_destinations(self) -> int:
+        """Liczba punktów z tablicą tras do nich"""
+        return len(self._to) + len(self._customers)
+    
+    @property
+    def num_customers(self) -> int:
+        """Liczba klientów z tablicą tras do nich"""
+        return len(self._customers)
+    
+    @property
+    def num_sources(self) -> int:
+        """Liczba punktów z tablicą tras od nich"""
+        return len(self._from)
+    
+    def add_restaurant(self, location: 'Location'):
+        """
+        Liczy trasy do restauracji i od restauracji
+        
+        Args:
+            location: Lokalizacja restauracji
+        """
+        key = (location.x, location.y)
+        if key not in self._to:
+            self._to[key] = self._customers.pop(key, None) or self._tree_to(location)
+        if key not in self._from:
+            self._from[key] = shortest_path_tree(self.graph, self._corners(location.x, location.y))
+    
+    def add_destination(self, location: 'Location'):
+        """
+        Liczy trasy do klienta z puli (najdawniej używany klient ponad limit traci tablicę)
+        
+        Args:
+            location: Lokalizacja punktu docelowego
+        """
+        key = (location.x, location.y)
+        if self.max_customers <= 0 or key in self._to or key in self._customers:
+            return
+        
+        self._customers[key] = self._tree_to(location)
+        if len(self._customers) > self.max_customers:
+            self._customers.popitem(last=False)
+            self.evictions += 1
+    
+    def has_destination(self, location: 'Location') -> bool:
+        """Czy punkt ma tablicę tras do niego"""
+        key = (location.x, location.y)
+        return key in self._to or key in self._customers
+    
+    def clear(self):
+        """Usuwa wszystkie tablice (nowy świat symulacji)"""
+        self._to.clear()
+        self._from.clear()
+        self._customers.clear()
+    
+    def _tree_to(self, location: 'Location') -> Tuple[np.ndarray, np.ndarray]:
+        """Drzewo najkrótszych tras do punktu (graf odwrócony)"""
+        return shortest_path_tree(self.graph, self._corners(location.x, location.y), reverse=True)
+    
+    def _to_table(self, x: float, y: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Tablica tras do punktu (tablica klienta oznaczana jako ostatnio używana)"""
+        key = (x, y)
+        table = self._to.get(key)
+        if table is None:
+            table = self._customers.get(key)
+            if table is not None:
+                self._customers.move_to_end(key)
+        return table
+    
+    def distances_to(self, x: float, y: float) -> Optional[np.ndarray]:
+        """
+        Odległości wszystkich skrzyżowań do punktu
+        
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+        
+        Returns:
+            np.ndarray: Odległości (N,) lub None gdy punkt nie ma tablicy
+        """
+        table = self._to_table(x, y)
+        return table[0] if table is not None else None
+    
+    def distance(self, start: 'Location', end: 'Location') -> Optional[float]:
+        """
+        Długość trasy ulicami z tablic (bez odtwarzania skrzyżowań)
+        
+        Args:
+            start: Punkt startowy
+            end: Punkt końcowy
+        
+        Returns:
+            float: Długość trasy (inf = nieosiągalny) lub None gdy żaden z punktów nie ma tablicy
+        """
+        to_table = self._to_table(end.x, end.y)
+        if to_table is not None:
+            return self._best_corner(self._corners(start.x, start.y), to_table[0])[1]
+        
+        from_table = self._from.get((start.x, start.y))
+        if from_table is not None:
+            return self._best_corner(self._corners(end.x, end.y), from_table[0])[1]
+        
+        return None
+    
+    def route(self, start: 'Location', end: 'Location') -> Optional[Tuple[float, List[int]]]:
+        """
+        Trasa ulicami z tablic: do end (tablica to) lub od start (tablica from)
+        
+        Args:
+            start: Punkt startowy
+            end: Punkt końcowy
+        
+        Returns:
+            tuple: (długość trasy, skrzyżowania) - (inf, []) gdy nieosiągalny,
+                   None gdy żaden z punktów nie ma tablicy
+        """
+        to_table = self._to_table(end.x, end.y)
+        if to_table is not None:
+            distance, next_hop = to_table
+            node, length = self._best_corner(self._corners(start.x, start.y), distance)
+            if math.isinf(length):
+                return math.inf, []
+            path = [node]
+            while next_hop[path[-1]] != -1:
+                path.append(int(next_hop[path[-1]]))
+            return length, path
+        
+        from_table = self._from.get((start.x, start.y))
+        if from_table is not None:
+            distance, parent = from_table
+            node, length = self._best_corner(self._corners(end.x, end.y), distance)
+            if math.isinf(length):
+                return math.inf, []
+            path = [node]
+            while parent[path[-1]] != -1:
+                path.append(int(parent[path[-1]]))
+            path.reverse()
+            return length, path
+        
+        return None
+    
+    def _corners(self, x: float, y: float) -> Dict[int, float]:
+        """Rogi kwartału punktu -> dojazd (Manhattan) między punktem a rogiem"""
+        return {node: self.graph.offset(x, y, node) for node in self.graph.corner_nodes(x, y)}
+    
+    @staticmethod
+    def _best_corner(corners: Dict[int, float], distance: np.ndarray) -> Tuple[int, float]:
+        """
+        Róg z najkrótszą trasą (dojazd do rogu + odległość z tablicy)
+        
+        Args:
+            corners: Róg -> dojazd między punktem a rogiem
+            distance: Odległości z tablicy
+        
+        Returns:
+            tuple: (róg, długość całej trasy)
+        """
+        return min(((node, offset + float(distance[node])) for node, offset in corners.items()),
+                   key=lambda item: item[1])
+    
+    def __repr__(self) -> str:
+        return f"RouteTable(destinations={self.num_destinations}, sources={self.num_sources})"
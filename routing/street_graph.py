@@ -0,0 +1,276 @@
+"""
+Graf sieci ulic na siatce GRID_SIZE
+
+Skrzyżowania leżą w węzłach siatki co GRID_SIZE jednostek mapy, ulice
+łączą sąsiednie skrzyżowania w poziomie i pionie. Zamknięte skrzyżowania
+(STREET_BLOCKED_NODES) nie mają żadnych krawędzi, a ulice jednokierunkowe
+(STREET_ONE_WAY) mają krawędź tylko w jednym kierunku.
+
+Sąsiedztwo trzymane jest w zwartych tablicach CSR (indptr / indices /
+weights) - pamięć rośnie liniowo z liczbą krawędzi, więc graf skaluje się
+do dużych map.
+"""
+
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+
+
+# (kolumna, wiersz) skrzyżowania w siatce
+GridNode = Tuple[int, int]
+
+
+class StreetGraph:
+    """
+    Skierowany graf ulic w formacie CSR
+    
+    Węzeł (kolumna, wiersz) ma numer wiersz * columns + kolumna.
+    Krawędzie wychodzące z węzła n to indices[indptr[n]:indptr[n + 1]],
+    a ich długości to weights[...] o tych samych indeksach.
+    
+    Graf odwrócony (reverse_*) służy do wyszukiwania "do celu" -
+    odległości wszystkich węzłów do jednego punktu jednym przebiegiem.
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko struktura sieci ulic
+    """
+    
+    _default: Optional['StreetGraph'] = None
+    
+    def __init__(
+        self,
+        columns: int,
+        rows: int,
+        spacing: float,
+        blocked: Iterable[GridNode] = (),
+        one_way: Iterable[Tuple[GridNode, GridNode]] = ()
+    ):
+        """
+        Buduje graf siatki ulic
+        
+        Args:
+            columns: Liczba skrzyżowań w poziomie
+            rows: Liczba skrzyżowań w pionie
+            spacing: Odległość między sąsiednimi skrzyżowaniami
+            blocked: Zamknięte skrzyżowania (kolumna, wiersz)
+            one_way: Odcinki jednokierunkowe ((kolumna, wiersz) od, (kolumna, wiersz) do) -
+                     prosta pozioma lub pionowa, ruch tylko od pierwszego do drugiego końca
+        """
+        self.columns = columns
+        self.rows = rows
+        self.spacing = float(spacing)
+        self.num_nodes = columns * rows
+        
+        # Współrzędne węzłów: tablica (N, 2) i listy do szybkich pętli wyszukiwania
+        node_ids = np.arange(self.num_nodes)
+        self.coordinates = np.column_stack(((node_ids % columns) * self.spacing,
+                                            (node_ids // columns) * self.spacing))
+        self.node_x: List[float] = self.coordinates[:, 0].tolist()
+        self.node_y: List[float] = self.coordinates[:, 1].tolist()
+        
+        self.open = np.ones(self.num_nodes, dtype=bool)
+        for column, row in blocked:
+            if 0 <= column < columns and 0 <= row < rows:
+                self.open[self.node_id(column, row)] = False
+        
+        forbidden = set()
+        for start, end in one_way:
+            forbidden.update(self._reverse_edges_of_segment(start, end))
+        
+        # Krawędzie między otwartymi sąsiadami, bez kierunków zabronionych
+        edges = []
+        for row in range(rows):
+            for column in range(columns):
+                node = self.node_id(column, row)
+                if not self.open[node]:
+                    continue
+                for d_column, d_row in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                    n_column, n_row = column + d_column, row + d_row
+                    if not (0 <= n_column < columns and 0 <= n_row < rows):
+                        continue
+                    neighbor = self.node_id(n_column, n_row)
+                    if self.open[neighbor] and (node, neighbor) not in forbidden:
+                        edges.append((node, neighbor))
+        
+        edge_array = np.array(edges, dtype=np.int32).reshape(-1, 2)
+        self.indptr, self.indices = self._to_csr(edge_array[:, 0], edge_array[:, 1])
+        self.weights = np.full(len(self.indices), self.spacing)
+        self.reverse_indptr, self.reverse_indices = self._to_csr(edge_array[:, 1], edge_array[:, 0])
+        self.reverse_weights = np.full(len(self.reverse_indices), self.spacing)
+        
+        # Listy sąsiedztwa dla pętli w czystym Pythonie (A*, Dijkstra)
+        self._adjacency = self._adjacency_lists(self.indptr, self.indices, self.weights)
+        self._reverse_adjacency = self._adjacency_lists(self.reverse_indptr, self.reverse_indices,
+                                                        self.reverse_weights)
+    
+    @classmethod
+    def default(cls) -> 'StreetGraph':
+        """
+        Graf ulic mapy z config (budowany raz, współdzielony przez kurierów)
+        
+        Returns:
+            StreetGraph: Graf na siatce MAP_WIDTH x MAP_HEIGHT co GRID_SIZE
+        """
+        if cls._default is None:
+            cls._default = cls(
+                config.MAP_WIDTH // config.GRID_SIZE + 1,
+                config.MAP_HEIGHT // config.GRID_SIZE + 1,
+                config.GRID_SIZE,
+                config.STREET_BLOCKED_NODES,
+                config.STREET_ONE_WAY
+            )
+        return cls._default
+    
+    @property
+    def num_edges(self) -> int:
+        """Liczba skierowanych krawędzi"""
+        return len(self.indices)
+    
+    def node_id(self, column: int, row: int) -> int:
+        """Numer węzła (kolumna, wiersz)"""
+        return row * self.columns + column
+    
+    def node_xy(self, node: int) -> Tuple[float, float]:
+        """Współrzędne mapy węzła"""
+        return self.node_x[node], self.node_y[node]
+    
+    def neighbors(self, node: int) -> List[Tuple[int, float]]:
+        """
+        Krawędzie wychodzące z węzła
+        
+        Args:
+            node: Numer węzła
+        
+        Returns:
+            list: Pary (sąsiad, długość krawędzi)
+        """
+        return self._adjacency[node]
+    
+    def reverse_neighbors(self, node: int) -> List[Tuple[int, float]]:
+        """Krawędzie wchodzące do węzła - pary (poprzednik, długość krawędzi)"""
+        return self._reverse_adjacency[node]
+    
+    def corner_nodes(self, x: float, y: float) -> List[int]:
+        """
+        Otwarte skrzyżowania na rogach kwartału zawierającego punkt
+        
+        Punkt leżący na ulicy ma tu oba końce swojego odcinka, punkt
+        w skrzyżowaniu - tylko to skrzyżowanie. Gdy wszystkie rogi są
+        zamknięte, zwracane jest najbliższe otwarte skrzyżowanie.
+        
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+        
+        Returns:
+            list: Numery węzłów (bez powtórzeń)
+        """
+        column = min(max(x / self.spacing, 0.0), self.columns - 1)
+        row = min(max(y / self.spacing, 0.0), self.rows - 1)
+        nodes = []
+        for corner_row in sorted({math.floor(row), math.ceil(row)}):
+            for corner_column in sorted({math.floor(column), math.ceil(column)}):
+                node = self.node_id(corner_column, corner_row)
+                if self.open[node]:
+                    nodes.append(node)
+        return nodes or [self.nearest_open_node(x, y)]
+    
+    def nearest_open_node(self, x: float, y: float) -> int:
+        """
+        Najbliższe (Manhattan) otwarte skrzyżowanie
+        
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+        
+        Returns:
+            int: Numer węzła
+        """
+        distance = np.abs(self.coordinates[:, 0] - x) + np.abs(self.coordinates[:, 1] - y)
+        distance[~self.open] = np.inf
+        return int(np.argmin(distance))
+    
+    def offset(self, x: float, y: float, node: int) -> float:
+        """Dystans (Manhattan) między punktem a skrzyżowaniem"""
+        return abs(self.node_x[node] - x) + abs(self.node_y[node] - y)
+    
+    def _reverse_edges_of_segment(self, start: GridNode, end: GridNode) -> List[Tuple[int, int]]:
+        """
+        Krawędzie pod prąd odcinka jednokierunkowego start -> end
+        
+        Args:
+            start: Początek odcinka (kolumna, wiersz)
+            end: Koniec odcinka (kolumna, wiersz)
+        
+        Returns:
+            list: Pary (węzeł, sąsiad) zabronione w grafie
+        """
+        (start_column, start_row), (end_column, end_row) = start, end
+        if start_column != end_column and start_row != end_row:
+            raise ValueError(f"Ulica jednokierunkowa musi być pozioma lub pionowa: {start} -> {end}")
+        
+        steps = max(abs(end_column - start_column), abs(end_row - start_row))
+        d_column = (end_column > start_column) - (end_column < start_column)
+        d_row = (end_row > start_row) - (end_row < start_row)
+        nodes = [self.node_id(start_column + d_column * i, start_row + d_row * i) for i in range(steps + 1)]
+        return [(nodes[i + 1], nodes[i]) for i in range(steps)]
+    
+    def _to_csr(self, sources: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zamienia listę krawędzi na tablice CSR
+        
+        Args:
+            sources: Początki krawędzi
+            targets: Końce krawędzi
+        
+        Returns:
+            tuple: (indptr (N + 1,), indices (E,)) posortowane po początku krawędzi
+        """
+        order = np.argsort(sources, kind='stable')
+        counts = np.bincount(sources, minlength=self.num_nodes)
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int32)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, targets[order].astype(np.int32)
+    
+    @staticmethod
+    def _adjacency_lists(indptr: np.ndarray, indices: np.ndarray,
+                         weights: np.ndarray) -> List[List[Tuple[int, float]]]:
+        """Listy (sąsiad, długość) per węzeł z tablic CSR"""
+        bounds = indptr.tolist()
+        targets = indices.tolist()
+        lengths = weights.tolist()
+        return [list(zip(targets[bounds[node]:bounds[node + 1]], lengths[bounds[node]:bounds[node + 1]]))
+                for node in range(len(bounds) - 1)]
+    
+    def __repr__(self) -> str:
+        return (f"StreetGraph({self.columns}x{self.rows}, spacing={self.spacing:.0f}, "
+                f"edges={self.num_edges}, blocked={int((~self.open).sum())})")
+
+
+def path_points(graph: StreetGraph, start: Tuple[float, float], nodes: Sequence[int],
+                end: Tuple[float, float]) -> List[Tuple[float, float]]:
+    """
+    Łamana trasy: punkt startowy -> skrzyżowania -> punkt końcowy
+    
+    Dojazd do pierwszego i od ostatniego skrzyżowania jest prowadzony
+    najpierw w poziomie, potem w pionie (zgodnie z dystansem Manhattan).
+    
+    Args:
+        graph: Graf ulic
+        start: Punkt startowy (x, y)
+        nodes: Kolejne skrzyżowania trasy
+        end: Punkt końcowy (x, y)
+    
+    Returns:
+        list: Wierzchołki łamanej (x, y)
+    """
+    first_x, first_y = graph.node_xy(nodes[0])
+    last_x, last_y = graph.node_xy(nodes[-1])
+    points = [start, (first_x, start[1])]
+    points.extend(graph.node_xy(node) for node in nodes)
+    points.append((end[0], last_y))
+    points.append(end)
+    return points
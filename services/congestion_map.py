@@ -0,0 +1,173 @@
+"""
+Mapa zatłoczenia ulic (liczniki kurierów w komórkach siatki)
+
+Każda komórka siatki (kwartał ulic GRID_SIZE) ma licznik kurierów
+naziemnych, którzy nią jadą (CourierManager dodaje kurierów przy wejściu
+w stan jazdy i usuwa przy wyjściu z niego - zaparkowani nie spowalniają
+ruchu). Licznik zmienia się tylko gdy kurier
+przechodzi do innej komórki, a mnożnik prędkości to odczyt z tabeli
+po liczbie kurierów w komórce - bez porównywania kurierów parami.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from models.courier import Courier
+
+
+Cell = Tuple[int, int]
+
+
+class CongestionMap:
+    """
+    Liczniki zajętości komórek siatki i mnożniki prędkości z nich
+    
+    Wstawienie, usunięcie i przesunięcie kuriera to O(1). Mnożniki są
+    odczytywane raz na krok (apply_speed_factors) z liczników po
+    poprzednim kroku - wynik nie zależy od kolejności aktualizacji kurierów.
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko zajętość ulic i wynikające z niej spowolnienie
+    """
+    
+    def __init__(self, cell_size: float, speed_factors: Sequence[float], courier_types: Iterable[str]):
+        """
+        Args:
+            cell_size: Rozmiar komórki (jednostki mapy)
+            speed_factors: Mnożnik prędkości wg liczby kurierów w komórce
+                           (indeks = liczba kurierów, ostatni dla większych)
+            courier_types: Typy kurierów jeżdżących ulicami (drony nie stoją w korkach)
+        """
+        if not speed_factors:
+            raise ValueError("Tabela mnożników prędkości zatłoczenia nie może być pusta")
+        
+        self.cell_size = cell_size
+        self.speed_factors = tuple(speed_factors)
+        self.courier_types = frozenset(courier_types)
+        
+        # Komórka -> liczba kurierów
+        self._counts: Dict[Cell, int] = {}
+        
+        # courier_id -> (kurier, komórka w której jest)
+        self._couriers: Dict[int, Tuple['Courier', Cell]] = {}
+        
+        # Kroki kurierów ze spowolnieniem (mnożnik < 1)
+        self.slowed_steps = 0
+    
+    @classmethod
+    def from_config(cls) -> Optional['CongestionMap']:
+        """
+        Mapa zatłoczenia wg config.py
+        
+        Returns:
+            CongestionMap: Mapa lub None gdy CONGESTION_ENABLED = False
+        """
+        if not config.CONGESTION_ENABLED:
+            return None
+        return cls(config.GRID_SIZE, config.CONGESTION_SPEED_FACTORS, config.CONGESTION_COURIER_TYPES)
+    
+    def _cell_of(self, x: float, y: float) -> Cell:
+        """Komórka zawierająca punkt"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+    
+    def insert(self, courier: 'Courier'):
+        """
+        Dodaje kuriera do liczników (kurierzy innych typów są pomijani)
+        
+        Args:
+            courier: Kurier do dodania
+        """
+        if courier.courier_type not in self.courier_types or courier.id in self._couriers:
+            return
+        
+        cell = self._cell_of(courier.location.x, courier.location.y)
+        self._counts[cell] = self._counts.get(cell, 0) + 1
+        self._couriers[courier.id] = (courier, cell)
+    
+    def remove(self, courier: 'Courier'):
+        """
+        Usuwa kuriera z liczników (nic nie robi jeśli go nie ma)
+        
+        Args:
+            courier: Kurier do usunięcia
+        """
+        entry = self._couriers.pop(courier.id, None)
+        if entry is None:
+            return
+        
+        self._decrement(entry[1])
+        courier.speed_factor = 1.0
+    
+    def update(self, courier: 'Courier'):
+        """
+        Przenosi kuriera między licznikami po zmianie pozycji
+        
+        Args:
+            courier: Kurier który mógł się przesunąć
+        """
+        entry = self._couriers.get(courier.id)
+        if entry is None:
+            return
+        
+        cell = self._cell_of(courier.location.x, courier.location.y)
+        if cell == entry[1]:
+            return
+        
+        self._decrement(entry[1])
+        self._counts[cell] = self._counts.get(cell, 0) + 1
+        self._couriers[courier.id] = (courier, cell)
+    
+    def _decrement(self, cell: Cell):
+        """Zmniejsza licznik komórki (pusta komórka znika ze słownika)"""
+        count = self._counts[cell] - 1
+        if count:
+            self._counts[cell] = count
+        else:
+            del self._counts[cell]
+    
+    def occupancy(self, x: float, y: float) -> int:
+        """
+        Liczba kurierów w komórce punktu
+        
+        Args:
+            x: Współrzędna X
+            y: Współrzędna Y
+        
+        Returns:
+            int: Liczba kurierów
+        """
+        return self._counts.get(self._cell_of(x, y), 0)
+    
+    def speed_factor_for(self, occupancy: int) -> float:
+        """Mnożnik prędkości dla liczby kurierów w komórce (odczyt z tabeli)"""
+        return self.speed_factors[min(occupancy, len(self.speed_factors) - 1)]
+    
+    def apply_speed_factors(self):
+        """Ustawia kurierom mnożnik prędkości z zajętości ich komórek (raz na krok)"""
+        factors = self.speed_factors
+        last = len(factors) - 1
+        counts = self._counts
+        for courier, cell in self._couriers.values():
+            factor = factors[min(counts[cell], last)]
+            courier.speed_factor = factor
+            if factor < 1.0:
+                self.slowed_steps += 1
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki zatłoczenia
+        
+        Returns:
+            dict: Śledzeni kurierzy, zajęte komórki, największa zajętość i kroki ze spowolnieniem
+        """
+        return {
+            'tracked_couriers': len(self._couriers),
+            'occupied_cells': len(self._counts),
+            'max_occupancy': max(self._counts.values(), default=0),
+            'slowed_steps': self.slowed_steps
+        }
+    
+    def __repr__(self) -> str:
+        return f"CongestionMap(couriers={len(self._couriers)}, cells={len(self._counts)})"
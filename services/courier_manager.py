@@ -4,9 +4,24 @@ Manager zarządzający kurierami
 Odpowiada za aktualizację stanów kurierów
 """
 
-from typing import List
+import bisect
+from collections import Counter
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+import numpy as np
+
+import config
 from models.courier import Courier
+from models.order import OrderStatus
 from observers.subject import Subject
+from services.congestion_map import CongestionMap
+from services.spatial_index import SpatialIndex
+
+
+# Stany jazdy z zamówieniem - ruch liczony zbiorczo (repozycjonowanie wolnych
+# kurierów zostaje pojedyncze: przeglądanie wszystkich wolnych kosztowałoby więcej)
+MOVING_STATES = ("ToRestaurantState", "ToCustomerState")
 
 
 class CourierManager(Subject):
@@ -16,6 +31,7 @@ class CourierManager(Subject):
     Odpowiada za:
     - Aktualizację wszystkich kurierów
     - Śledzenie dostępności kurierów
+    - Zmiany floty w trakcie symulacji (dołączanie i zjazd kurierów)
     - Powiadamianie o wypadkach
     
     Zasady SOLID:
@@ -30,7 +46,126 @@ class CourierManager(Subject):
             couriers: Lista kurierów
         """
         super().__init__()
-        self.couriers = couriers
+        
+        # Flota (id -> kurier, w kolejności dołączenia) - dołączenie i odejście to O(1)
+        self._fleet: Dict[int, Courier] = {}
+        
+        # Kurierzy w trakcie zjazdu (odchodzą po ostatnim zamówieniu) i ci, którzy już odeszli
+        self._retiring: Dict[int, Courier] = {}
+        self.retired_couriers: List[Courier] = []
+        self.total_added = 0
+        
+        # Indeksy przestrzenne dostępnych kurierów - osobny na typ kuriera (dla dispatch)
+        # availability_version rośnie gdy kurier dołącza do dostępnych lub odpada poza dispatchem
+        self.availability_version = 0
+        self.spatial_indexes: Dict[str, SpatialIndex] = {}
+        self._type_counts = Counter(courier.courier_type for courier in couriers)
+        
+        # Najwyższa prędkość bazowa per typ (dolne ograniczenie czasu dojazdu)
+        self.max_speed_by_type: Dict[str, float] = {}
+        
+        # Zbiory utrzymywane przy każdej zmianie stanu kuriera (Courier.set_state)
+        self._available: Dict[int, Courier] = {}
+        # ID wolnych kurierów rosnąco - całej floty i per typ (bisect, bez sortowania przy odczycie)
+        self._available_ids: List[int] = []
+        self._available_ids_by_type: Dict[str, List[int]] = {}
+        self._available_by_type: Dict[str, Dict[int, Courier]] = {}
+        self._active: Dict[int, Courier] = {}
+        self._by_state: Dict[str, Dict[int, Courier]] = {}
+        self.total_accidents = 0
+        
+        # Liczniki zatłoczenia ulic (None = wyłączone)
+        self.congestion: Optional[CongestionMap] = CongestionMap.from_config()
+        
+        for courier in couriers:
+            self._join(courier)
+    
+    @property
+    def couriers(self) -> List[Courier]:
+        """Kurierzy floty (bez tych, którzy już odeszli) w kolejności dołączenia"""
+        return list(self._fleet.values())
+    
+    @property
+    def num_couriers(self) -> int:
+        """Liczba kurierów floty - O(1)"""
+        return len(self._fleet)
+    
+    @property
+    def num_retiring(self) -> int:
+        """Liczba kurierów w trakcie zjazdu - O(1)"""
+        return len(self._retiring)
+    
+    def add_couriers(self, couriers: Iterable[Courier]):
+        """
+        Dołącza kurierów do floty w trakcie symulacji (np. zmiana, szczyt popytu)
+        
+        Każdy kurier trafia do zbiorów i indeksów w O(1) - nic nie jest przebudowywane.
+        
+        Args:
+            couriers: Nowi kurierzy (z ustawionym stanem, np. z CourierFactory)
+        """
+        for courier in couriers:
+            self._type_counts[courier.courier_type] += 1
+            self._join(courier)
+            self.total_added += 1
+            if courier.is_available:
+                self.availability_version += 1
+            self._notify_fleet_change('courier_added', courier)
+    
+    def retire_couriers(self, couriers: Iterable[Courier]):
+        """
+        Wycofuje kurierów z floty (koniec zmiany)
+        
+        Wolny kurier odchodzi od razu. Kurier z zamówieniem zjeżdża:
+        nie dostaje nowych zamówień (także do kolejki look-ahead) i odchodzi
+        gdy skończy bieżące zamówienia i stanie się wolny.
+        
+        Args:
+            couriers: Kurierzy do wycofania
+        """
+        for courier in couriers:
+            if courier.id not in self._fleet or courier.id in self._retiring:
+                continue
+            self._retiring[courier.id] = courier
+            if courier.is_available:
+                self._retire(courier)
+                self.availability_version += 1
+    
+    def is_retiring(self, courier: Courier) -> bool:
+        """Czy kurier zjeżdża (odejdzie po bieżących zamówieniach)"""
+        return courier.id in self._retiring
+    
+    def _join(self, courier: Courier):
+        """Dodaje kuriera do floty, zbiorów stanów i indeksów"""
+        self._fleet[courier.id] = courier
+        self.max_speed_by_type[courier.courier_type] = max(
+            self.max_speed_by_type.get(courier.courier_type, 0.0), courier.base_speed
+        )
+        self._track(courier)
+        courier.set_state_listener(self)
+    
+    def _retire(self, courier: Courier):
+        """Usuwa kuriera z floty, zbiorów stanów i indeksów (O(1))"""
+        self._retiring.pop(courier.id, None)
+        del self._fleet[courier.id]
+        self._type_counts[courier.courier_type] -= 1
+        
+        members = self._by_state.get(courier.state_name)
+        if members is not None:
+            members.pop(courier.id, None)
+        if self._available.pop(courier.id, None) is not None:
+            self._remove_available_id(courier)
+        self._available_by_type.get(courier.courier_type, {}).pop(courier.id, None)
+        self._active.pop(courier.id, None)
+        index = self.spatial_indexes.get(courier.courier_type)
+        if index is not None:
+            index.remove(courier)
+        if self.congestion is not None:
+            self.congestion.remove(courier)
+        
+        courier.set_state_listener(None)
+        self.retired_couriers.append(courier)
+        self._notify_fleet_change('courier_retired', courier)
     
     def update_all_couriers(self, weather_condition):
         """
@@ -38,29 +173,101 @@ class CourierManager(Subject):
         
         Args:
             weather_condition: Aktualny warunek pogodowy
+            
+        Returns:
+            list: Zamówienia zwrócone do kolejki po wypadkach kurierów
         """
-        for courier in self.couriers:
+        requeued_orders = []
+        
+        # Kopia listy - kurier zjeżdżający może odejść w trakcie pętli
+        couriers = list(self._fleet.values())
+        
+        # Spowolnienie z zajętości komórek po poprzednim kroku
+        if self.congestion is not None:
+            self.congestion.apply_speed_factors()
+        
+        # Ruch floty policzony z góry - stany tylko przepisują gotowy krok
+        self._prepare_batch_steps(weather_condition)
+        
+        for courier in couriers:
             # Zapisz statystyki przed aktualizacją
             accidents_before = courier.accidents
             deliveries_before = courier.total_deliveries
             
             # Zapisz referencję do zamówienia (przed jego usunięciem w update)
             order_before = courier.current_order
+            next_order_before = courier.next_order
+            
+            was_available = courier.id in self._available
             
             # Aktualizuj kuriera (State Pattern)
             courier.update(weather_condition)
             
+            # Zmiany stanu obsłużył on_courier_state_changed - tu tylko pozycja w indeksie
+            is_available = courier.id in self._available
+            if is_available:
+                self.spatial_indexes[courier.courier_type].update(courier)
+            if is_available != was_available:
+                self.availability_version += 1
+            if self.congestion is not None:
+                self.congestion.update(courier)
+            
             # Sprawdź czy był wypadek
             if courier.accidents > accidents_before:
-                # Jeśli kurier miał zamówienie, zostało anulowane
+                self.total_accidents += courier.accidents - accidents_before
+                # Zamówienie kuriera wraca do kolejki lub (po limicie) jest anulowane
                 if order_before:
-                    self._notify_order_cancelled(order_before.id, courier, weather_condition)
+                    if order_before.status == OrderStatus.PENDING:
+                        requeued_orders.append(order_before)
+                        self._notify_order_requeued(order_before, courier)
+                    else:
+                        self._notify_order_cancelled(order_before.id, courier, weather_condition)
+                # Zamówienie z kolejki kuriera (look-ahead) wraca do kolejki bez liczenia
+                # powrotu - nie zostało utracone, jedzenie czeka w restauracji
+                if next_order_before and next_order_before.status == OrderStatus.PENDING:
+                    requeued_orders.append(next_order_before)
+                    self._notify_order_released(next_order_before, courier)
                 self._notify_accident(courier, weather_condition)
             
             # Sprawdź czy była dostawa
             if courier.total_deliveries > deliveries_before:
                 # Przekaż zakończone zamówienie do powiadomienia
                 self._notify_delivery(courier, order_before)
+        
+        return requeued_orders
+
+    def _prepare_batch_steps(self, weather_condition):
+        """
+        Liczy krok wszystkich jadących kurierów jednej strategii jednym wywołaniem
+        
+        Ruch nie zależy od losowania, więc można go policzyć przed pętlą
+        aktualizacji - kolejność losowań (wypadki, czas przygotowania) zostaje
+        ta sama, a kurier z wypadkiem po prostu nie używa swojego kroku.
+        Kurierzy z odcinkiem trasy (plan_leg) i małe grupy ruszają się pojedynczo.
+        
+        Args:
+            weather_condition: Aktualny warunek pogodowy (prędkość)
+        """
+        if len(self._fleet) < config.BATCH_MOVE_MIN_COURIERS:
+            return
+        
+        groups: Dict[type, List[Courier]] = {}
+        for state_name in MOVING_STATES:
+            for courier in self._by_state.get(state_name, {}).values():
+                if courier.target_location is not None and not courier.ensure_leg():
+                    groups.setdefault(type(courier.routing_strategy), []).append(courier)
+        
+        for couriers in groups.values():
+            if len(couriers) < config.BATCH_MOVE_MIN_COURIERS:
+                continue
+            positions = np.array([(courier.location.x, courier.location.y) for courier in couriers])
+            targets = np.array([(courier.target_location.x, courier.target_location.y) for courier in couriers])
+            # Prędkość liczona tak samo jak w stanach kuriera
+            speeds = np.array([courier.current_speed(weather_condition) for courier in couriers])
+            
+            new_positions, _, moved = couriers[0].routing_strategy.advance_batch(positions, targets, speeds)
+            for courier, (x, y), distance_moved in zip(couriers, new_positions.tolist(), moved.tolist()):
+                courier.set_batch_step(x, y, distance_moved)
 
     def _notify_accident(self, courier: Courier, weather_condition):
         """
@@ -79,6 +286,22 @@ class CourierManager(Subject):
             'weather': weather_condition.get_display_name()
         })
     
+    def _notify_fleet_change(self, event_type: str, courier: Courier):
+        """
+        Powiadamia obserwatorów o dołączeniu lub odejściu kuriera
+        
+        Args:
+            event_type: 'courier_added' lub 'courier_retired'
+            courier: Kurier
+        """
+        self.notify({
+            'type': event_type,
+            'courier_id': courier.id,
+            'courier_name': courier.name,
+            'courier_type': courier.courier_type,
+            'fleet_size': len(self._fleet)
+        })
+    
     def _notify_order_cancelled(self, order_id: int, courier: Courier, weather_condition):
         """
         Powiadamia obserwatorów o anulowanym zamówieniu
@@ -96,6 +319,38 @@ class CourierManager(Subject):
             'reason': f'Wypadek kuriera ({weather_condition.get_display_name()})'
         })
     
+    def _notify_order_requeued(self, order, courier: Courier):
+        """
+        Powiadamia obserwatorów o zamówieniu zwróconym do kolejki
+        
+        Args:
+            order: Zamówienie zwrócone do kolejki
+            courier: Kurier który miał wypadek
+        """
+        self.notify({
+            'type': 'order_requeued',
+            'order_id': order.id,
+            'courier_id': courier.id,
+            'courier_name': courier.name,
+            'requeue_count': order.requeue_count,
+            'picked_up': order.recovery_location is not None
+        })
+    
+    def _notify_order_released(self, order, courier: Courier):
+        """
+        Powiadamia obserwatorów o zamówieniu zwolnionym z kolejki kuriera (Order.release)
+        
+        Args:
+            order: Zamówienie zwolnione z kolejki kuriera
+            courier: Kurier który miał wypadek
+        """
+        self.notify({
+            'type': 'order_released',
+            'order_id': order.id,
+            'courier_id': courier.id,
+            'courier_name': courier.name
+        })
+    
     def _notify_delivery(self, courier: Courier, order):
         """
         Powiadamia obserwatorów o dostawie
@@ -123,14 +378,102 @@ class CourierManager(Subject):
             'delivery_time': delivery_time
         })
     
-    def get_available_couriers(self) -> List[Courier]:
+    def on_courier_state_changed(self, courier: Courier, previous_state, state):
         """
-        Zwraca dostępnych kurierów (stan Idle)
+        Aktualizuje zbiory kurierów po zmianie stanu (wywoływane z Courier.set_state)
+        
+        Args:
+            courier: Kurier który zmienił stan
+            previous_state: Poprzedni stan (None przy pierwszym ustawieniu)
+            state: Nowy stan
+        """
+        if previous_state is not None:
+            self._untrack(courier, previous_state)
+        
+        # Kurier zjeżdżający odchodzi gdy tylko skończy zamówienia
+        if courier.id in self._retiring and courier.is_available:
+            self._retire(courier)
+            return
+        self._track(courier)
+    
+    def _track(self, courier: Courier):
+        """Dodaje kuriera do zbiorów odpowiadających jego stanowi"""
+        self._by_state.setdefault(courier.state_name, {})[courier.id] = courier
+        if courier.is_available:
+            self._available[courier.id] = courier
+            bisect.insort(self._available_ids, courier.id)
+            bisect.insort(self._available_ids_by_type.setdefault(courier.courier_type, []), courier.id)
+            self._available_by_type.setdefault(courier.courier_type, {})[courier.id] = courier
+            self._spatial_index_for(courier.courier_type).insert(courier)
+        else:
+            self._active[courier.id] = courier
+        # Korki tworzą tylko kurierzy w jeździe - nie czekający, zaparkowani ani po wypadku
+        if self.congestion is not None and courier.state_name in MOVING_STATES:
+            self.congestion.insert(courier)
+    
+    def _untrack(self, courier: Courier, previous_state):
+        """Usuwa kuriera ze zbiorów poprzedniego stanu"""
+        members = self._by_state.get(previous_state.__class__.__name__)
+        if members is not None:
+            members.pop(courier.id, None)
+        if previous_state.is_available():
+            if self._available.pop(courier.id, None) is not None:
+                self._remove_available_id(courier)
+            self._available_by_type[courier.courier_type].pop(courier.id, None)
+            self.spatial_indexes[courier.courier_type].remove(courier)
+        else:
+            self._active.pop(courier.id, None)
+        if self.congestion is not None and previous_state.__class__.__name__ in MOVING_STATES:
+            self.congestion.remove(courier)
+    
+    def _remove_available_id(self, courier: Courier):
+        """Usuwa ID kuriera z uporządkowanych list wolnych kurierów (wyszukiwanie binarne)"""
+        for ids in (self._available_ids, self._available_ids_by_type[courier.courier_type]):
+            del ids[bisect.bisect_left(ids, courier.id)]
+    
+    def _spatial_index_for(self, courier_type: str) -> SpatialIndex:
+        """Indeks przestrzenny typu kuriera (tworzony przy pierwszym kurierze typu)"""
+        index = self.spatial_indexes.get(courier_type)
+        if index is None:
+            index = SpatialIndex(SpatialIndex.cell_size_for(self._type_counts[courier_type]))
+            self.spatial_indexes[courier_type] = index
+        return index
+    
+    def get_available_couriers(self, excluded_types: FrozenSet[str] = frozenset()) -> List[Courier]:
+        """
+        Zwraca dostępnych kurierów (stan Idle) w kolejności ID
+        
+        Args:
+            excluded_types: Pominięte typy kurierów (np. uziemione przez pogodę)
         
         Returns:
             list: Lista dostępnych kurierów
         """
-        return [courier for courier in self.couriers if courier.is_available]
+        if not excluded_types:
+            ids = self._available_ids
+        else:
+            runs = [ids for courier_type, ids in self._available_ids_by_type.items()
+                    if courier_type not in excluded_types]
+            # Jeden typ - gotowa lista; kilka - scalenie uporządkowanych list (timsort łączy serie)
+            ids = runs[0] if len(runs) == 1 else sorted(chain.from_iterable(runs))
+        available = self._available
+        return [available[courier_id] for courier_id in ids]
+    
+    def get_available_couriers_of_type(self, courier_type: str) -> List[Courier]:
+        """
+        Zwraca dostępnych kurierów danego typu
+        
+        Args:
+            courier_type: Typ kuriera
+        
+        Returns:
+            list: Dostępni kurierzy typu
+        """
+        return list(self._available_by_type.get(courier_type, {}).values())
+    
+    def num_available_of_type(self, courier_type: str) -> int:
+        """Liczba dostępnych kurierów danego typu - O(1)"""
+        return len(self._available_by_type.get(courier_type, ()))
     
     def get_active_couriers(self) -> List[Courier]:
         """
@@ -139,7 +482,66 @@ class CourierManager(Subject):
         Returns:
             list: Lista aktywnych kurierów
         """
-        return [courier for courier in self.couriers if not courier.is_available]
+        return list(self._active.values())
+    
+    @property
+    def num_available(self) -> int:
+        """Liczba dostępnych kurierów - O(1)"""
+        return len(self._available)
+    
+    @property
+    def num_active(self) -> int:
+        """Liczba aktywnych kurierów - O(1)"""
+        return len(self._active)
+    
+    def get_state_counts(self) -> Dict[str, int]:
+        """
+        Zwraca liczbę kurierów w każdym stanie
+        
+        Returns:
+            dict: Nazwa stanu -> liczba kurierów
+        """
+        return {state_name: len(members) for state_name, members in self._by_state.items() if members}
+    
+    def get_finishing_couriers(self, max_eta: float, speed_multiplier: float) -> List[Courier]:
+        """
+        Zwraca kurierów w drodze do klienta, którzy zaraz skończą dostawę
+        
+        Kandydaci do look-ahead dispatchu: bez zamówienia w kolejce, nie
+        zjeżdżający i z pozostałym czasem dostawy nie większym niż max_eta.
+        
+        Args:
+            max_eta: Maksymalny pozostały czas dostawy (kroki)
+            speed_multiplier: Mnożnik prędkości pogody
+            
+        Returns:
+            list: Kurierzy kończący dostawę
+        """
+        return [courier for courier in self._by_state.get("ToCustomerState", {}).values()
+                if courier.next_order is None and courier.id not in self._retiring
+                and courier.remaining_eta(speed_multiplier) <= max_eta]
+    
+    def queue_order_on_courier(self, courier: Courier, order):
+        """
+        Kolejkuje zamówienie u kuriera kończącego dostawę
+        
+        Kurier podejmie je zaraz po dostarczeniu bieżącego zamówienia.
+        
+        Args:
+            courier: Kurier w drodze do klienta
+            order: Zamówienie
+        """
+        courier.next_order = order
+        order.assign_to_courier(courier.id)
+        
+        # Powiadom obserwatorów
+        self.notify({
+            'type': 'order_assigned',
+            'order_id': order.id,
+            'courier_id': courier.id,
+            'courier_name': courier.name,
+            'queued': True
+        })
     
     def assign_order_to_courier(self, courier: Courier, order):
         """
@@ -155,7 +557,7 @@ class CourierManager(Subject):
         courier.assign_order(order)
         order.assign_to_courier(courier.id)
         
-        # Zmień stan kuriera na "jedzie do restauracji"
+        # Zmień stan kuriera na "jedzie do restauracji" (kurier znika z dostępnych)
         courier.set_state(ToRestaurantState())
         
         # Powiadom obserwatorów
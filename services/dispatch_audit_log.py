@@ -0,0 +1,151 @@
+"""
+Binarny dziennik przydziałów dispatchu (audit log)
+
+Każdy przydział to jeden rekord o stałej szerokości (32 bajty):
+
+    step, order_id, courier_id, distance, eta,
+    runner_up_id, runner_up_cost, num_candidates
+
+- distance / eta: dystans trasy i czas dojazdu wybranego kuriera do restauracji
+  (dla kuriera kończącego dostawę liczone od jego bieżącej pozycji przez klienta)
+- runner_up_id / runner_up_cost: drugi najlepszy kandydat i jego koszt
+  w jednostkach DISPATCH_COST (-1 / NaN gdy nie było drugiego kandydata)
+- num_candidates: liczba kurierów wciąż wolnych (w tym kończących dostawę)
+  w chwili decyzji o tym zamówieniu - w rundzie macierzowej kolumny rundy
+  (strefy) minus już przydzielone, w indeksie przestrzennym cała mapa
+
+Rekordy trafiają do bufora pierścieniowego NumPy i są dopisywane do pliku
+całymi blokami - gorąca pętla dispatchu tylko wpisuje liczby do tablicy,
+bez formatowania tekstu i bez operacji I/O na każdy przydział.
+Plik czyta się do analizy przez read_dispatch_audit_log (np.fromfile).
+"""
+
+import numpy as np
+
+
+# Format rekordu (little-endian, stała szerokość)
+AUDIT_RECORD_DTYPE = np.dtype([
+    ('step', '<i4'),
+    ('order_id', '<i4'),
+    ('courier_id', '<i4'),
+    ('distance', '<f4'),
+    ('eta', '<f4'),
+    ('runner_up_id', '<i4'),
+    ('runner_up_cost', '<f4'),
+    ('num_candidates', '<i4'),
+])
+
+
+class DispatchAuditLog:
+    """
+    Bufor pierścieniowy rekordów przydziału zapisywany blokami na dysk
+    
+    Bufor ma block_size rekordów. Po zapełnieniu cały blok jest dopisywany
+    do pliku, a bufor zapisywany od początku - ostatnie block_size rekordów
+    zostaje w pamięci (recent()) do podglądu w trakcie symulacji.
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko zapis rekordów przydziału
+    """
+    
+    def __init__(self, path: str, block_size: int = 4096):
+        """
+        Inicjalizuje dziennik (plik jest nadpisywany)
+        
+        Args:
+            path: Ścieżka do pliku binarnego
+            block_size: Liczba rekordów w bloku zapisu
+        """
+        if block_size <= 0:
+            raise ValueError(f"Rozmiar bloku musi być dodatni: {block_size}")
+        
+        self.path = path
+        self.block_size = block_size
+        self._buffer = np.zeros(block_size, dtype=AUDIT_RECORD_DTYPE)
+        self._position = 0      # Następny wolny rekord w buforze
+        self._unflushed = 0     # Rekordy w buforze jeszcze nie zapisane do pliku
+        self._wrapped = False   # Bufor był już zapełniony (recent() zawija)
+        self.total_records = 0
+        self.blocks_written = 0
+        self._file = open(path, 'wb')
+    
+    def record(
+        self,
+        step: int,
+        order_id: int,
+        courier_id: int,
+        distance: float,
+        eta: float,
+        runner_up_id: int,
+        runner_up_cost: float,
+        num_candidates: int
+    ):
+        """
+        Dopisuje rekord przydziału (zapis bloku gdy bufor się zapełni)
+        
+        Args:
+            step: Krok symulacji
+            order_id: ID zamówienia
+            courier_id: ID wybranego kuriera
+            distance: Dystans trasy wybranego kuriera do restauracji
+            eta: Czas dojazdu wybranego kuriera (kroki)
+            runner_up_id: ID drugiego kandydata (-1 = brak)
+            runner_up_cost: Koszt drugiego kandydata (NaN = brak)
+            num_candidates: Liczba kandydatów wciąż wolnych przy decyzji
+        """
+        self._buffer[self._position] = (step, order_id, courier_id, distance, eta,
+                                        runner_up_id, runner_up_cost, num_candidates)
+        self._position += 1
+        self._unflushed += 1
+        self.total_records += 1
+        
+        if self._position == self.block_size:
+            self.flush()
+            self._position = 0
+            self._wrapped = True
+    
+    def flush(self):
+        """Dopisuje do pliku rekordy jeszcze nie zapisane"""
+        if self._unflushed == 0 or self._file is None:
+            return
+        
+        start = self._position - self._unflushed
+        self._file.write(self._buffer[start:self._position].tobytes())
+        self._file.flush()
+        self._unflushed = 0
+        self.blocks_written += 1
+    
+    def recent(self) -> np.ndarray:
+        """
+        Ostatnie rekordy z bufora (najwyżej block_size, od najstarszego)
+        
+        Returns:
+            np.ndarray: Kopia rekordów
+        """
+        if not self._wrapped:
+            return self._buffer[:self._position].copy()
+        return np.concatenate((self._buffer[self._position:], self._buffer[:self._position]))
+    
+    def close(self):
+        """Zapisuje resztę bufora i zamyka plik"""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+    
+    def __repr__(self) -> str:
+        return f"DispatchAuditLog(path='{self.path}', records={self.total_records})"
+
+
+def read_dispatch_audit_log(path: str) -> np.ndarray:
+    """
+    Wczytuje dziennik przydziałów do analizy offline
+    
+    Args:
+        path: Ścieżka do pliku zapisanego przez DispatchAuditLog
+    
+    Returns:
+        np.ndarray: Tablica rekordów AUDIT_RECORD_DTYPE
+    """
+    return np.fromfile(path, dtype=AUDIT_RECORD_DTYPE)
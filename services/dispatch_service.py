@@ -4,23 +4,64 @@ Serwis dyspozytorski - przydziela zamówienia do kurierów
 Implementuje algorytm matchingu zamówień z kurierami
 """
 
-from typing import List, TYPE_CHECKING
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
 from models.order import Order
 from models.courier import Courier
 from services.order_manager import OrderManager
 from services.courier_manager import CourierManager
+from services.dispatch_audit_log import DispatchAuditLog
+from services.dispatch_snapshot import DispatchSnapshotRecorder
+from strategies.dispatch_strategy import DispatchStrategy, DispatchContext
+from strategies.greedy_dispatch import GreedyDispatch
+import config
 
 if TYPE_CHECKING:
     from weather.weather_condition import WeatherCondition
 
 
+# Kopia strategii dispatchu w procesie puli stref (ustawiana raz, przy starcie procesu)
+_zone_strategy: Optional[DispatchStrategy] = None
+
+
+def _init_zone_worker(strategy: DispatchStrategy):
+    """
+    Inicjalizuje proces puli stref - strategia przesyłana jest raz, nie z każdą strefą
+    
+    Args:
+        strategy: Strategia dispatchu
+    """
+    global _zone_strategy
+    _zone_strategy = strategy
+
+
+def _solve_zone(context: DispatchContext) -> Tuple[List, Optional[dict]]:
+    """
+    Rozwiązuje strefę w procesie puli (funkcja modułu - musi dać się przesłać)
+    
+    Args:
+        context: Tablice strefy z gotową macierzą kosztów
+    
+    Returns:
+        tuple: (pary, statystyki rundy) z DispatchStrategy.solve
+    """
+    return _zone_strategy.solve(context)
+
+
 class DispatchService:
     """
     Serwis dyspozytorski
     
     Odpowiada za:
     - Przydzielanie zamówień do dostępnych kurierów
-    - Optymalizację przydziału (najbliższy kurier)
+    - Optymalizację przydziału (najbliższy kurier z indeksu przestrzennego)
+    - Podział dużych rund na strefy mapy rozwiązywane równolegle
     
     Zasady SOLID:
     - Single Responsibility: tylko przydzielanie zamówień
@@ -30,7 +71,11 @@ class DispatchService:
     def __init__(
         self,
         order_manager: OrderManager,
-        courier_manager: CourierManager
+        courier_manager: CourierManager,
+        strategy: Optional[DispatchStrategy] = None,
+        cost_mode: Optional[str] = None,
+        audit_log: Optional[DispatchAuditLog] = None,
+        snapshot_recorder: Optional[DispatchSnapshotRecorder] = None
     ):
         """
         Inicjalizuje serwis dyspozytorski
@@ -38,119 +83,649 @@ class DispatchService:
         Args:
             order_manager: Manager zamówień
             courier_manager: Manager kurierów
+            strategy: Strategia przydziału (None = zachłannie, najbliższy kurier)
+            cost_mode: Koszt przydziału 'eta' lub 'distance' (None = z config)
+            audit_log: Binarny dziennik przydziałów (None = bez zapisu)
+            snapshot_recorder: Zapis rund do benchmarku polityk (None = bez zapisu)
         """
         self.order_manager = order_manager
         self.courier_manager = courier_manager
+        self.strategy = strategy if strategy is not None else GreedyDispatch()
+        self.cost_mode = cost_mode if cost_mode is not None else config.DISPATCH_COST
+        if self.cost_mode not in ('eta', 'distance'):
+            raise ValueError(f"Nieznany koszt dispatchu: '{self.cost_mode}' (dostępne: eta, distance)")
         self.current_weather = None  # Aktualna pogoda (ustawiana przez engine)
+        self.audit_log = audit_log
+        self.snapshot_recorder = snapshot_recorder
+        self._current_step = 0
+        
+        # Statystyki przydziałów
+        self.total_assignments = 0
+        self.total_pickup_distance = 0.0
+        self.total_pickup_eta = 0.0
+        self.queued_assignments = 0
+        
+        # Look-ahead: kurierzy kończący dostawę w ciągu DISPATCH_LOOKAHEAD_ETA kroków
+        self.lookahead_eta = config.DISPATCH_LOOKAHEAD_ETA
+        
+        # Ostatnio zgłoszone uziemione typy (komunikat tylko przy zmianie)
+        self._warned_grounded_types: FrozenSet[str] = frozenset()
+        
+        # Okno dispatchu (zbieranie zamówień i kurierów przez kilka kroków)
+        self.window_steps = config.DISPATCH_WINDOW_STEPS
+        self.window_queue_threshold = config.DISPATCH_WINDOW_QUEUE_THRESHOLD
+        self._steps_in_window = 0
+        self._last_round_signature = None
+        self.dispatch_rounds = 0
+        self.skipped_rounds = 0
     
-    def assign_orders(self, weather_condition: 'WeatherCondition'):
+        # Strefy mapy dla rund za dużych na jedną macierz (pula procesów tworzona leniwie)
+        self.zone_columns, self.zone_rows = config.DISPATCH_ZONES
+        self.zone_workers = config.DISPATCH_ZONE_WORKERS or os.cpu_count() or 1
+        self._zone_pool: Optional[ProcessPoolExecutor] = None
+        self.zoned_rounds = 0
+        self.zoned_assignments = 0
+        self.zone_border_orders = 0  # Przydziały stref oddane indeksowi (kurier zza granicy mógł być tańszy)
+    
+    def assign_orders(self, weather_condition: 'WeatherCondition', step: int = 0):
         """
         Przydziela oczekujące zamówienia do dostępnych kurierów
         
         NOWE: Drony nie latają w deszczu i śniegu!
         
+        Okno dispatchu: zamówienia i wolni kurierzy zbierają się przez
+        DISPATCH_WINDOW_STEPS kroków (albo do DISPATCH_WINDOW_QUEUE_THRESHOLD
+        oczekujących zamówień) i są dopasowywani jedną rundą. Runda bez zmian
+        od poprzedniej (te same zamówienia, kurierzy i uziemione typy) jest
+        pomijana - poprzednia wyczerpała już zamówienia albo kurierów.
+        
         Algorytm:
         1. Pobierz oczekujące zamówienia
-        2. Pobierz dostępnych kurierów
-        3. FILTRUJ dronów jeśli pada deszcz/śnieg
-        4. Dla każdego zamówienia znajdź najbliższego kuriera
-        5. Przypisz zamówienie
+        2. Ustal typy kurierów uziemione przez pogodę
+        3. Strategia dobiera kurierów na macierzy kosztów całej rundy
+           (czas dojazdu lub odległość - DISPATCH_COST)
+        4. Runda za duża na macierz: podział na strefy mapy, macierz każdej
+           strefy rozwiązywana w puli procesów (DISPATCH_ZONES)
+        5. Pozostałe zamówienia (strefy bez wolnych kurierów, zamówienia
+           przy granicach stref): najtańszy kurier z indeksu przestrzennego
         
         Args:
             weather_condition: Aktualna pogoda
+            step: Numer kroku symulacji (do dziennika przydziałów)
         """
+        self._current_step = step
         pending_orders = self.order_manager.get_pending_orders()
-        available_couriers = self.courier_manager.get_available_couriers()
+        if not pending_orders:
+            # Okno liczy się od pierwszego oczekującego zamówienia
+            self._steps_in_window = 0
+            return
+        
+        self._steps_in_window += 1
+        if (self._steps_in_window < self.window_steps and
+                len(pending_orders) < self.window_queue_threshold):
+            return
+        self._steps_in_window = 0
         
         # NOWE: Filtruj dronów w złej pogodzie
-        available_couriers = self._filter_couriers_by_weather(available_couriers, weather_condition)
-        
-        # Dopóki są zamówienia i kurierzy
-        while pending_orders and available_couriers:
-            # Pobierz pierwsze zamówienie z kolejki
-            order = pending_orders[0]
-            
-            # Znajdź najbliższego kuriera
-            closest_courier = self._find_closest_courier(order, available_couriers)
-            
-            if closest_courier:
-                # Przypisz zamówienie
-                self.courier_manager.assign_order_to_courier(closest_courier, order)
-                
-                # Usuń z list
-                pending_orders.remove(order)
-                available_couriers.remove(closest_courier)
-            else:
+        grounded_types = self._get_grounded_courier_types(weather_condition)
+        speed_multiplier = weather_condition.get_speed_multiplier()
+        
+        # Look-ahead: kurierzy w drodze do klienta, bliscy końca dostawy
+        finishing_couriers = []
+        if self.lookahead_eta > 0:
+            finishing_couriers = [
+                courier for courier in self.courier_manager.get_finishing_couriers(self.lookahead_eta, speed_multiplier)
+                if courier.courier_type not in grounded_types
+            ]
+        
+        # Nic się nie zmieniło od ostatniej rundy - nowy przydział nic nie da
+        round_signature = (
+            self.order_manager.pending_version,
+            self.courier_manager.availability_version,
+            grounded_types,
+            tuple(courier.id for courier in finishing_couriers)
+        )
+        if round_signature == self._last_round_signature:
+            self.skipped_rounds += 1
+            return
+        self._last_round_signature = round_signature
+        self.dispatch_rounds += 1
+        
+        # Strategia rozwiązująca całą rundę naraz (macierz kosztów)
+        if self._assign_with_strategy(pending_orders, grounded_types, speed_multiplier, finishing_couriers):
+            return
+        
+        # Strefy rozwiązywane niezależnie - reszta trafia do indeksu przestrzennego
+        if self.zone_columns * self.zone_rows > 1:
+            pending_orders = self._assign_by_zone(pending_orders, grounded_types, speed_multiplier,
+                                                  finishing_couriers)
+        
+        # Z dziennikiem potrzebny jest też drugi kandydat do porównania
+        k = 2 if self.audit_log is not None else 1
+        
+        # Kandydaci wciąż wolni przy decyzji (jak w _commit_pairs - maleje po każdym przydziale)
+        num_candidates = len(finishing_couriers) + sum(
+            len(index) for courier_type, index in self.courier_manager.spatial_indexes.items()
+            if courier_type not in grounded_types
+        )
+        
+        # Koszty kurierów kończących dostawę - jeden blok (zamówienia x kurierzy) na rundę,
+        # liczony jak w macierzy strategii (calculate_distance_matrix na typ kuriera)
+        finishing_left = len(finishing_couriers)
+        if finishing_left:
+            finishing_cost = self._round_context(pending_orders[:num_candidates], [], speed_multiplier,
+                                                 finishing_couriers).cost_matrix()
+            finishing_free = np.ones(finishing_left, dtype=bool)
+            finishing_column = {courier.id: column for column, courier in enumerate(finishing_couriers)}
+        
+        for row, order in enumerate(pending_orders):
+            # Najtańsi wolni kurierzy z indeksu przestrzennego
+            candidates = [(cost, courier, False)
+                          for cost, courier in self._find_closest_couriers(order, grounded_types, speed_multiplier, k)]
+            
+            # Kurier kończący dostawę może dotrzeć szybciej niż wolny (przy remisie wygrywa wolny)
+            if finishing_left:
+                costs = np.where(finishing_free, finishing_cost[row], np.inf)
+                columns = np.argsort(costs, kind='stable')[:min(k, finishing_left)]
+                candidates += [(float(costs[column]), finishing_couriers[column], True) for column in columns]
+                candidates.sort(key=lambda entry: entry[0])
+            
+            if not candidates:
+                # Brak dostępnych kurierów - żadne kolejne zamówienie też go nie dostanie
                 break
+            
+            _, closest_courier, queued = candidates[0]
+            if queued:
+                finishing_free[finishing_column[closest_courier.id]] = False
+                finishing_left -= 1
+            
+            runner_up = candidates[1] if len(candidates) > 1 else (math.nan, None, False)
+            
+            # Przypisz zamówienie (usuwa kuriera z indeksu dostępnych)
+            self._commit_assignment(closest_courier, order, speed_multiplier, queued,
+                                    runner_up[1], runner_up[0], num_candidates)
+            num_candidates -= 1
     
-    def _find_closest_courier(
+    def _assign_with_strategy(
         self,
-        order: Order,
-        available_couriers: List[Courier]
-    ) -> Courier:
+        pending_orders: List[Order],
+        grounded_types: FrozenSet[str],
+        speed_multiplier: float,
+        finishing_couriers: List[Courier]
+    ) -> bool:
         """
-        Znajduje najbliższego kuriera do restauracji zamówienia
+        Przydziela rundę strategią dispatchu (macierz kosztów zamówienia x kurierzy)
+        
+        W rundzie obsłużyć można najwyżej tylu zamówień ilu jest kurierów -
+        biorąc pierwsze zamówienia z kolejki, strategia optymalizuje przydział
+        bez głodzenia najstarszych zamówień.
         
         Args:
-            order: Zamówienie
-            available_couriers: Lista dostępnych kurierów
+            pending_orders: Oczekujące zamówienia (w kolejności priorytetu)
+            grounded_types: Typy kurierów uziemione przez pogodę
+            speed_multiplier: Mnożnik prędkości pogody
+            finishing_couriers: Kurierzy kończący dostawę (kolumny za wolnymi)
             
         Returns:
-            Courier: Najbliższy kurier lub None
+            bool: False jeśli runda jest za duża dla strategii (użyj zachłannego)
         """
-        if not available_couriers:
-            return None
+        couriers = self.courier_manager.get_available_couriers(grounded_types)
+        num_available = len(couriers)
+        couriers += finishing_couriers
+        orders = pending_orders[:len(couriers)]
+        
+        if not orders:
+            return True
         
-        restaurant_location = order.pickup_location
+        # Snapshot zapisywany także dla rund za dużych dla strategii
+        context = None
+        if self.snapshot_recorder is not None and self.snapshot_recorder.should_record():
+            context = self._round_context(orders, couriers[:num_available], speed_multiplier, finishing_couriers)
+            self.snapshot_recorder.record(context, self._current_step)
         
-        # Znajdź kuriera z minimalnym dystansem
-        closest_courier = min(
-            available_couriers,
-            key=lambda c: c.location.distance_to(restaurant_location)
+        if not self.strategy.can_solve(len(orders), len(couriers)):
+            return False
+        
+        if context is None:
+            context = self._round_context(orders, couriers[:num_available], speed_multiplier, finishing_couriers)
+        self._commit_pairs(context, self.strategy.assign(context), orders, couriers,
+                           num_available, speed_multiplier)
+        
+        return True
+    
+    def _round_context(
+        self,
+        orders: List[Order],
+        couriers: List[Courier],
+        speed_multiplier: float,
+        finishing_couriers: List[Courier] = ()
+    ) -> DispatchContext:
+        """
+        Buduje kontekst rundy z kosztem wg trybu serwisu (eta / distance)
+        
+        Args:
+            orders: Zamówienia rundy
+            couriers: Wolni kurierzy
+            speed_multiplier: Mnożnik prędkości pogody
+            finishing_couriers: Kurierzy kończący dostawę
+            
+        Returns:
+            DispatchContext: Kontekst rundy
+        """
+        return DispatchContext.from_round(
+            orders, couriers,
+            speed_multiplier if self.cost_mode == 'eta' else None,
+            finishing_couriers
         )
+    
+    def _assign_by_zone(
+        self,
+        pending_orders: List[Order],
+        grounded_types: FrozenSet[str],
+        speed_multiplier: float,
+        finishing_couriers: List[Courier]
+    ) -> List[Order]:
+        """
+        Przydziela rundę niezależnie w strefach mapy (siatka DISPATCH_ZONES)
+        
+        Zamówienie należy do strefy restauracji, wolny kurier do strefy
+        swojej pozycji, a kurier kończący dostawę do strefy celu tej dostawy
+        (jego kolumny są za wolnymi kurierami strefy, jak w całej rundzie).
+        Konteksty i macierze kosztów budowane są w procesie głównym.
+        Przydziały w strefach to pętle Pythona trzymające GIL, więc liczy je
+        pula DISPATCH_ZONE_WORKERS procesów - do procesów trafiają tylko
+        tablice strefy, a wracają pary. Domyślnie (jeden proces) strefy
+        liczone są po kolei, bez puli - zysk z wielu rdzeni trzeba najpierw
+        zmierzyć na docelowej maszynie. Przydziały zatwierdzane są w procesie głównym,
+        w kolejności stref.
+        
+        Uzgodnienie granic: przydział w strefie zostaje, jeśli najtańszy
+        wolny kurier całej mapy nie jest tańszym kurierem zza granicy
+        strefy (_drop_border_pairs). Pozostałe zamówienia - przy granicach, ze stref z niedoborem kurierów
+        i ze stref za dużych dla strategii - wracają do wywołującego i dostają
+        najtańszego kuriera z indeksu przestrzennego całej mapy.
+        
+        Args:
+            pending_orders: Oczekujące zamówienia (w kolejności priorytetu)
+            grounded_types: Typy kurierów uziemione przez pogodę
+            speed_multiplier: Mnożnik prędkości pogody
+            finishing_couriers: Kurierzy kończący dostawę (wykorzystani są usuwani z listy)
+            
+        Returns:
+            list: Zamówienia nieprzydzielone w strefach (w kolejności priorytetu)
+        """
+        zone_orders: Dict[int, List[Order]] = {}
+        for order in pending_orders:
+            zone_orders.setdefault(self._zone_of(order.pickup_location), []).append(order)
+        zone_couriers: Dict[int, List[Courier]] = {}
+        for courier in self.courier_manager.get_available_couriers(grounded_types):
+            zone_couriers.setdefault(self._zone_of(courier.location), []).append(courier)
+        zone_finishing: Dict[int, List[Courier]] = {}
+        for courier in finishing_couriers:
+            zone_finishing.setdefault(self._zone_of(courier.target_location), []).append(courier)
+        
+        rounds = []
+        for zone in sorted(zone_orders):
+            couriers = zone_couriers.get(zone, [])
+            finishing = zone_finishing.get(zone, [])
+            orders = zone_orders[zone][:len(couriers) + len(finishing)]
+            if not orders or not self.strategy.can_solve(len(orders), len(couriers) + len(finishing)):
+                continue
+            context = self._round_context(orders, couriers, speed_multiplier, finishing)
+            rounds.append((zone, context, orders, couriers + finishing, len(couriers)))
+        
+        if not rounds:
+            return pending_orders
+        
+        contexts = [context for _, context, _, _, _ in rounds]
+        if self.zone_workers > 1 and len(rounds) > 1:
+            # Macierze liczone tutaj - do procesu trafiają same tablice
+            for context in contexts:
+                context.cost_matrix()
+            if self._zone_pool is None:
+                # 'spawn' - nowe procesy nie dziedziczą stanu rodzica (np. okna pygame)
+                self._zone_pool = ProcessPoolExecutor(
+                    max_workers=self.zone_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_zone_worker,
+                    initargs=(self.strategy,)
+                )
+            solutions = self._zone_pool.map(_solve_zone, contexts)
+        else:
+            solutions = map(self.strategy.solve, contexts)
+        
+        # Koszt jednostki odległości dla najszybszego kuriera spoza strefy
+        cost_per_unit = 1.0
+        if self.cost_mode == 'eta':
+            max_speed = max(speed for courier_type, speed in self.courier_manager.max_speed_by_type.items()
+                            if courier_type not in grounded_types)
+            cost_per_unit = 1.0 / (max_speed * speed_multiplier)
+        
+        self.zoned_rounds += 1
+        assigned = set()
+        for (zone, context, orders, couriers, num_available), (pairs, round_stats) in zip(rounds, solutions):
+            if round_stats is not None:
+                self.strategy.record_round(round_stats)
+            pairs = self._drop_border_pairs(zone, context, pairs, orders, grounded_types,
+                                            speed_multiplier, cost_per_unit)
+            self._commit_pairs(context, pairs, orders, couriers, num_available, speed_multiplier)
+            for order_index, courier_index in pairs:
+                assigned.add(orders[order_index].id)
+                if courier_index >= num_available:
+                    finishing_couriers.remove(couriers[courier_index])
+            self.zoned_assignments += len(pairs)
+        
+        return [order for order in pending_orders if order.id not in assigned]
+    
+    def _drop_border_pairs(
+        self,
+        zone: int,
+        context: DispatchContext,
+        pairs: List,
+        orders: List[Order],
+        grounded_types: FrozenSet[str],
+        speed_multiplier: float,
+        cost_per_unit: float
+    ) -> List:
+        """
+        Odrzuca przydziały strefy, które wolny kurier zza jej granicy pobija
+        
+        Kurier spoza strefy jest od punktu odbioru co najmniej o odległość
+        do najbliższej wewnętrznej granicy strefy (brzeg mapy się nie liczy),
+        więc przydział tańszy niż ta odległość razy cost_per_unit jest pewny
+        bez zapytań. Dla pozostałych indeks przestrzenny całej mapy podaje
+        najtańszego wolnego kuriera - jeśli jest spoza strefy i tańszy,
+        zamówienie wraca do wywołującego.
         
-        return closest_courier
+        Args:
+            zone: Numer strefy
+            context: Kontekst strefy (macierz kosztów)
+            pairs: Pary (indeks zamówienia, indeks kuriera) ze strategii
+            orders: Zamówienia strefy (wiersze)
+            grounded_types: Typy kurierów uziemione przez pogodę
+            speed_multiplier: Mnożnik prędkości pogody
+            cost_per_unit: Najniższy koszt jednostki odległości (1 dla 'distance')
+            
+        Returns:
+            list: Pary do zatwierdzenia (w tej samej kolejności)
+        """
+        if not pairs:
+            return pairs
+        
+        column, row = zone % self.zone_columns, zone // self.zone_columns
+        width = config.MAP_WIDTH / self.zone_columns
+        height = config.MAP_HEIGHT / self.zone_rows
+        rows = np.array([order_index for order_index, _ in pairs])
+        cols = np.array([courier_index for _, courier_index in pairs])
+        x, y = context.pickup_xy[rows, 0], context.pickup_xy[rows, 1]
+        
+        border = np.full(len(pairs), np.inf)
+        if column > 0:
+            border = np.minimum(border, x - column * width)
+        if column < self.zone_columns - 1:
+            border = np.minimum(border, (column + 1) * width - x)
+        if row > 0:
+            border = np.minimum(border, y - row * height)
+        if row < self.zone_rows - 1:
+            border = np.minimum(border, (row + 1) * height - y)
+        
+        costs = context.cost_matrix()[rows, cols]
+        safe = costs <= border * cost_per_unit
+        
+        kept = []
+        for pair, cost, is_safe in zip(pairs, costs.tolist(), safe.tolist()):
+            if not is_safe:
+                order = orders[pair[0]]
+                nearest = self._find_closest_couriers(order, grounded_types, speed_multiplier)
+                if nearest and self._zone_of(nearest[0][1].location) != zone and nearest[0][0] < cost:
+                    continue
+            kept.append(pair)
+        
+        self.zone_border_orders += len(pairs) - len(kept)
+        return kept
     
-    def _filter_couriers_by_weather(
+    def _zone_of(self, location) -> int:
+        """
+        Numer strefy mapy dla lokalizacji (siatka zone_columns x zone_rows)
+        
+        Args:
+            location: Lokalizacja
+            
+        Returns:
+            int: Numer strefy (wierszami)
+        """
+        column = min(max(int(location.x * self.zone_columns / config.MAP_WIDTH), 0), self.zone_columns - 1)
+        row = min(max(int(location.y * self.zone_rows / config.MAP_HEIGHT), 0), self.zone_rows - 1)
+        return row * self.zone_columns + column
+    
+    def _commit_pairs(
         self,
+        context: DispatchContext,
+        pairs: List,
+        orders: List[Order],
         couriers: List[Courier],
-        weather_condition: 'WeatherCondition'
-    ) -> List[Courier]:
+        num_available: int,
+        speed_multiplier: float
+    ):
         """
-        Filtruje kurierów na podstawie pogody
+        Zatwierdza przydziały strategii (z drugimi kandydatami do dziennika)
         
-        REALIZM: Drony nie mogą latać w deszczu i śniegu!
+        Args:
+            context: Kontekst rundy (macierz kosztów)
+            pairs: Pary (indeks zamówienia, indeks kuriera)
+            orders: Zamówienia rundy (wiersze)
+            couriers: Kurierzy rundy (kolumny; od num_available kończący dostawę)
+            num_available: Liczba wolnych kurierów wśród kolumn
+            speed_multiplier: Mnożnik prędkości pogody
+        """
+        runner_ups = [(None, math.nan)] * len(pairs)
+        if self.audit_log is not None and pairs:
+            runner_ups = self._runner_ups(context.cost_matrix(), pairs, couriers)
+        
+        # Kandydaci przy decyzji: kolumny rundy bez kurierów przydzielonych wcześniej
+        num_candidates = len(couriers)
+        for (order_index, courier_index), (runner_up, runner_up_cost) in zip(pairs, runner_ups):
+            self._commit_assignment(couriers[courier_index], orders[order_index], speed_multiplier,
+                                    courier_index >= num_available, runner_up, runner_up_cost,
+                                    num_candidates)
+            num_candidates -= 1
+    
+    @staticmethod
+    def _runner_ups(cost_matrix: np.ndarray, pairs: List, couriers: List[Courier]) -> List:
+        """
+        Drugi najlepszy kurier każdego przydziału (wiersz macierzy bez wybranego)
         
         Args:
-            couriers: Lista dostępnych kurierów
-            weather_condition: Aktualna pogoda
+            cost_matrix: Koszty (zamówienia x kurierzy)
+            pairs: Przydziały (indeks zamówienia, indeks kuriera)
+            couriers: Kurierzy rundy (kolumny macierzy)
             
         Returns:
-            List[Courier]: Odfiltrowana lista kurierów
+            list: Krotki (kurier lub None, koszt lub NaN)
+        """
+        if cost_matrix.shape[1] < 2:
+            return [(None, math.nan)] * len(pairs)
+        
+        rows = np.array([order_index for order_index, _ in pairs])
+        chosen = np.array([courier_index for _, courier_index in pairs])
+        costs = cost_matrix[rows]
+        costs[np.arange(len(pairs)), chosen] = np.inf
+        second = np.argmin(costs, axis=1)
+        return [(couriers[column], float(costs[row, column]))
+                for row, column in enumerate(second)]
+    
+    def _commit_assignment(
+        self,
+        courier: Courier,
+        order: Order,
+        speed_multiplier: float,
+        queued: bool = False,
+        runner_up: Optional[Courier] = None,
+        runner_up_cost: float = math.nan,
+        num_candidates: int = 0
+    ):
+        """
+        Zatwierdza przydział, aktualizuje statystyki i dziennik przydziałów
+        
+        Args:
+            courier: Wybrany kurier
+            order: Zamówienie
+            speed_multiplier: Mnożnik prędkości pogody
+            queued: True gdy kurier kończy dostawę (zamówienie trafia do jego kolejki)
+            runner_up: Drugi najlepszy kandydat (do dziennika)
+            runner_up_cost: Koszt drugiego kandydata (do dziennika)
+            num_candidates: Liczba kandydatów wciąż wolnych przy decyzji (do dziennika)
+        """
+        self.total_assignments += 1
+        speed = courier.base_speed * speed_multiplier
+        
+        if queued:
+            # Odcinek do restauracji zaczyna się u klienta bieżącej dostawy
+            start = courier.target_location
+            route_distance = (courier.remaining_distance +
+                              courier.routing_strategy.calculate_distance(start, order.pickup_location))
+            self.total_pickup_distance += start.distance_to(order.pickup_location)
+            self.queued_assignments += 1
+        else:
+            route_distance = courier.routing_strategy.calculate_distance(courier.location, order.pickup_location)
+            self.total_pickup_distance += courier.location.distance_to(order.pickup_location)
+        
+        eta = route_distance / speed
+        self.total_pickup_eta += eta
+        
+        if self.audit_log is not None:
+            self.audit_log.record(
+                self._current_step, order.id, courier.id, route_distance, eta,
+                runner_up.id if runner_up is not None else -1, runner_up_cost, num_candidates
+            )
+        
+        if queued:
+            self.courier_manager.queue_order_on_courier(courier, order)
+        else:
+            self.courier_manager.assign_order_to_courier(courier, order)
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki dispatchu
+        
+        Returns:
+            dict: Statystyki
         """
-        weather_name = weather_condition.get_display_name().lower()
+        average_pickup = (self.total_pickup_distance / self.total_assignments
+                          if self.total_assignments > 0 else 0.0)
+        average_eta = (self.total_pickup_eta / self.total_assignments
+                       if self.total_assignments > 0 else 0.0)
         
-        # Drony nie latają w deszczu i śniegu
-        bad_weather_for_drones = ['deszcz', 'snieg']
+        return {
+            'policy': self.strategy.get_name(),
+            'cost': self.cost_mode,
+            'total_assignments': self.total_assignments,
+            'queued_assignments': self.queued_assignments,
+            'total_pickup_distance': self.total_pickup_distance,
+            'average_pickup_distance': average_pickup,
+            'average_pickup_eta': average_eta,
+            'dispatch_rounds': self.dispatch_rounds,
+            'skipped_rounds': self.skipped_rounds,
+            'zoned_rounds': self.zoned_rounds,
+            'zoned_assignments': self.zoned_assignments,
+            'zone_border_orders': self.zone_border_orders,
+            'strategy': self.strategy.get_stats()
+        }
+    
+    def _find_closest_couriers(
+        self,
+        order: Order,
+        grounded_types: FrozenSet[str],
+        speed_multiplier: float,
+        k: int = 1
+    ) -> List[Tuple[float, Courier]]:
+        """
+        Znajduje k kurierów którzy najszybciej dotrą do restauracji zamówienia
         
-        filtered = []
-        grounded_drones = 0
+        Zapytanie do indeksu przestrzennego przegląda tylko kubełki wokół
+        restauracji zamiast wszystkich dostępnych kurierów. Przy koszcie 'eta'
+        czas dojazdu liczy strategia routingu kuriera (dron leci prosto,
+        rower jedzie ulicami) - jednym calculate_distance_matrix dla
+        kurierów pierścienia kubełków - a najszybszy kurier typu wyznacza
+        kiedy dalsze kubełki nie mogą już dać lepszego wyniku.
         
-        for courier in couriers:
-            # Jeśli to dron i jest zła pogoda - pomiń
-            if courier.courier_type == "drone" and any(bad in weather_name for bad in bad_weather_for_drones):
-                grounded_drones += 1
+        Args:
+            order: Zamówienie
+            grounded_types: Typy kurierów uziemione przez pogodę
+            speed_multiplier: Mnożnik prędkości pogody
+            k: Liczba kurierów (2 = także drugi kandydat do dziennika)
+            
+        Returns:
+            list: Pary (czas dojazdu lub odległość, kurier) od najtańszej (pusta gdy brak)
+        """
+        pickup = order.pickup_location
+        pickup_xy = np.array([[pickup.x, pickup.y]])
+        best = []
+        
+        # Jedno zapytanie na pulę typu kuriera - uziemione typy są pomijane w całości
+        for courier_type, index in self.courier_manager.spatial_indexes.items():
+            if courier_type in grounded_types or not len(index):
                 continue
             
-            filtered.append(courier)
+            if self.cost_mode == 'eta':
+                max_speed = self.courier_manager.max_speed_by_type[courier_type]
+                nearest = index.nearest_with_costs(
+                    pickup, k=k, cost=lambda couriers: self._eta_batch(couriers, pickup_xy, speed_multiplier),
+                    cost_per_unit=1.0 / (max_speed * speed_multiplier)
+                )
+            else:
+                nearest = index.nearest_with_costs(pickup, k=k)
+            
+            best.extend(((cost, courier.id), courier) for cost, courier in nearest)
+        
+        best.sort(key=lambda entry: entry[0])
+        return [(cost, courier) for (cost, _), courier in best[:k]]
+    
+    @staticmethod
+    def _eta_batch(couriers: List[Courier], pickup_xy: np.ndarray, speed_multiplier: float) -> List[float]:
+        """
+        Czasy dojazdu kurierów jednego typu do punktu odbioru (jedno wywołanie macierzy)
+        
+        Args:
+            couriers: Kurierzy jednego typu (ta sama strategia routingu)
+            pickup_xy: Tablica (1, 2) punktu odbioru
+            speed_multiplier: Mnożnik prędkości pogody
+            
+        Returns:
+            list: Czas dojazdu każdego kuriera (w krokach)
+        """
+        starts = np.array([(courier.location.x, courier.location.y) for courier in couriers], dtype=np.float64)
+        speeds = np.array([courier.base_speed for courier in couriers], dtype=np.float64)
+        distances = couriers[0].routing_strategy.calculate_distance_matrix(starts, pickup_xy)[0]
+        return (distances / (speeds * speed_multiplier)).tolist()
+    
+    def close(self):
+        """Zamyka pulę procesów stref (jeśli była utworzona)"""
+        if self._zone_pool is not None:
+            self._zone_pool.shutdown()
+            self._zone_pool = None
+    
+    def _get_grounded_courier_types(self, weather_condition: 'WeatherCondition') -> FrozenSet[str]:
+        """
+        Zwraca typy kurierów które nie mogą pracować w danej pogodzie
+        
+        REALIZM: Drony nie mogą latać w deszczu i śniegu!
+        Zbiór jest wyliczony raz w WeatherCondition - tu tylko komunikat
+        przy zmianie uziemionych typów.
+        
+        Args:
+            weather_condition: Aktualna pogoda
+            
+        Returns:
+            FrozenSet[str]: Uziemione typy kurierów
+        """
+        grounded_types = weather_condition.get_grounded_courier_types()
         
-        # Informuj o uziemionych dronach (tylko raz na zmianę pogody)
-        if grounded_drones > 0 and not hasattr(self, '_last_grounded_warning'):
-            print(f"[Dispatch] UWAGA: {grounded_drones} dronow uziemionych z powodu pogody!")
-            self._last_grounded_warning = weather_name
-        elif grounded_drones == 0:
-            # Reset warningów gdy pogoda się poprawi
-            if hasattr(self, '_last_grounded_warning'):
-                delattr(self, '_last_grounded_warning')
+        # Informuj o uziemionych kurierach (tylko raz na zmianę uziemionych typów)
+        if grounded_types and grounded_types != self._warned_grounded_types:
+            for courier_type in sorted(grounded_types):
+                grounded = self.courier_manager.num_available_of_type(courier_type)
+                print(f"[Dispatch] UWAGA: {grounded} kurierow typu {courier_type} uziemionych z powodu pogody!")
+        self._warned_grounded_types = grounded_types
         
-        return filtered
+        return grounded_types
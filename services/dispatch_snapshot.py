@@ -0,0 +1,151 @@
+"""
+Zapis i odczyt rund dispatchu (snapshoty do benchmarku polityk)
+
+Snapshot to jedna runda przydziału zapisana jako plik .npz:
+
+- pickup_xy (P, 2): punkty odbioru zamówień (w kolejności priorytetu)
+- courier_xy (C, 2): pozycje kandydatów (kurierzy kończący dostawę: cel dostawy)
+- courier_speed (C,): prędkości z pogodą (puste = koszt to dystans)
+- courier_delay (C,): opóźnienie kandydata (puste = brak look-ahead)
+- courier_routing (C,): nazwa klasy strategii routingu kandydata
+
+Z pliku odtwarzany jest DispatchContext, więc benchmark_dispatch.py może
+uruchomić na nagranych rundach każdą politykę bez pełnej symulacji.
+"""
+
+import os
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from strategies.dispatch_strategy import DispatchContext
+from strategies.routing_strategy import RoutingStrategy
+from strategies.direct_route import DirectRoute
+from strategies.grid_route import GridRoute
+from strategies.street_route import StreetRoute
+
+
+# Nazwa klasy -> strategia routingu (odtwarzanie grup routingu ze snapshotu)
+ROUTING_STRATEGIES: Dict[str, Type[RoutingStrategy]] = {
+    'DirectRoute': DirectRoute,
+    'GridRoute': GridRoute,
+    'StreetRoute': StreetRoute
+}
+
+
+class DispatchSnapshotRecorder:
+    """
+    Zapisuje co N-tą rundę dispatchu do katalogu snapshotów
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko zapis rund dispatchu
+    """
+    
+    def __init__(self, directory: str, interval: int = 1):
+        """
+        Inicjalizuje rejestrator (katalog jest tworzony w razie potrzeby)
+        
+        Args:
+            directory: Katalog na pliki .npz
+            interval: Zapisuj co N-tą rundę (1 = każdą)
+        """
+        if interval <= 0:
+            raise ValueError(f"Interwał snapshotów musi być dodatni: {interval}")
+        
+        self.directory = directory
+        self.interval = interval
+        self._rounds_seen = 0
+        self.snapshots_written = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    def should_record(self) -> bool:
+        """
+        Czy bieżąca runda ma zostać zapisana (liczy rundy)
+        
+        Returns:
+            bool: True co interval rund
+        """
+        self._rounds_seen += 1
+        return (self._rounds_seen - 1) % self.interval == 0
+    
+    def record(self, context: DispatchContext, step: int = 0):
+        """
+        Zapisuje rundę do pliku snapshot_<numer>.npz
+        
+        Args:
+            context: Kontekst rundy
+            step: Krok symulacji (zapisywany w pliku)
+        """
+        path = os.path.join(self.directory, f"snapshot_{self.snapshots_written:06d}.npz")
+        save_dispatch_snapshot(path, context, step)
+        self.snapshots_written += 1
+    
+    def __repr__(self) -> str:
+        return f"DispatchSnapshotRecorder(directory='{self.directory}', written={self.snapshots_written})"
+
+
+def save_dispatch_snapshot(path: str, context: DispatchContext, step: int = 0):
+    """
+    Zapisuje kontekst rundy do pliku .npz
+    
+    Args:
+        path: Ścieżka do pliku
+        context: Kontekst rundy
+        step: Krok symulacji
+    """
+    routing = np.full(context.num_couriers, '', dtype=object)
+    for strategy, columns in context.routing_groups or ():
+        routing[columns] = strategy.__class__.__name__
+    
+    np.savez_compressed(
+        path,
+        step=np.int64(step),
+        pickup_xy=context.pickup_xy,
+        courier_xy=context.courier_xy,
+        courier_speed=context.courier_speed if context.courier_speed is not None else np.empty(0),
+        courier_delay=context.courier_delay if context.courier_delay is not None else np.empty(0),
+        courier_routing=routing.astype(str)
+    )
+
+
+def load_dispatch_snapshot(path: str) -> DispatchContext:
+    """
+    Odtwarza kontekst rundy z pliku .npz
+    
+    Args:
+        path: Ścieżka do pliku zapisanego przez save_dispatch_snapshot
+    
+    Returns:
+        DispatchContext: Kontekst rundy (macierz kosztów liczona od nowa)
+    """
+    with np.load(path) as data:
+        pickup_xy = data['pickup_xy']
+        courier_xy = data['courier_xy']
+        courier_speed: Optional[np.ndarray] = data['courier_speed'] if data['courier_speed'].size else None
+        courier_delay: Optional[np.ndarray] = data['courier_delay'] if data['courier_delay'].size else None
+        routing = data['courier_routing']
+    
+    routing_groups = None
+    if courier_speed is not None:
+        routing_groups = []
+        for name in sorted(set(routing.tolist())):
+            if name not in ROUTING_STRATEGIES:
+                raise ValueError(f"Nieznana strategia routingu w snapshocie {path}: '{name}'")
+            routing_groups.append((ROUTING_STRATEGIES[name](), np.flatnonzero(routing == name)))
+    
+    return DispatchContext(pickup_xy, courier_xy, courier_speed, routing_groups, courier_delay)
+
+
+def list_dispatch_snapshots(path: str) -> List[str]:
+    """
+    Zwraca pliki snapshotów (katalog albo pojedynczy plik)
+    
+    Args:
+        path: Katalog z plikami .npz lub ścieżka do pliku
+    
+    Returns:
+        list: Posortowane ścieżki plików .npz
+    """
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.npz'))
+    return [path]
@@ -5,12 +5,16 @@ Odpowiada za tworzenie i śledzenie zamówień
 """
 
 import random
-from typing import List
+from typing import Dict, List, Optional
 from models.order import Order, OrderStatus
+from models.location import Location
 from models.restaurant import Restaurant
 from models.customer import Customer
 from factories.order_factory import OrderFactory
 from services.pricing_engine import PricingEngine
+from services.order_trace import OrderTrace
+from routing.contraction_hierarchy import ContractionHierarchy
+from routing.route_table import RouteTable
 from observers.subject import Subject
 # DirectRoute nie jest już potrzebne - każdy kurier ma swoją strategię!
 import config
@@ -33,7 +37,9 @@ class OrderManager(Subject):
     def __init__(
         self,
         restaurants: List[Restaurant],
-        pricing_engine: PricingEngine
+        pricing_engine: PricingEngine,
+        order_trace: Optional[OrderTrace] = None,
+        route_table: Optional[RouteTable] = None
     ):
         """
         Inicjalizuje manager zamówień
@@ -41,15 +47,30 @@ class OrderManager(Subject):
         Args:
             restaurants: Lista restauracji
             pricing_engine: Silnik cenowy
+            order_trace: Zapis historycznych zamówień (None = losowe zamówienia)
+            route_table: Tablica tras sieci ulic (None = cena z dystansu w linii prostej)
         """
         super().__init__()
         
         self.restaurants = restaurants
         self.pricing_engine = pricing_engine
+        self.order_trace = order_trace
+        self.route_table = route_table
+        
+        # Tablice tras do klientów - z indeksem CH trasy do nich liczy hierarchia
+        self._customer_routes = route_table is not None and ContractionHierarchy.default() is None
         
         # Lista wszystkich zamówień
         self.all_orders: List[Order] = []
         
+        # Indeks zamówień oczekujących: liczba powrotów do kolejki -> {order_id: zamówienie}
+        # (słowniki zachowują kolejność wejścia, więc dodanie i przeniesienie to O(1))
+        self._pending_by_requeues: Dict[int, Dict[int, Order]] = {0: {}}
+        self._pending_bucket: Dict[int, int] = {}
+        
+        # Rośnie przy każdym nowym lub powracającym zamówieniu (dispatch pomija niezmienione rundy)
+        self.pending_version = 0
+        
         # Pula klientów (mogą zamawiać wielokrotnie)
         self.customer_pool: List[Customer] = []
     
@@ -62,10 +83,39 @@ class OrderManager(Subject):
             weather_condition: Aktualny warunek pogodowy
             num_available_couriers: Liczba dostępnych kurierów
         """
+        # Odtwarzanie zapisu - zamówienia z pliku zamiast losowych
+        if self.order_trace is not None:
+            self._create_trace_orders(step, weather_condition, num_available_couriers)
+            return
+        
         # Losowo generuj nowe zamówienie
         if random.random() < config.ORDER_SPAWN_RATE:
             self._create_order(weather_condition, num_available_couriers)
     
+    def _create_trace_orders(self, step: int, weather_condition, num_available_couriers: int):
+        """
+        Tworzy zamówienia z zapisu dla danego kroku
+        
+        Args:
+            step: Numer kroku symulacji
+            weather_condition: Warunek pogodowy
+            num_available_couriers: Liczba dostępnych kurierów
+        """
+        arrivals = self.order_trace.arrivals(step)
+        if not arrivals:
+            return
+        
+        # Liczba oczekujących liczona raz na krok, potem zwiększana lokalnie
+        num_active_orders = len(self.get_pending_orders())
+        
+        for restaurant_id, customer_x, customer_y in arrivals:
+            restaurant = self.restaurants[restaurant_id]
+            customer = Customer(Location(customer_x, customer_y))
+            
+            self._place_order(restaurant, customer, weather_condition,
+                              num_available_couriers, num_active_orders)
+            num_active_orders += 1
+    
     def _create_order(self, weather_condition, num_available_couriers: int):
         """
         Tworzy nowe zamówienie
@@ -88,11 +138,39 @@ class OrderManager(Subject):
             customer_location = OF._random_customer_location()
             customer = Customer(customer_location)
             self.customer_pool.append(customer)
+            if self._customer_routes:
+                # Klient z puli wróci - trasy do niego liczone raz (limit LRU)
+                self.route_table.add_destination(customer.location)
+        
+        self._place_order(restaurant, customer, weather_condition,
+                          num_available_couriers, num_active_orders)
+    
+    def _place_order(
+        self,
+        restaurant: Restaurant,
+        customer: Customer,
+        weather_condition,
+        num_available_couriers: int,
+        num_active_orders: int
+    ):
+        """
+        Wycenia, tworzy i rejestruje zamówienie
         
+        Args:
+            restaurant: Restauracja źródłowa
+            customer: Klient docelowy
+            weather_condition: Warunek pogodowy
+            num_available_couriers: Liczba dostępnych kurierów
+            num_active_orders: Liczba oczekujących zamówień
+        """
         # Oblicz dystans ŚREDNI (różni kurierzy = różne dystanse!)
-        # Dla ceny używamy DirectRoute jako baseline
-        from strategies.direct_route import DirectRoute
-        baseline_strategy = DirectRoute()
+        # Dla ceny używamy DirectRoute jako baseline, a przy sieci ulic - trasy z tablicy
+        if self.route_table is not None:
+            from strategies.street_route import StreetRoute
+            baseline_strategy = StreetRoute(self.route_table.graph, self.route_table)
+        else:
+            from strategies.direct_route import DirectRoute
+            baseline_strategy = DirectRoute()
         distance = baseline_strategy.calculate_distance(
             restaurant.location,
             customer.location
@@ -117,11 +195,14 @@ class OrderManager(Subject):
         )
         
         self.all_orders.append(order)
+        self._add_pending(order, 0)
+        self.pending_version += 1
         
         # Powiadom obserwatorów
         self.notify({
             'type': 'order_created',
             'order_id': order.id,
+            'restaurant_id': restaurant.id,
             'restaurant_name': restaurant.name,
             'price': price,
             'distance': distance,
@@ -129,14 +210,51 @@ class OrderManager(Subject):
             'surge_multiplier': surge_multiplier
         })
     
+    def requeue_orders(self, orders: List[Order]):
+        """
+        Przywraca zamówienia do indeksu oczekujących (po wypadku kuriera)
+        
+        Priorytet to liczba powrotów do kolejki (requeue_count), a nie czas
+        oczekiwania: zamówienie trafia za zamówienia z tą samą liczbą powrotów
+        i przed wszystkie, które wracały rzadziej - także te czekające dłużej.
+        Przeniesienie między kubełkami indeksu to O(1).
+        
+        Args:
+            orders: Zamówienia ze statusem PENDING (po Order.requeue)
+        """
+        for order in orders:
+            # Zamówienie przypisane w tym samym kroku może jeszcze być w indeksie
+            previous = self._pending_bucket.pop(order.id, None)
+            if previous is not None:
+                del self._pending_by_requeues[previous][order.id]
+            
+            self._add_pending(order, order.requeue_count)
+            self.pending_version += 1
+    
+    def _add_pending(self, order: Order, requeue_count: int):
+        """Dodaje zamówienie na koniec kubełka o danej liczbie powrotów"""
+        self._pending_by_requeues.setdefault(requeue_count, {})[order.id] = order
+        self._pending_bucket[order.id] = requeue_count
+    
     def get_pending_orders(self) -> List[Order]:
         """
-        Zwraca zamówienia oczekujące na kuriera
+        Zwraca zamówienia oczekujące na kuriera (najpierw najwięcej powrotów, dalej wg wejścia do kolejki)
         
         Returns:
             list: Lista zamówień pending
         """
-        return [order for order in self.all_orders if order.status == OrderStatus.PENDING]
+        pending = []
+        for requeue_count in sorted(self._pending_by_requeues, reverse=True):
+            bucket = self._pending_by_requeues[requeue_count]
+            
+            # Usuń z indeksu zamówienia które zmieniły status (przypisane/anulowane)
+            stale = [order_id for order_id, order in bucket.items() if order.status != OrderStatus.PENDING]
+            for order_id in stale:
+                del bucket[order_id]
+                del self._pending_bucket[order_id]
+            
+            pending.extend(bucket.values())
+        return pending
     
     def get_active_orders(self) -> List[Order]:
         """
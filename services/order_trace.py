@@ -0,0 +1,287 @@
+"""
+Strumieniowe odtwarzanie historycznych zamówień (trace-driven demand)
+
+Zamiast losowych zamówień OrderManager może odtwarzać prawdziwy ruch
+z pliku CSV lub .npy. Każdy wiersz to jedno zamówienie:
+
+    step, restaurant_id, customer_x, customer_y
+
+- step: krok w którym zamówienie się pojawia (plik posortowany rosnąco)
+- restaurant_id: indeks restauracji (0 .. liczba restauracji - 1)
+- customer_x, customer_y: lokalizacja klienta
+
+Plik jest mapowany w pamięci (mmap) i czytany kursorem - w pamięci są
+tylko wiersze bieżącego kroku, nigdy cały tydzień zamówień naraz.
+"""
+
+import mmap
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# (restaurant_id, customer_x, customer_y)
+TraceArrival = Tuple[int, float, float]
+
+
+class OrderTrace(ABC):
+    """
+    Abstrakcyjny czytnik zapisu zamówień
+    
+    Krok symulacji 1 odpowiada pierwszemu krokowi w pliku, więc zapis
+    może używać dowolnej osi czasu (np. numerów minut od początku tygodnia).
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko odczyt zapisu zamówień
+    - Open/Closed: nowe formaty bez modyfikacji OrderManager
+    """
+    
+    def __init__(self, path: str):
+        """
+        Inicjalizuje czytnik
+        
+        Args:
+            path: Ścieżka do pliku z zapisem zamówień
+        """
+        self.path = path
+        self.first_step: Optional[int] = None
+        self._last_step: Optional[int] = None
+    
+    def arrivals(self, step: int) -> List[TraceArrival]:
+        """
+        Zwraca zamówienia które pojawiają się do danego kroku symulacji
+        
+        Wiersze z wcześniejszych, jeszcze nieodczytanych kroków też są
+        zwracane (np. gdy symulacja nie pytała o każdy krok).
+        
+        Args:
+            step: Numer kroku symulacji (od 1)
+        
+        Returns:
+            list: Krotki (restaurant_id, customer_x, customer_y)
+        """
+        if self.first_step is None:
+            return []
+        return self._read_until(self.first_step + step - 1)
+    
+    @abstractmethod
+    def _read_until(self, trace_step: int) -> List[TraceArrival]:
+        """
+        Odczytuje kolejne wiersze z krokiem <= trace_step
+        
+        Args:
+            trace_step: Krok na osi czasu pliku
+        
+        Returns:
+            list: Odczytane zamówienia
+        """
+        pass
+    
+    @abstractmethod
+    def restaurant_count(self) -> int:
+        """
+        Liczba restauracji wymagana przez zapis (max restaurant_id + 1)
+        
+        Returns:
+            int: Liczba restauracji
+        """
+        pass
+    
+    @abstractmethod
+    def is_exhausted(self) -> bool:
+        """
+        Czy wszystkie wiersze zostały już odczytane
+        
+        Returns:
+            bool: True jeśli koniec pliku
+        """
+        pass
+    
+    def close(self):
+        """Zwalnia zasoby pliku"""
+        pass
+    
+    def _check_order(self, trace_step: int):
+        """Pilnuje aby plik był posortowany po kroku"""
+        if self._last_step is not None and trace_step < self._last_step:
+            raise ValueError(
+                f"Plik {self.path} nie jest posortowany po kroku "
+                f"({trace_step} po {self._last_step})"
+            )
+        self._last_step = trace_step
+    
+    def _check_restaurant_id(self, restaurant_id: int):
+        """Pilnuje aby indeks restauracji nie był ujemny (lista restauracji zawija -1)"""
+        if restaurant_id < 0:
+            raise ValueError(f"Plik {self.path} zawiera ujemny restaurant_id: {restaurant_id}")
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
+class CsvOrderTrace(OrderTrace):
+    """
+    Zapis zamówień w CSV (opcjonalny nagłówek w pierwszej linii)
+    
+    Plik jest mapowany w pamięci; kursor przesuwa się linia po linii,
+    a jeden wiersz jest czytany z wyprzedzeniem żeby wiedzieć gdzie
+    kończy się bieżący krok.
+    """
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Pusty plik nie może być zmapowany
+            self._mm = None
+        
+        self._lookahead: Optional[Tuple[int, int, float, float]] = None
+        
+        if self._mm is not None:
+            # Pomiń nagłówek (pierwsza linia która nie jest liczbą)
+            first_line = self._mm.readline()
+            if self._parse_line(first_line) is None:
+                self._data_start = self._mm.tell()
+            else:
+                self._data_start = 0
+                self._mm.seek(0)
+            
+            self._lookahead = self._next_row()
+            if self._lookahead is not None:
+                self.first_step = self._lookahead[0]
+    
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[Tuple[int, int, float, float]]:
+        """Parsuje linię CSV (None dla pustej linii lub nagłówka)"""
+        fields = line.split(b',')
+        if len(fields) < 4:
+            return None
+        try:
+            return (int(float(fields[0])), int(float(fields[1])),
+                    float(fields[2]), float(fields[3]))
+        except ValueError:
+            return None
+    
+    def _next_row(self) -> Optional[Tuple[int, int, float, float]]:
+        """Czyta następny poprawny wiersz z mapowanego pliku"""
+        while True:
+            line = self._mm.readline()
+            if not line:
+                return None
+            row = self._parse_line(line)
+            if row is not None:
+                return row
+    
+    def _read_until(self, trace_step: int) -> List[TraceArrival]:
+        rows = []
+        while self._lookahead is not None and self._lookahead[0] <= trace_step:
+            step, restaurant_id, x, y = self._lookahead
+            self._check_order(step)
+            self._check_restaurant_id(restaurant_id)
+            rows.append((restaurant_id, x, y))
+            self._lookahead = self._next_row()
+        return rows
+    
+    def restaurant_count(self) -> int:
+        if self._mm is None:
+            return 0
+        
+        # Jeden przebieg po mapowanym pliku (bez zmiany pozycji kursora)
+        max_id = -1
+        position = self._data_start
+        end = len(self._mm)
+        while position < end:
+            newline = self._mm.find(b'\n', position)
+            if newline == -1:
+                newline = end
+            row = self._parse_line(self._mm[position:newline])
+            if row is not None:
+                self._check_restaurant_id(row[1])
+                max_id = max(max_id, row[1])
+            position = newline + 1
+        return max_id + 1
+    
+    def is_exhausted(self) -> bool:
+        return self._lookahead is None
+    
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+class NpyOrderTrace(OrderTrace):
+    """
+    Zapis zamówień w .npy - tablica (N, 4) kolumn step, restaurant_id, x, y
+    
+    Tablica jest otwierana z mmap_mode='r', a koniec bieżącego kroku
+    wyznacza searchsorted na kolumnie kroków (O(log N) na krok). Posortowanie
+    i indeksy restauracji są sprawdzane raz przy otwarciu (jeden przebieg) -
+    searchsorted na nieposortowanej kolumnie dawałby nieokreślone wycinki.
+    """
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        
+        self._data = np.load(path, mmap_mode='r')
+        if self._data.ndim != 2 or self._data.shape[1] < 4:
+            raise ValueError(
+                f"Plik {path} musi zawierać tablicę (N, 4): step, restaurant_id, x, y"
+            )
+        
+        self._steps = self._data[:, 0]
+        self._cursor = 0
+        
+        if len(self._data) > 0:
+            unsorted = np.flatnonzero(np.diff(self._steps) < 0)
+            if len(unsorted):
+                row = int(unsorted[0]) + 1
+                raise ValueError(
+                    f"Plik {path} nie jest posortowany po kroku "
+                    f"({int(self._steps[row])} po {int(self._steps[row - 1])}, wiersz {row})"
+                )
+            self._check_restaurant_id(int(self._data[:, 1].min()))
+            self.first_step = int(self._steps[0])
+    
+    def _read_until(self, trace_step: int) -> List[TraceArrival]:
+        start = self._cursor
+        end = start + int(np.searchsorted(self._steps[start:], trace_step, side='right'))
+        if end == start:
+            return []
+        
+        self._cursor = end
+        
+        rows = self._data[start:end, 1:4]
+        return [(int(restaurant_id), float(x), float(y)) for restaurant_id, x, y in rows.tolist()]
+    
+    def restaurant_count(self) -> int:
+        if len(self._data) == 0:
+            return 0
+        return int(self._data[:, 1].max()) + 1
+    
+    def is_exhausted(self) -> bool:
+        return self._cursor >= len(self._data)
+    
+    def close(self):
+        self._data = None
+        self._steps = None
+
+
+def open_order_trace(path: str) -> OrderTrace:
+    """
+    Otwiera zapis zamówień odpowiednim czytnikiem (po rozszerzeniu pliku)
+    
+    Args:
+        path: Ścieżka do pliku .csv lub .npy
+    
+    Returns:
+        OrderTrace: Czytnik zapisu
+    """
+    if path.lower().endswith('.npy'):
+        return NpyOrderTrace(path)
+    return CsvOrderTrace(path)
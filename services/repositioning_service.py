@@ -0,0 +1,204 @@
+"""
+Serwis repozycjonowania wolnych kurierów (popyt restauracji)
+
+Wolni kurierzy nie stoją tam, gdzie skończyli dostawę, tylko przesuwają
+się w stronę restauracji, które ostatnio dostają najwięcej zamówień -
+kolejne zamówienia mają wtedy krótszy dojazd do odbioru.
+"""
+
+from typing import Dict, List, TYPE_CHECKING
+
+import numpy as np
+
+from observers.observer import Observer
+import config
+
+if TYPE_CHECKING:
+    from models.restaurant import Restaurant
+    from services.courier_manager import CourierManager
+
+
+class RepositioningService(Observer):
+    """
+    Repozycjonowanie wolnych kurierów według popytu restauracji
+    
+    Popyt restauracji to liczba zamówień z wygaszaniem wykładniczym
+    (połowa wagi po REPOSITION_DEMAND_HALF_LIFE krokach). Każde zdarzenie
+    order_created aktualizuje jedną restaurację w O(1) - wygaszanie jest
+    leniwe, liczone od kroku ostatniej aktualizacji.
+    
+    Co REPOSITION_INTERVAL kroków wolni kurierzy są dzieleni między
+    restauracje proporcjonalnie do popytu; każda restauracja dostaje
+    najbliższych jeszcze nieprzydzielonych kurierów. Ruch do celu
+    wykonuje IdleState przez strategię routingu kuriera.
+    
+    Wzorce projektowe:
+    - Observer Pattern: nasłuchuje zdarzeń order_created z OrderManager
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko rozmieszczanie wolnych kurierów
+    """
+    
+    def __init__(self, restaurants: List['Restaurant'], courier_manager: 'CourierManager'):
+        """
+        Inicjalizuje serwis
+        
+        Args:
+            restaurants: Lista restauracji
+            courier_manager: Manager kurierów (źródło wolnych kurierów)
+        """
+        self.restaurants = restaurants
+        self.courier_manager = courier_manager
+        
+        self.interval = config.REPOSITION_INTERVAL
+        self._decay_per_step = 0.5 ** (1.0 / config.REPOSITION_DEMAND_HALF_LIFE)
+        
+        # restaurant_id -> indeks restauracji
+        self._restaurant_index: Dict[int, int] = {
+            restaurant.id: index for index, restaurant in enumerate(restaurants)
+        }
+        self._restaurant_xy = np.array(
+            [(restaurant.location.x, restaurant.location.y) for restaurant in restaurants],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        
+        # Popyt w chwili ostatniej aktualizacji i krok tej aktualizacji
+        self._demand = np.zeros(len(restaurants))
+        self._demand_step = np.zeros(len(restaurants), dtype=np.int64)
+        
+        self.current_step = 0
+        
+        # Statystyki
+        self.rounds = 0
+        self.total_moves = 0
+    
+    def update(self, event: Dict):
+        """
+        Aktualizuje popyt restauracji po nowym zamówieniu
+        
+        Args:
+            event: Informacje o zdarzeniu
+        """
+        if event.get('type') != 'order_created':
+            return
+        
+        index = self._restaurant_index.get(event.get('restaurant_id'))
+        if index is None:
+            return
+        
+        elapsed = self.current_step - self._demand_step[index]
+        self._demand[index] = self._demand[index] * self._decay_per_step ** elapsed + 1.0
+        self._demand_step[index] = self.current_step
+    
+    def demand(self) -> np.ndarray:
+        """
+        Aktualny (wygaszony) popyt wszystkich restauracji
+        
+        Returns:
+            np.ndarray: Popyt per restauracja
+        """
+        elapsed = self.current_step - self._demand_step
+        return self._demand * np.power(self._decay_per_step, elapsed)
+    
+    def reposition(self, step: int, weather_condition):
+        """
+        Aktualizuje zegar i co REPOSITION_INTERVAL kroków wyznacza cele wolnym kurierom
+        
+        Args:
+            step: Numer kroku symulacji
+            weather_condition: Aktualna pogoda (uziemione typy zostają na miejscu)
+        """
+        self.current_step = step
+        if step % self.interval != 0:
+            return
+        
+        grounded_types = weather_condition.get_grounded_courier_types()
+        
+        # Uziemieni kurierzy zostają na miejscu
+        for courier_type in grounded_types:
+            for courier in self.courier_manager.get_available_couriers_of_type(courier_type):
+                courier.target_location = None
+        
+        self._assign_targets(self.courier_manager.get_available_couriers(grounded_types))
+    
+    def _assign_targets(self, movable: List):
+        """
+        Dzieli wolnych kurierów między restauracje proporcjonalnie do popytu
+        
+        Args:
+            movable: Wolni kurierzy, którzy mogą się przemieszczać
+        """
+        demand = self.demand()
+        total_demand = demand.sum()
+        if not movable or total_demand <= 0:
+            return
+        
+        quotas = self._quotas(demand / total_demand, len(movable))
+        
+        courier_xy = np.array(
+            [(courier.location.x, courier.location.y) for courier in movable],
+            dtype=np.float64
+        )
+        dx = self._restaurant_xy[:, 0:1] - courier_xy[:, 0]
+        dy = self._restaurant_xy[:, 1:2] - courier_xy[:, 1]
+        distance_sq = dx * dx + dy * dy
+        taken = np.zeros(len(movable), dtype=bool)
+        
+        self.rounds += 1
+        
+        # Restauracje o największym popycie wybierają pierwsze
+        for index in np.argsort(-demand, kind='stable'):
+            quota = quotas[index]
+            if quota == 0:
+                continue
+            
+            row = np.where(taken, np.inf, distance_sq[index])
+            chosen = np.argpartition(row, quota - 1)[:quota] if quota < len(row) else np.arange(len(row))
+            taken[chosen] = True
+            
+            restaurant_location = self.restaurants[index].location
+            for courier_index in chosen:
+                courier = movable[courier_index]
+                if courier.location.distance_to(restaurant_location) >= config.REPOSITION_ARRIVAL_RADIUS:
+                    courier.target_location = restaurant_location
+                    self.total_moves += 1
+                else:
+                    courier.target_location = None
+    
+    @staticmethod
+    def _quotas(shares: np.ndarray, num_couriers: int) -> np.ndarray:
+        """
+        Liczba kurierów na restaurację (metoda największych reszt)
+        
+        Args:
+            shares: Udziały popytu (suma = 1)
+            num_couriers: Liczba kurierów do podziału
+        
+        Returns:
+            np.ndarray: Liczby całkowite sumujące się do num_couriers
+        """
+        exact = shares * num_couriers
+        quotas = np.floor(exact).astype(np.int64)
+        remaining = num_couriers - int(quotas.sum())
+        if remaining > 0:
+            quotas[np.argsort(-(exact - quotas), kind='stable')[:remaining]] += 1
+        return quotas
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki repozycjonowania
+        
+        Returns:
+            dict: Statystyki
+        """
+        demand = self.demand()
+        busiest = int(np.argmax(demand)) if len(demand) and demand.max() > 0 else None
+        return {
+            'rounds': self.rounds,
+            'total_moves': self.total_moves,
+            'busiest_restaurant': self.restaurants[busiest].name if busiest is not None else None,
+            'half_life': config.REPOSITION_DEMAND_HALF_LIFE
+        }
+    
+    def __repr__(self) -> str:
+        return f"RepositioningService(restaurants={len(self.restaurants)}, interval={self.interval})"
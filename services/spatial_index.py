@@ -0,0 +1,278 @@
+"""
+Indeks przestrzenny kurierów (jednorodna siatka kubełków)
+
+Pozwala znaleźć najbliższych kurierów do punktu bez przeglądania
+całej floty - przeszukiwane są tylko kubełki wokół punktu, pierścień
+po pierścieniu, aż wynik jest pewny.
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from models.courier import Courier
+    from models.location import Location
+
+
+Cell = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Jednorodna siatka kubełków z kurierami
+    
+    Każdy kurier jest w dokładnie jednym kubełku (wg aktualnej pozycji).
+    Wstawienie, usunięcie i przesunięcie to O(1); zapytanie o k najbliższych
+    przegląda pierścienie kubełków wokół punktu i kończy się gdy k-ty wynik
+    jest bliżej niż najbliższy nieprzejrzany pierścień.
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko indeksowanie pozycji kurierów
+    """
+    
+    def __init__(self, cell_size: float):
+        """
+        Inicjalizuje pusty indeks
+        
+        Args:
+            cell_size: Rozmiar kubełka (jednostki mapy)
+        """
+        self.cell_size = cell_size
+        
+        # Kubełek -> {courier_id: kurier}
+        self._cells: Dict[Cell, Dict[int, 'Courier']] = {}
+        
+        # courier_id -> kubełek w którym jest kurier
+        self._courier_cells: Dict[int, Cell] = {}
+        
+        # Zakres zajętych kubełków (ogranicza przeszukiwanie pierścieni)
+        self._min_cx = self._max_cx = 0
+        self._min_cy = self._max_cy = 0
+    
+    @staticmethod
+    def cell_size_for(num_couriers: int) -> float:
+        """
+        Dobiera rozmiar kubełka do wielkości floty
+        
+        Celem jest około SPATIAL_INDEX_COURIERS_PER_CELL kurierów na kubełek,
+        dzięki czemu zapytanie kosztuje tyle samo przy 10 i przy 50 000 kurierów.
+        
+        Args:
+            num_couriers: Liczba kurierów
+        
+        Returns:
+            float: Rozmiar kubełka
+        """
+        area = config.MAP_WIDTH * config.MAP_HEIGHT
+        size = math.sqrt(area * config.SPATIAL_INDEX_COURIERS_PER_CELL / max(1, num_couriers))
+        return max(config.SPATIAL_INDEX_MIN_CELL_SIZE, min(size, max(config.MAP_WIDTH, config.MAP_HEIGHT)))
+    
+    def _cell_of(self, x: float, y: float) -> Cell:
+        """Kubełek zawierający punkt"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+    
+    def insert(self, courier: 'Courier'):
+        """
+        Dodaje kuriera do indeksu (lub aktualizuje jego pozycję)
+        
+        Args:
+            courier: Kurier do dodania
+        """
+        if courier.id in self._courier_cells:
+            self.update(courier)
+            return
+        
+        cell = self._cell_of(courier.location.x, courier.location.y)
+        
+        if not self._courier_cells:
+            self._min_cx = self._max_cx = cell[0]
+            self._min_cy = self._max_cy = cell[1]
+        else:
+            self._extend_bounds(cell)
+        
+        self._cells.setdefault(cell, {})[courier.id] = courier
+        self._courier_cells[courier.id] = cell
+    
+    def remove(self, courier: 'Courier'):
+        """
+        Usuwa kuriera z indeksu (nic nie robi jeśli go nie ma)
+        
+        Args:
+            courier: Kurier do usunięcia
+        """
+        cell = self._courier_cells.pop(courier.id, None)
+        if cell is None:
+            return
+        
+        bucket = self._cells[cell]
+        del bucket[courier.id]
+        if not bucket:
+            del self._cells[cell]
+    
+    def update(self, courier: 'Courier'):
+        """
+        Przenosi kuriera do właściwego kubełka po zmianie pozycji
+        
+        Args:
+            courier: Kurier który mógł się przesunąć
+        """
+        old_cell = self._courier_cells.get(courier.id)
+        if old_cell is None:
+            return
+        
+        cell = self._cell_of(courier.location.x, courier.location.y)
+        if cell == old_cell:
+            return
+        
+        bucket = self._cells[old_cell]
+        del bucket[courier.id]
+        if not bucket:
+            del self._cells[old_cell]
+        
+        self._extend_bounds(cell)
+        self._cells.setdefault(cell, {})[courier.id] = courier
+        self._courier_cells[courier.id] = cell
+    
+    def _extend_bounds(self, cell: Cell):
+        """Rozszerza zakres zajętych kubełków o nowy kubełek"""
+        self._min_cx = min(self._min_cx, cell[0])
+        self._max_cx = max(self._max_cx, cell[0])
+        self._min_cy = min(self._min_cy, cell[1])
+        self._max_cy = max(self._max_cy, cell[1])
+    
+    def nearest(
+        self,
+        location: 'Location',
+        k: int = 1,
+        accept: Optional[Callable[['Courier'], bool]] = None,
+        cost: Optional[Callable[[List['Courier']], Sequence[float]]] = None,
+        cost_per_unit: float = 1.0
+    ) -> List['Courier']:
+        """
+        Zwraca k najbliższych kurierów (odległość euklidesowa lub własny koszt)
+        
+        Args:
+            location: Punkt zapytania
+            k: Liczba kurierów do zwrócenia
+            accept: Opcjonalny filtr kurierów (np. uziemione drony)
+            cost: Opcjonalna funkcja kosztu kurierów pierścienia (None = dystans euklidesowy)
+            cost_per_unit: Dolne ograniczenie kosztu na jednostkę odległości
+        
+        Returns:
+            list: Kurierzy posortowani od najtańszego
+        """
+        return [courier for _, courier in self.nearest_with_costs(location, k, accept, cost, cost_per_unit)]
+    
+    def nearest_with_costs(
+        self,
+        location: 'Location',
+        k: int = 1,
+        accept: Optional[Callable[['Courier'], bool]] = None,
+        cost: Optional[Callable[[List['Courier']], Sequence[float]]] = None,
+        cost_per_unit: float = 1.0
+    ) -> List[Tuple[float, 'Courier']]:
+        """
+        Zwraca k najbliższych kurierów razem z ich kosztem
+        
+        Remisy rozstrzyga mniejsze ID kuriera - tak samo jak min() po liście
+        kurierów w kolejności tworzenia.
+        
+        Własny koszt (np. czas dojazdu) liczony jest jednym wywołaniem dla
+        wszystkich kurierów pierścienia (np. calculate_distance_matrix) i musi
+        być nie mniejszy niż cost_per_unit * odległość Czebyszewa od punktu -
+        spełniają to odległość euklidesowa i Manhattan podzielone przez
+        prędkość nie większą niż 1 / cost_per_unit.
+        
+        Args:
+            location: Punkt zapytania
+            k: Liczba kurierów do zwrócenia
+            accept: Opcjonalny filtr kurierów (np. uziemione drony)
+            cost: Opcjonalna funkcja kosztu kurierów pierścienia (None = dystans euklidesowy)
+            cost_per_unit: Dolne ograniczenie kosztu na jednostkę odległości
+        
+        Returns:
+            list: Pary (koszt, kurier) posortowane od najtańszego
+        """
+        if not self._courier_cells or k <= 0:
+            return []
+        
+        x, y = location.x, location.y
+        cx, cy = self._cell_of(x, y)
+        
+        # Max-heap k najlepszych: (-koszt, -id, kurier); bez funkcji kosztu koszt to dystans^2
+        best: List[Tuple[float, int, 'Courier']] = []
+        
+        # Ostatni pierścień który może jeszcze zawierać zajęte kubełki
+        max_ring = max(
+            cx - self._min_cx, self._max_cx - cx,
+            cy - self._min_cy, self._max_cy - cy
+        )
+        
+        ring = 0
+        while ring <= max_ring:
+            candidates = []
+            for cell in self._ring_cells(cx, cy, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for courier in bucket.values():
+                    if accept is None or accept(courier):
+                        candidates.append(courier)
+            
+            if cost is None:
+                costs = []
+                for courier in candidates:
+                    dx = courier.location.x - x
+                    dy = courier.location.y - y
+                    costs.append(dx * dx + dy * dy)
+            else:
+                costs = cost(candidates) if candidates else []
+            
+            for courier, courier_cost in zip(candidates, costs):
+                key = (-courier_cost, -courier.id)
+                if len(best) < k:
+                    heapq.heappush(best, (key[0], key[1], courier))
+                elif key > (best[0][0], best[0][1]):
+                    heapq.heapreplace(best, (key[0], key[1], courier))
+            
+            # Kubełki z kolejnego pierścienia są co najmniej ring * cell_size od punktu
+            if len(best) == k:
+                reach = ring * self.cell_size
+                bound = reach * reach if cost is None else reach * cost_per_unit
+                if -best[0][0] < bound:
+                    break
+            ring += 1
+        
+        best.sort(key=lambda entry: (-entry[0], -entry[1]))
+        if cost is None:
+            return [(math.sqrt(-negative_cost), courier) for negative_cost, _, courier in best]
+        return [(-negative_cost, courier) for negative_cost, _, courier in best]
+    
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        """Kubełki w odległości Czebyszewa równej ring od (cx, cy)"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+    
+    def __contains__(self, courier: 'Courier') -> bool:
+        return courier.id in self._courier_cells
+    
+    def __len__(self) -> int:
+        return len(self._courier_cells)
+    
+    def __iter__(self):
+        for bucket in self._cells.values():
+            yield from bucket.values()
+    
+    def __repr__(self) -> str:
+        return f"SpatialIndex(couriers={len(self)}, cells={len(self._cells)}, cell_size={self.cell_size:.1f})"
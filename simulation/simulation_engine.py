@@ -4,15 +4,23 @@ Główny silnik symulacji Uber Eats
 Orkiestruje wszystkie komponenty systemu
 """
 
-from typing import List, Optional
+from itertools import chain, islice
+from typing import Dict, List, Optional
 from models.restaurant import Restaurant
 from models.courier import Courier
 from factories.courier_factory import CourierFactory
 from factories.restaurant_factory import RestaurantFactory
+from factories.dispatch_factory import DispatchStrategyFactory
 from services.order_manager import OrderManager
 from services.courier_manager import CourierManager
 from services.dispatch_service import DispatchService
+from services.dispatch_audit_log import DispatchAuditLog
+from services.dispatch_snapshot import DispatchSnapshotRecorder
+from services.repositioning_service import RepositioningService
 from services.pricing_engine import PricingEngine
+from services.order_trace import OrderTrace, open_order_trace
+from routing.route_table import RouteTable
+from routing.route_cache import RouteCache
 from weather.weather_system import WeatherSystem
 from observers.statistics_logger import StatisticsLogger
 from observers.order_tracker import OrderTracker
@@ -51,7 +59,11 @@ class SimulationEngine:
         self,
         num_couriers: int = None,
         num_restaurants: int = None,
-        time_scale: float = None
+        time_scale: float = None,
+        order_trace_path: str = None,
+        dispatch_policy: str = None,
+        dispatch_audit_path: str = None,
+        dispatch_snapshot_dir: str = None
     ):
         """
         Inicjalizuje silnik symulacji
@@ -60,6 +72,10 @@ class SimulationEngine:
             num_couriers: Liczba kurierów (None = z config)
             num_restaurants: Liczba restauracji (None = z config)
             time_scale: Przyspieszenie symulacji (None = z config)
+            order_trace_path: Plik CSV/.npy z zapisem zamówień (None = losowe zamówienia)
+            dispatch_policy: Polityka przydziału zamówień (None = z config)
+            dispatch_audit_path: Plik binarnego dziennika przydziałów (None = z config)
+            dispatch_snapshot_dir: Katalog snapshotów rund dispatchu (None = z config)
         """
         # Unikaj ponownej inicjalizacji (Singleton)
         if hasattr(self, '_initialized'):
@@ -71,16 +87,35 @@ class SimulationEngine:
         self.num_couriers = num_couriers or config.NUM_COURIERS
         self.num_restaurants = num_restaurants or config.NUM_RESTAURANTS
         self.time_scale = time_scale or config.TIME_SCALE
+        self.order_trace_path = order_trace_path
+        self.dispatch_policy = dispatch_policy or config.DISPATCH_POLICY
+        self.dispatch_audit_path = dispatch_audit_path or config.DISPATCH_AUDIT_LOG
+        self.dispatch_snapshot_dir = dispatch_snapshot_dir or config.DISPATCH_SNAPSHOT_DIR
         
         # Komponenty
         self.restaurants: List[Restaurant] = []
-        self.couriers: List[Courier] = []
+        
+        # Zaplanowane zmiany floty: krok -> zmiana liczby kurierów
+        self.fleet_changes: Dict[int, int] = {}
+        for step, change in config.FLEET_CHANGES:
+            self.fleet_changes[step] = self.fleet_changes.get(step, 0) + change
+        
+        # Zapis zamówień (trace-driven demand)
+        self.order_trace: Optional[OrderTrace] = None
+        
+        # Dziennik przydziałów (analiza offline jakości dispatchu)
+        self.dispatch_audit_log: Optional[DispatchAuditLog] = None
+        self.dispatch_snapshot_recorder: Optional[DispatchSnapshotRecorder] = None
+        
+        # Tablica tras do restauracji i klientów (tylko routing rowerzystów po sieci ulic)
+        self.route_table: Optional[RouteTable] = None
         
         # Serwisy
         self.pricing_engine: Optional[PricingEngine] = None
         self.order_manager: Optional[OrderManager] = None
         self.courier_manager: Optional[CourierManager] = None
         self.dispatch_service: Optional[DispatchService] = None
+        self.repositioning_service: Optional[RepositioningService] = None
         
         # Systemy
         self.weather_system: Optional[WeatherSystem] = None
@@ -101,17 +136,46 @@ class SimulationEngine:
     
     def _initialize_components(self):
         """Inicjalizuje wszystkie komponenty symulacji"""
+        if self.order_trace_path:
+            print(f"  • Otwieranie zapisu zamówień {self.order_trace_path}...")
+            self.order_trace = open_order_trace(self.order_trace_path)
+            # Zapis może odwoływać się do większej liczby restauracji
+            self.num_restaurants = max(self.num_restaurants, self.order_trace.restaurant_count())
+        
         print(f"  • Tworzenie {self.num_restaurants} restauracji...")
         self.restaurants = RestaurantFactory.create_batch(self.num_restaurants)
         
+        if config.BIKER_ROUTING == "street":
+            print("  • Tablica tras sieci ulic...")
+            self.route_table = RouteTable.default()
+            self.route_table.clear()
+            for restaurant in self.restaurants:
+                self.route_table.add_restaurant(restaurant.location)
+        
         print(f"  • Tworzenie {self.num_couriers} kurierów...")
-        self.couriers = CourierFactory.create_batch(self.num_couriers)
+        couriers = CourierFactory.create_batch(self.num_couriers)
         
         print("  • Inicjalizacja serwisów...")
         self.pricing_engine = PricingEngine()
-        self.order_manager = OrderManager(self.restaurants, self.pricing_engine)
-        self.courier_manager = CourierManager(self.couriers)
-        self.dispatch_service = DispatchService(self.order_manager, self.courier_manager)
+        self.order_manager = OrderManager(self.restaurants, self.pricing_engine, self.order_trace, self.route_table)
+        self.courier_manager = CourierManager(couriers)
+        if self.dispatch_audit_path:
+            print(f"  • Dziennik przydziałów: {self.dispatch_audit_path}")
+            self.dispatch_audit_log = DispatchAuditLog(self.dispatch_audit_path, config.DISPATCH_AUDIT_BLOCK_SIZE)
+        if self.dispatch_snapshot_dir:
+            print(f"  • Snapshoty rund dispatchu: {self.dispatch_snapshot_dir}")
+            self.dispatch_snapshot_recorder = DispatchSnapshotRecorder(
+                self.dispatch_snapshot_dir, config.DISPATCH_SNAPSHOT_INTERVAL
+            )
+        self.dispatch_service = DispatchService(
+            self.order_manager,
+            self.courier_manager,
+            DispatchStrategyFactory.create(self.dispatch_policy),
+            audit_log=self.dispatch_audit_log,
+            snapshot_recorder=self.dispatch_snapshot_recorder
+        )
+        if config.REPOSITION_ENABLED:
+            self.repositioning_service = RepositioningService(self.restaurants, self.courier_manager)
         
         print("  • Inicjalizacja systemów...")
         self.weather_system = WeatherSystem()
@@ -126,6 +190,8 @@ class SimulationEngine:
         self.order_manager.attach(self.statistics_logger)
         self.order_manager.attach(self.order_tracker)
         self.order_manager.attach(self.revenue_tracker)
+        if self.repositioning_service:
+            self.order_manager.attach(self.repositioning_service)
         
         # Podłącz wszystkich obserwatorów do courier_manager
         # (bo wysyła powiadomienia o dostawach i wypadkach)
@@ -135,6 +201,57 @@ class SimulationEngine:
         
         self.weather_system.attach(self.statistics_logger)
     
+    @property
+    def couriers(self) -> List[Courier]:
+        """Kurierzy floty (bez tych, którzy odeszli po zmianie)"""
+        return self.courier_manager.couriers if self.courier_manager else []
+    
+    def add_couriers(self, count: int) -> List[Courier]:
+        """
+        Dołącza nowych kurierów do floty (np. szczyt popytu)
+        
+        Args:
+            count: Liczba nowych kurierów
+        
+        Returns:
+            list: Nowi kurierzy
+        """
+        couriers = CourierFactory.create_batch(count)
+        self.courier_manager.add_couriers(couriers)
+        return couriers
+    
+    def retire_couriers(self, count: int) -> List[Courier]:
+        """
+        Kończy zmianę kurierów - najpierw wolnych, potem zjeżdżających z zamówieniem
+        
+        Args:
+            count: Liczba kurierów do wycofania
+        
+        Returns:
+            list: Wycofani kurierzy (z zamówieniem odejdą po jego dostarczeniu)
+        """
+        manager = self.courier_manager
+        candidates = chain(
+            manager.get_available_couriers(),
+            (courier for courier in manager.get_active_couriers() if not manager.is_retiring(courier))
+        )
+        couriers = list(islice(candidates, count))
+        manager.retire_couriers(couriers)
+        return couriers
+    
+    def _apply_fleet_changes(self):
+        """Wykonuje zaplanowaną na ten krok zmianę floty (FLEET_CHANGES)"""
+        change = self.fleet_changes.get(self.current_step)
+        if not change:
+            return
+        
+        if change > 0:
+            self.add_couriers(change)
+        else:
+            self.retire_couriers(-change)
+        print(f"[Krok {self.current_step}] Zmiana floty: {change:+d} kurierów "
+              f"(flota: {self.courier_manager.num_couriers}, zjeżdża: {self.courier_manager.num_retiring})")
+    
     def run(self, max_steps: int = 1000, visualize: bool = True):
         """
         Uruchamia symulację
@@ -213,16 +330,27 @@ class SimulationEngine:
         self.weather_system.update(self.current_step)
         current_weather = self.weather_system.get_current_condition()
         
+        # Zaplanowane zmiany floty (zmiana kurierów, dołączanie w szczycie)
+        if self.fleet_changes:
+            self._apply_fleet_changes()
+        
         # 2. Aktualizuj manager zamówień (może wygenerować nowe)
-        num_available = len(self.courier_manager.get_available_couriers())
+        num_available = self.courier_manager.num_available
         self.order_manager.update(self.current_step, current_weather, num_available)
         
         # 3. Przydziel oczekujące zamówienia do kurierów
         # NOWE: Przekazujemy pogodę - drony nie latają w deszczu/śniegu!
-        self.dispatch_service.assign_orders(current_weather)
+        self.dispatch_service.assign_orders(current_weather, self.current_step)
+        
+        # Wolni kurierzy przesuwają się w stronę restauracji z popytem
+        if self.repositioning_service:
+            self.repositioning_service.reposition(self.current_step, current_weather)
         
         # 4. Aktualizuj wszystkich kurierów (State Pattern + pogoda)
-        self.courier_manager.update_all_couriers(current_weather)
+        requeued_orders = self.courier_manager.update_all_couriers(current_weather)
+        
+        # Zamówienia utracone w wypadkach wracają do kolejki
+        self.order_manager.requeue_orders(requeued_orders)
         
         # 5. Aktualizuj time manager
         self.time_manager.update()
@@ -241,6 +369,12 @@ class SimulationEngine:
         """Finalizuje symulację i wyświetla statystyki"""
         self.is_running = False
         
+        if self.order_trace is not None:
+            self.order_trace.close()
+        self.dispatch_service.close()
+        if self.dispatch_audit_log is not None:
+            self.dispatch_audit_log.close()
+        
         print("\n" + "=" * 70)
         print("KONIEC SYMULACJI")
         print("=" * 70)
@@ -251,6 +385,7 @@ class SimulationEngine:
         print(f"  • Łącznie: {order_stats['total_orders']}")
         print(f"  • Dostarczone: {order_stats['delivered_orders']}")
         print(f"  • Anulowane: {order_stats['cancelled_orders']}")
+        print(f"  • Powroty do kolejki: {order_stats['requeued_orders']}")
         print(f"  • Średni czas dostawy: {order_stats['average_delivery_time']:.1f}s")
         
         # Statystyki przychodów
@@ -261,14 +396,72 @@ class SimulationEngine:
         print(f"  • Maksymalny surge: {revenue_stats['max_surge']:.2f}x")
         
         # Statystyki kurierów
-        total_accidents = sum(c.accidents for c in self.couriers)
-        total_deliveries = sum(c.total_deliveries for c in self.couriers)
-        total_earnings = sum(c.total_earnings for c in self.couriers)
+        # Kurierzy, którzy odeszli w trakcie symulacji, też się liczą
+        all_couriers = self.couriers + self.courier_manager.retired_couriers
+        total_accidents = sum(c.accidents for c in all_couriers)
+        total_deliveries = sum(c.total_deliveries for c in all_couriers)
+        total_earnings = sum(c.total_earnings for c in all_couriers)
         
         print(f"\nKURIERZY:")
         print(f"  • Dostawy: {total_deliveries}")
         print(f"  • Zarobki: ${total_earnings:.2f}")
         print(f"  • Wypadki: {total_accidents}")
+        if self.courier_manager.total_added or self.courier_manager.retired_couriers:
+            print(f"  • Zmiany floty: dołączyło {self.courier_manager.total_added}, "
+                  f"odeszło {len(self.courier_manager.retired_couriers)} "
+                  f"(zjeżdża: {self.courier_manager.num_retiring})")
+        
+        # Statystyki dispatchu
+        dispatch_stats = self.dispatch_service.get_stats()
+        print(f"\nDISPATCH:")
+        print(f"  • Polityka: {dispatch_stats['policy']} (koszt: {dispatch_stats['cost']})")
+        print(f"  • Przydziały: {dispatch_stats['total_assignments']} "
+              f"(w kolejce kuriera kończącego dostawę: {dispatch_stats['queued_assignments']})")
+        print(f"  • Rundy: {dispatch_stats['dispatch_rounds']} (pominięte bez zmian: {dispatch_stats['skipped_rounds']})")
+        if dispatch_stats['zoned_rounds']:
+            print(f"  • Rundy w strefach: {dispatch_stats['zoned_rounds']} "
+                  f"({dispatch_stats['zoned_assignments']} przydziałów w strefach, "
+                  f"{dispatch_stats['zone_border_orders']} oddanych przy granicach)")
+        print(f"  • Średni dystans dojazdu: {dispatch_stats['average_pickup_distance']:.1f}")
+        print(f"  • Średni czas dojazdu: {dispatch_stats['average_pickup_eta']:.1f} kroków")
+        strategy_stats = dispatch_stats['strategy']
+        if 'bound_gap' in strategy_stats:
+            print(f"  • Budżet rundy: {strategy_stats['budget_us']} us "
+                  f"(średnio {strategy_stats['average_elapsed_us']:.0f} us, "
+                  f"przerwane przez budżet: {strategy_stats['exhausted_rounds']}/{strategy_stats['rounds']})")
+            print(f"  • Poprawa względem zachłannego: {strategy_stats['improvement'] * 100:.1f}%, "
+                  f"odległość od dolnego ograniczenia: {strategy_stats['bound_gap'] * 100:.1f}%")
+        if self.dispatch_audit_log is not None:
+            print(f"  • Dziennik przydziałów: {self.dispatch_audit_log.total_records} rekordów "
+                  f"w {self.dispatch_audit_log.path}")
+        if self.dispatch_snapshot_recorder is not None:
+            print(f"  • Snapshoty rund: {self.dispatch_snapshot_recorder.snapshots_written} "
+                  f"w {self.dispatch_snapshot_recorder.directory}")
+        if self.repositioning_service:
+            reposition_stats = self.repositioning_service.get_stats()
+            print(f"  • Repozycjonowanie: {reposition_stats['total_moves']} przesunięć "
+                  f"w {reposition_stats['rounds']} rundach "
+                  f"(największy popyt: {reposition_stats['busiest_restaurant']})")
+        
+        # Statystyki tras (sieć ulic)
+        if self.route_table is not None:
+            cache_stats = RouteCache.default().get_stats()
+            print(f"\nTRASY:")
+            print(f"  • Tablica tras: {self.route_table.num_destinations} celów, "
+                  f"{self.route_table.num_sources} źródeł (klienci: {self.route_table.num_customers}"
+                  f"/{self.route_table.max_customers}, usunięte: {self.route_table.evictions})")
+            print(f"  • Cache tras: {cache_stats['size']}/{cache_stats['capacity']} "
+                  f"(trafienia: {cache_stats['hits']}, chybienia: {cache_stats['misses']}, "
+                  f"skuteczność: {cache_stats['hit_rate'] * 100:.1f}%, usunięte: {cache_stats['evictions']})")
+        
+        # Statystyki zatłoczenia ulic
+        if self.courier_manager.congestion is not None:
+            congestion_stats = self.courier_manager.congestion.get_stats()
+            print(f"\nZATŁOCZENIE:")
+            print(f"  • Kurierzy na ulicach: {congestion_stats['tracked_couriers']} "
+                  f"w {congestion_stats['occupied_cells']} komórkach "
+                  f"(najwięcej w jednej: {congestion_stats['max_occupancy']})")
+            print(f"  • Kroki ze spowolnieniem: {congestion_stats['slowed_steps']}")
         
         # Statystyki pogody
         weather_stats = self.weather_system.get_weather_stats()
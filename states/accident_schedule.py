@@ -0,0 +1,72 @@
+"""
+Harmonogram wypadku kuriera w trasie (losowanie geometryczne)
+
+Zamiast rzutu monetą w każdym kroku jazdy losowany jest od razu numer
+kroku, w którym nastąpi wypadek - z rozkładu geometrycznego dla
+prawdopodobieństwa wypadku na krok. Rozkład geometryczny nie ma pamięci,
+więc statystyka wypadków jest taka sama jak przy rzutach co krok, a po
+zmianie pogody wystarczy wylosować pozostały czas od nowa.
+"""
+
+import math
+import random
+
+
+class AccidentSchedule:
+    """
+    Odliczanie kroków jazdy do wypadku
+    
+    Jedno losowanie na odcinek trasy (stan jazdy) i ponowne tylko przy
+    zmianie prawdopodobieństwa wypadku (zmiana pogody).
+    
+    Zasady SOLID:
+    - Single Responsibility: tylko losowanie momentu wypadku
+    """
+    
+    def __init__(self):
+        """Harmonogram bez losowania - pierwsze przy pierwszym kroku jazdy"""
+        self._probability = None
+        self._steps_left = math.inf
+    
+    @staticmethod
+    def sample_steps(probability: float) -> float:
+        """
+        Losuje numer kroku z wypadkiem (rozkład geometryczny na 1, 2, 3, ...)
+        
+        Args:
+            probability: Prawdopodobieństwo wypadku na krok
+        
+        Returns:
+            float: Liczba kroków do wypadku włącznie (inf = nigdy)
+        """
+        if probability <= 0.0:
+            return math.inf
+        if probability >= 1.0:
+            return 1
+        return math.floor(math.log1p(-random.random()) / math.log1p(-probability)) + 1
+    
+    def step(self, probability: float) -> bool:
+        """
+        Odlicza krok jazdy i sprawdza czy nastąpił wypadek
+        
+        Args:
+            probability: Prawdopodobieństwo wypadku na krok (z aktualnej pogody)
+        
+        Returns:
+            bool: True jeśli w tym kroku jest wypadek
+        """
+        if probability != self._probability:
+            # Pierwszy krok lub zmiana pogody - pozostały czas od nowa (brak pamięci)
+            self._probability = probability
+            self._steps_left = self.sample_steps(probability)
+        
+        self._steps_left -= 1
+        if self._steps_left > 0:
+            return False
+        
+        # Wypadek - kolejny krok jazdy losuje od nowa
+        self._probability = None
+        return True
+    
+    def __repr__(self) -> str:
+        return f"AccidentSchedule(steps_left={self._steps_left}, probability={self._probability})"
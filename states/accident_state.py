@@ -38,7 +38,7 @@ class AccidentState(CourierState):
         
         # Usuń cel i zamówienie
         courier.target_location = None
-        # current_order powinno być już anulowane przez poprzedni stan
+        # current_order zostaje zwrócone do kolejki przez poprzedni stan
     
     def update(self, courier: 'Courier', weather_condition):
         """
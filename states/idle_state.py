@@ -16,7 +16,8 @@ class IdleState(CourierState):
     
     W tym stanie kurier:
     - Jest dostępny do przypisania zamówienia
-    - Nie porusza się
+    - Stoi w miejscu albo przesuwa się do celu wyznaczonego przez
+      RepositioningService (target_location)
     - Nie ma ryzyka wypadku
     """
     
@@ -36,10 +37,16 @@ class IdleState(CourierState):
         
         Args:
             courier: Kurier
-            weather_condition: Pogoda (nieistotna w tym stanie)
+            weather_condition: Pogoda (prędkość repozycjonowania)
         """
-        # Kurier stoi w miejscu, zwiększ czas bezczynności
+        # Kurier czeka na zamówienie, zwiększ czas bezczynności
         courier.idle_time += 1
+        
+        # Repozycjonowanie - przesuń się w stronę restauracji z popytem
+        if courier.target_location is not None:
+            courier.move_towards_target(courier.current_speed(weather_condition))
+            if courier.has_reached_target():
+                courier.target_location = None
     
     def is_available(self) -> bool:
         """
@@ -2,8 +2,9 @@
 Stan: Kurier dostarcza zamówienie do klienta
 """
 
-import random
+from states.accident_schedule import AccidentSchedule
 from states.courier_state import CourierState
+from models.location import Location
 from typing import TYPE_CHECKING
 import config
 
@@ -19,6 +20,10 @@ def get_idle_state():
     from states.idle_state import IdleState
     return IdleState()
 
+def get_to_restaurant_state():
+    from states.to_restaurant_state import ToRestaurantState
+    return ToRestaurantState()
+
 
 class ToCustomerState(CourierState):
     """
@@ -28,9 +33,18 @@ class ToCustomerState(CourierState):
     - Porusza się w kierunku klienta
     - Jest narażony na wypadek (zależnie od pogody)
     - Przechodzi do IdleState gdy dostarczy zamówienie
+      (lub od razu do ToRestaurantState gdy ma zamówienie w kolejce)
     - Przechodzi do AccidentState gdy ma wypadek
+    
+    Moment wypadku losowany jest raz na odcinek (AccidentSchedule),
+    a nie rzutem monetą w każdym kroku.
     """
     
+    def __init__(self):
+        """Inicjalizuje stan jazdy z harmonogramem wypadku"""
+        super().__init__()
+        self.accident_schedule = AccidentSchedule()
+    
     def on_enter(self, courier: 'Courier'):
         """
         Wejście w stan dostawy do klienta
@@ -39,7 +53,7 @@ class ToCustomerState(CourierState):
             courier: Kurier wchodzący w stan
         """
         if courier.current_order:
-            courier.target_location = courier.current_order.delivery_location
+            courier.set_target(courier.current_order.delivery_location)
     
     def update(self, courier: 'Courier', weather_condition):
         """
@@ -51,20 +65,25 @@ class ToCustomerState(CourierState):
         """
         courier.active_time += 1
         
-        # Oblicz prędkość z modyfikatorem pogody
-        speed = courier.base_speed * weather_condition.get_speed_multiplier()
+        # Oblicz prędkość z modyfikatorem pogody i zatłoczenia
+        speed = courier.current_speed(weather_condition)
         
-        # Sprawdź ryzyko wypadku
-        accident_prob = weather_condition.get_accident_probability()
-        if random.random() < accident_prob:
+        # Sprawdź ryzyko wypadku (odliczanie do wylosowanego kroku)
+        if self.accident_schedule.step(weather_condition.get_accident_probability()):
             # Wypadek!
             courier.register_accident()
             courier.set_state(get_accident_state())
             
-            # Anuluj zamówienie
+            # Jedzenie jest już odebrane - nowy kurier zabierze je z miejsca wypadku
             if courier.current_order:
-                courier.current_order.cancel()
+                accident_site = Location(courier.location.x, courier.location.y)
+                courier.current_order.requeue(recovery_location=accident_site)
                 courier.current_order = None
+            
+            # Zamówienie z kolejki kuriera czeka w restauracji na innego kuriera
+            if courier.next_order:
+                courier.next_order.release()
+                courier.next_order = None
             return
         
         # Poruszaj się w kierunku klienta
@@ -80,6 +99,14 @@ class ToCustomerState(CourierState):
                 earnings = courier.current_order.price * 0.40
                 courier.complete_delivery(earnings)
             
+            # Zamówienie z kolejki - jedź od razu do następnej restauracji
+            if courier.next_order:
+                next_order = courier.next_order
+                courier.next_order = None
+                courier.assign_order(next_order)
+                courier.set_state(get_to_restaurant_state())
+                return
+            
             # Wróć do stanu wolnego
             courier.set_state(get_idle_state())
     
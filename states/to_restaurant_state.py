@@ -2,7 +2,7 @@
 Stan: Kurier jedzie do restauracji po zamówienie
 """
 
-import random
+from states.accident_schedule import AccidentSchedule
 from states.courier_state import CourierState
 from typing import TYPE_CHECKING
 import config
@@ -19,6 +19,10 @@ def get_waiting_state():
     from states.waiting_at_restaurant_state import WaitingAtRestaurantState
     return WaitingAtRestaurantState()
 
+def get_to_customer_state():
+    from states.to_customer_state import ToCustomerState
+    return ToCustomerState()
+
 
 class ToRestaurantState(CourierState):
     """
@@ -27,10 +31,19 @@ class ToRestaurantState(CourierState):
     W tym stanie kurier:
     - Porusza się w kierunku restauracji
     - Jest narażony na wypadek (zależnie od pogody)
-    - Przechodzi do ToCustomerState gdy dotrze do celu
+    - Przechodzi do WaitingAtRestaurantState gdy dotrze do restauracji
+      (lub od razu do ToCustomerState przy odbiorze z miejsca wypadku)
     - Przechodzi do AccidentState gdy ma wypadek
+    
+    Moment wypadku losowany jest raz na odcinek (AccidentSchedule),
+    a nie rzutem monetą w każdym kroku.
     """
     
+    def __init__(self):
+        """Inicjalizuje stan jazdy z harmonogramem wypadku"""
+        super().__init__()
+        self.accident_schedule = AccidentSchedule()
+    
     def on_enter(self, courier: 'Courier'):
         """
         Wejście w stan jazdy do restauracji
@@ -51,19 +64,18 @@ class ToRestaurantState(CourierState):
         """
         courier.active_time += 1
         
-        # Oblicz prędkość z modyfikatorem pogody
-        speed = courier.base_speed * weather_condition.get_speed_multiplier()
+        # Oblicz prędkość z modyfikatorem pogody i zatłoczenia
+        speed = courier.current_speed(weather_condition)
         
-        # Sprawdź ryzyko wypadku
-        accident_prob = weather_condition.get_accident_probability()
-        if random.random() < accident_prob:
+        # Sprawdź ryzyko wypadku (odliczanie do wylosowanego kroku)
+        if self.accident_schedule.step(weather_condition.get_accident_probability()):
             # Wypadek!
             courier.register_accident()
             courier.set_state(get_accident_state())
             
-            # Anuluj zamówienie
+            # Zamówienie nieodebrane - wraca do kolejki dla innego kuriera
             if courier.current_order:
-                courier.current_order.cancel()
+                courier.current_order.requeue()
                 courier.current_order = None
             return
         
@@ -72,6 +84,13 @@ class ToRestaurantState(CourierState):
         
         # Sprawdź czy dotarł do restauracji
         if courier.has_reached_target():
+            order = courier.current_order
+            if order and order.recovery_location is not None:
+                # Odbiór z miejsca wypadku - jedzenie jest już gotowe
+                order.mark_picked_up()
+                courier.set_state(get_to_customer_state())
+                return
+            
             # Dotarł! Teraz CZEKA na przygotowanie jedzenia
             # (nie odbiera od razu - realistyczna symulacja!)
             courier.set_state(get_waiting_state())
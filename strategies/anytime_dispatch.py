@@ -0,0 +1,250 @@
+"""
+Strategia dispatchu: Przydział z budżetem czasu (anytime)
+
+Najpierw przydział zachłanny, potem ulepszenia (przeniesienie zamówienia
+do wolnego kuriera, zamiana kurierów między parą zamówień) dopóki starcza
+budżetu czasu rundy. Czas kroku jest przewidywalny niezależnie od długości
+kolejki, a wolny czas procesora poprawia przydział.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from strategies.dispatch_strategy import DispatchStrategy, DispatchContext
+from strategies.greedy_dispatch import GreedyDispatch
+import config
+
+
+# Minimalny zysk ulepszenia (chroni przed zapętleniem na błędach zaokrągleń)
+_MIN_GAIN = 1e-9
+
+
+class AnytimeDispatch(DispatchStrategy):
+    """
+    Przydział zachłanny + ulepszenia lokalne w budżecie czasu (mikrosekundy)
+    
+    Każde przejście ulepszające:
+    - przenosi zamówienia do tańszych wolnych kurierów
+    - zamienia kurierów między parami zamówień, gdy obniża to łączny koszt
+      (macierz zysków wszystkich par liczona jednym broadcastem NumPy)
+    
+    Przejścia trwają do wyczerpania budżetu albo do braku ulepszeń.
+    Przydział zachłanny wykonuje się zawsze - runda nigdy nie zostaje
+    bez rozwiązania.
+    
+    Jakość raportowana jest względem dolnego ograniczenia kosztu: każde
+    zamówienie kosztuje co najmniej minimum swojego wiersza, a n zamówień
+    zajmuje n różnych kurierów (suma n najmniejszych minimów kolumn).
+    """
+    
+    def __init__(self, budget_us: int = None, max_pairs: int = None):
+        """
+        Args:
+            budget_us: Budżet czasu rundy w mikrosekundach (None = z config)
+            max_pairs: Maksymalny rozmiar macierzy (None = z config)
+        """
+        self.budget_us = budget_us if budget_us is not None else config.DISPATCH_TIME_BUDGET_US
+        self._greedy = GreedyDispatch(max_pairs)
+        
+        # Statystyki (sumy po rundach)
+        self.rounds = 0
+        self.passes = 0
+        self.exhausted_rounds = 0  # Rundy przerwane przez budżet (ulepszenia wciąż możliwe)
+        self.total_greedy_cost = 0.0
+        self.total_cost = 0.0
+        self.total_lower_bound = 0.0
+        self.total_elapsed_us = 0.0
+    
+    def can_solve(self, num_orders: int, num_couriers: int) -> bool:
+        return self._greedy.can_solve(num_orders, num_couriers)
+    
+    def assign(self, context: DispatchContext) -> List[Tuple[int, int]]:
+        """
+        Przydział zachłanny ulepszany do wyczerpania budżetu
+        
+        Args:
+            context: Kontekst rundy
+        
+        Returns:
+            list: Pary (indeks zamówienia, indeks kuriera) posortowane po zamówieniu
+        """
+        pairs, round_stats = self.solve(context)
+        if round_stats is not None:
+            self.record_round(round_stats)
+        return pairs
+    
+    def solve(self, context: DispatchContext) -> Tuple[List[Tuple[int, int]], Optional[dict]]:
+        """
+        Przydział jak assign, ze statystykami rundy zamiast dopisania ich do sum
+        
+        Args:
+            context: Kontekst rundy
+        
+        Returns:
+            tuple: (pary posortowane po zamówieniu, statystyki rundy lub None bez przydziałów)
+        """
+        started = time.perf_counter_ns()
+        deadline = started + self.budget_us * 1000
+        
+        pairs = self._greedy.assign(context)
+        if not pairs:
+            return pairs, None
+        
+        cost = context.cost_matrix()
+        rows = np.array([order_index for order_index, _ in pairs])
+        cols = np.array([courier_index for _, courier_index in pairs])
+        greedy_cost = float(cost[rows, cols].sum())
+        
+        improved = True
+        passes = 0
+        while improved and time.perf_counter_ns() < deadline:
+            relocated = self._relocate(cost, rows, cols)
+            swapped = self._swap(cost, rows, cols)
+            improved = relocated or swapped
+            passes += 1
+        
+        round_stats = {
+            'passes': passes,
+            'exhausted': improved,
+            'greedy_cost': greedy_cost,
+            'cost': float(cost[rows, cols].sum()),
+            'lower_bound': self.lower_bound(cost, rows),
+            'elapsed_us': (time.perf_counter_ns() - started) / 1000
+        }
+        return sorted(zip(rows.tolist(), cols.tolist())), round_stats
+    
+    def record_round(self, round_stats: dict):
+        """
+        Dolicza statystyki rundy do sum
+        
+        Args:
+            round_stats: Statystyki rundy zwrócone przez solve
+        """
+        self.rounds += 1
+        self.passes += round_stats['passes']
+        if round_stats['exhausted']:
+            self.exhausted_rounds += 1
+        self.total_greedy_cost += round_stats['greedy_cost']
+        self.total_cost += round_stats['cost']
+        self.total_lower_bound += round_stats['lower_bound']
+        self.total_elapsed_us += round_stats['elapsed_us']
+    
+    @staticmethod
+    def _relocate(cost: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> bool:
+        """
+        Przenosi zamówienia do tańszych wolnych kurierów (modyfikuje cols)
+        
+        Args:
+            cost: Macierz kosztów (zamówienia x kurierzy)
+            rows: Przydzielone zamówienia
+            cols: Kurierzy przydzielonych zamówień
+        
+        Returns:
+            bool: True jeśli coś przeniesiono
+        """
+        free = np.ones(cost.shape[1], dtype=bool)
+        free[cols] = False
+        free_cols = np.flatnonzero(free)
+        if len(free_cols) == 0:
+            return False
+        
+        candidates = cost[rows][:, free_cols]
+        best = np.argmin(candidates, axis=1)
+        gain = cost[rows, cols] - candidates[np.arange(len(rows)), best]
+        
+        moved = False
+        taken = np.zeros(len(free_cols), dtype=bool)
+        for index in np.argsort(-gain, kind='stable'):
+            if gain[index] <= _MIN_GAIN:
+                break
+            if taken[best[index]]:
+                continue
+            taken[best[index]] = True
+            cols[index] = free_cols[best[index]]
+            moved = True
+        
+        return moved
+    
+    @staticmethod
+    def _swap(cost: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> bool:
+        """
+        Zamienia kurierów między parami zamówień (modyfikuje cols)
+        
+        Zysk zamiany i <-> j: c[i, a] + c[j, b] - c[i, b] - c[j, a], gdzie
+        a, b to kurierzy zamówień i, j. W jednym przejściu każde zamówienie
+        bierze udział w najwyżej jednej zamianie.
+        
+        Args:
+            cost: Macierz kosztów (zamówienia x kurierzy)
+            rows: Przydzielone zamówienia
+            cols: Kurierzy przydzielonych zamówień
+        
+        Returns:
+            bool: True jeśli coś zamieniono
+        """
+        if len(rows) < 2:
+            return False
+        
+        # crossed[i, j] = koszt zamówienia i u kuriera zamówienia j
+        crossed = cost[np.ix_(rows, cols)]
+        current = np.diagonal(crossed)
+        gain = current[:, None] + current[None, :] - crossed - crossed.T
+        np.fill_diagonal(gain, 0.0)
+        
+        partner = np.argmax(gain, axis=1)
+        best_gain = gain[np.arange(len(rows)), partner]
+        
+        swapped = False
+        used = np.zeros(len(rows), dtype=bool)
+        for index in np.argsort(-best_gain, kind='stable'):
+            if best_gain[index] <= _MIN_GAIN:
+                break
+            other = partner[index]
+            if used[index] or used[other]:
+                continue
+            used[index] = used[other] = True
+            cols[index], cols[other] = cols[other], cols[index]
+            swapped = True
+        
+        return swapped
+    
+    @staticmethod
+    def lower_bound(cost: np.ndarray, rows: np.ndarray) -> float:
+        """
+        Dolne ograniczenie łącznego kosztu przydziału zamówień rows
+        
+        Args:
+            cost: Macierz kosztów (zamówienia x kurierzy)
+            rows: Przydzielone zamówienia (każde innemu kurierowi)
+        
+        Returns:
+            float: Łączny koszt nie mniejszy niż ten przy żadnym przydziale
+        """
+        block = cost[rows]
+        by_order = block.min(axis=1).sum()
+        by_courier = np.partition(block.min(axis=0), len(rows) - 1)[:len(rows)].sum()
+        return float(max(by_order, by_courier))
+    
+    def get_stats(self) -> dict:
+        """
+        Zwraca statystyki budżetu i jakości przydziału
+        
+        Returns:
+            dict: Statystyki (bound_gap = względna odległość od dolnego ograniczenia)
+        """
+        return {
+            'budget_us': self.budget_us,
+            'rounds': self.rounds,
+            'passes': self.passes,
+            'exhausted_rounds': self.exhausted_rounds,
+            'average_elapsed_us': self.total_elapsed_us / self.rounds if self.rounds else 0.0,
+            'improvement': (1.0 - self.total_cost / self.total_greedy_cost
+                            if self.total_greedy_cost > 0 else 0.0),
+            'bound_gap': (1.0 - self.total_lower_bound / self.total_cost
+                          if self.total_cost > 0 else 0.0)
+        }
+    
+    def get_name(self) -> str:
+        return f"Anytime (greedy + swaps, {self.budget_us} us)"
@@ -4,8 +4,9 @@ Strategia routingu: Prosta linia (odległość euklidesowa)
 Najkrótsza możliwa trasa - linia prosta między punktami
 """
 
+import numpy as np
 from strategies.routing_strategy import RoutingStrategy
-from typing import TYPE_CHECKING
+from typing import Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from models.location import Location
@@ -37,6 +38,21 @@ class DirectRoute(RoutingStrategy):
         """
         return start.distance_to(end)
     
+    def calculate_distance_matrix(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Odległości euklidesowe wszystkich par jednym broadcastem
+        
+        Args:
+            starts: Tablica (C, 2) punktów startowych
+            ends: Tablica (P, 2) punktów końcowych
+        
+        Returns:
+            np.ndarray: Macierz (P, C)
+        """
+        dx = ends[:, 0:1] - starts[:, 0]
+        dy = ends[:, 1:2] - starts[:, 1]
+        return np.sqrt(dx * dx + dy * dy)
+    
     def get_name(self) -> str:
         return "Direct Route (Euclidean)"
     
@@ -52,17 +68,46 @@ class DirectRoute(RoutingStrategy):
         Returns:
             Location: Nowa lokalizacja
         """
-        from models.location import Location
+        return current.move_towards(target, distance)
         
-        current_distance = current.distance_to(target)
+    def advance(self, location: 'Location', target: 'Location', distance: float) -> float:
+        """
+        Przesuwa lokalizację w miejscu w linii prostej (jeden sqrt, bez alokacji)
         
-        # Jeśli jesteśmy blisko celu, wróć cel
-        if current_distance <= distance:
-            return Location(target.x, target.y)
+        Args:
+            location: Lokalizacja do przesunięcia (modyfikowana)
+            target: Cel
+            distance: Maksymalny dystans przesunięcia
         
-        # Linia prosta - znormalizowany wektor kierunku
-        ratio = distance / current_distance
-        new_x = current.x + (target.x - current.x) * ratio
-        new_y = current.y + (target.y - current.y) * ratio
+        Returns:
+            float: Przebyty dystans
+        """
+        return location.advance_towards(target, distance)
+        
+    def advance_batch(self, positions: np.ndarray, targets: np.ndarray, distances: np.ndarray,
+                      threshold: float = 5.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ruch w linii prostej całej floty naraz (te same działania co advance_towards)
+        
+        Args:
+            positions: Tablica (N, 2) obecnych pozycji
+            targets: Tablica (N, 2) celów
+            distances: Tablica (N,) maksymalnych dystansów przesunięcia
+            threshold: Próg odległości uznawany za dotarcie
+        
+        Returns:
+            tuple: (nowe pozycje (N, 2), dotarcie (N,) bool, przebyty dystans (N,))
+        """
+        dx = targets[:, 0] - positions[:, 0]
+        dy = targets[:, 1] - positions[:, 1]
+        current_distance = np.sqrt(dx * dx + dy * dy)
         
-        return Location(new_x, new_y)
+        # Blisko celu - stań w celu, dalej - przesuń o znormalizowany wektor kierunku
+        arrived = current_distance <= distances
+        ratio = distances / np.where(arrived, 1.0, current_distance)
+        new_positions = np.where(
+            arrived[:, None], targets,
+            positions + np.stack((dx * ratio, dy * ratio), axis=1)
+        )
+        moved = np.where(arrived, current_distance, distances)
+        return new_positions, self._reached(new_positions, targets, threshold), moved
@@ -0,0 +1,272 @@
+"""
+Wzorzec Strategy - abstrakcyjna klasa bazowa dla strategii przydziału zamówień
+
+Demonstracja Strategy Pattern dla dispatchu (kto dostaje które zamówienie)
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from models.courier import Courier
+    from models.order import Order
+    from strategies.routing_strategy import RoutingStrategy
+
+
+class DispatchContext:
+    """
+    Kontekst rundy przydziału przekazywany do strategii dispatchu
+    
+    Zawiera współrzędne punktów odbioru (wiersze) i dostępnych kurierów
+    (kolumny). Strategie pracują na indeksach, więc ten sam kontekst
+    można zbudować z obiektów symulacji albo z zapisanych tablic.
+    
+    Koszt przydziału:
+    - bez prędkości kurierów: odległość euklidesowa
+    - z prędkościami i grupami routingu: szacowany czas dojazdu (ETA) -
+      odległość wg strategii routingu kuriera / (prędkość * mnożnik pogody)
+    - opóźnienie kuriera (courier_delay) jest dodawane do całej kolumny -
+      kurier kończący dostawę startuje z miejsca klienta dopiero po niej;
+      opóźnienie jest w tej samej mierze co koszt (odległość w linii
+      prostej do klienta albo pozostały czas trasy)
+    """
+    
+    def __init__(
+        self,
+        pickup_xy: np.ndarray,
+        courier_xy: np.ndarray,
+        courier_speed: Optional[np.ndarray] = None,
+        routing_groups: Optional[List[Tuple['RoutingStrategy', np.ndarray]]] = None,
+        courier_delay: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            pickup_xy: Tablica (P, 2) współrzędnych odbioru zamówień
+            courier_xy: Tablica (C, 2) współrzędnych kurierów
+            courier_speed: Tablica (C,) efektywnych prędkości (None = koszt to dystans)
+            routing_groups: Pary (strategia routingu, indeksy kurierów) - jedna na typ kuriera
+            courier_delay: Tablica (C,) kosztu do zakończenia bieżącej dostawy (None = brak)
+        """
+        self.pickup_xy = pickup_xy
+        self.courier_xy = courier_xy
+        self.courier_speed = courier_speed
+        self.routing_groups = routing_groups
+        self.courier_delay = courier_delay
+        self._cost_matrix: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_round(
+        cls,
+        orders: Sequence['Order'],
+        couriers: Sequence['Courier'],
+        speed_multiplier: Optional[float] = None,
+        finishing_couriers: Sequence['Courier'] = ()
+    ) -> 'DispatchContext':
+        """
+        Buduje kontekst z zamówień i kurierów bieżącej rundy
+        
+        Kurierzy kończący dostawę (look-ahead) są kolumnami za dostępnymi
+        kurierami; ich pozycja to cel bieżącej dostawy, a opóźnienie to
+        odległość w linii prostej do tego celu (koszt-dystans) lub pozostały
+        czas trasy do niego (ETA).
+        
+        Args:
+            orders: Zamówienia (w kolejności priorytetu)
+            couriers: Dostępni kurierzy
+            speed_multiplier: Mnożnik prędkości pogody (None = koszt to dystans)
+            finishing_couriers: Kurierzy w drodze do klienta, bliscy końca dostawy
+        
+        Returns:
+            DispatchContext: Kontekst rundy
+        """
+        pickup_xy = np.array(
+            [(order.pickup_location.x, order.pickup_location.y) for order in orders],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        courier_xy = np.array(
+            [(courier.location.x, courier.location.y) for courier in couriers] +
+            [(courier.target_location.x, courier.target_location.y) for courier in finishing_couriers],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        
+        courier_delay = None
+        if finishing_couriers:
+            courier_delay = np.zeros(len(couriers) + len(finishing_couriers))
+        
+        if speed_multiplier is None:
+            if courier_delay is not None:
+                courier_delay[len(couriers):] = [courier.location.distance_to(courier.target_location)
+                                                 for courier in finishing_couriers]
+            return cls(pickup_xy, courier_xy, courier_delay=courier_delay)
+        
+        if courier_delay is not None:
+            courier_delay[len(couriers):] = [courier.remaining_distance for courier in finishing_couriers]
+        
+        all_couriers = list(couriers) + list(finishing_couriers)
+        courier_speed = np.array([courier.base_speed for courier in all_couriers], dtype=np.float64)
+        courier_speed *= speed_multiplier
+        if courier_delay is not None:
+            courier_delay /= courier_speed
+        
+        # Kurierzy tego samego typu mają tę samą strategię routingu
+        groups: Dict[str, Tuple['RoutingStrategy', List[int]]] = {}
+        for index, courier in enumerate(all_couriers):
+            group = groups.setdefault(courier.courier_type, (courier.routing_strategy, []))
+            group[1].append(index)
+        routing_groups = [(strategy, np.array(indices, dtype=np.int64))
+                          for strategy, indices in groups.values()]
+        
+        return cls(pickup_xy, courier_xy, courier_speed, routing_groups, courier_delay)
+    
+    @property
+    def num_orders(self) -> int:
+        return len(self.pickup_xy)
+    
+    @property
+    def num_couriers(self) -> int:
+        return len(self.courier_xy)
+    
+    def cost_matrix(self) -> np.ndarray:
+        """
+        Macierz kosztów (P, C) - dystans albo czas dojazdu kuriera do punktu odbioru
+        
+        Liczona raz na rundę (leniwie); ETA jednym wywołaniem
+        calculate_distance_matrix na typ kuriera.
+        
+        Returns:
+            np.ndarray: Koszt przydziału zamówienia i do kuriera j
+        """
+        if self._cost_matrix is None:
+            if self.courier_speed is None:
+                dx = self.pickup_xy[:, 0:1] - self.courier_xy[:, 0]
+                dy = self.pickup_xy[:, 1:2] - self.courier_xy[:, 1]
+                self._cost_matrix = np.sqrt(dx * dx + dy * dy)
+            else:
+                cost = np.empty((self.num_orders, self.num_couriers))
+                for strategy, columns in self.routing_groups:
+                    distances = strategy.calculate_distance_matrix(self.courier_xy[columns], self.pickup_xy)
+                    cost[:, columns] = distances / self.courier_speed[columns]
+                self._cost_matrix = cost
+            if self.courier_delay is not None:
+                self._cost_matrix = self._cost_matrix + self.courier_delay
+        return self._cost_matrix
+    
+    def __getstate__(self) -> dict:
+        """
+        Stan do przekazania innemu procesowi (pula stref DispatchService)
+        
+        Wysyłane są same tablice z gotową macierzą kosztów - bez strategii
+        routingu kurierów.
+        """
+        state = self.__dict__.copy()
+        state['_cost_matrix'] = self.cost_matrix()
+        state['routing_groups'] = None
+        return state
+    
+    def ranking_matrix(self) -> np.ndarray:
+        """
+        Macierz (P, C) o tej samej kolejności co koszt, tańsza do porównań
+        
+        Dla kosztu euklidesowego zwraca kwadraty odległości (bez sqrt) -
+        porównania dają dokładnie ten sam wynik co indeks przestrzenny,
+        także przy remisach. Dla ETA (i z opóźnieniami) to po prostu
+        macierz kosztów.
+        
+        Returns:
+            np.ndarray: Wartości do wyboru najtańszego kuriera
+        """
+        if self.courier_speed is not None or self.courier_delay is not None:
+            return self.cost_matrix()
+        dx = self.pickup_xy[:, 0:1] - self.courier_xy[:, 0]
+        dy = self.pickup_xy[:, 1:2] - self.courier_xy[:, 1]
+        return dx * dx + dy * dy
+
+
+class DispatchStrategy(ABC):
+    """
+    Abstrakcyjna klasa bazowa dla strategii przydziału zamówień
+    
+    Wzorce projektowe:
+    - Strategy Pattern: różne algorytmy dopasowania zamówień do kurierów
+    
+    Zasady SOLID:
+    - Open/Closed: nowe polityki dispatchu bez modyfikacji DispatchService
+    - Liskov Substitution: wszystkie strategie są wymienne
+    """
+    
+    def can_solve(self, num_orders: int, num_couriers: int) -> bool:
+        """
+        Czy strategia obsłuży rundę tej wielkości
+        
+        Gdy zwraca False, DispatchService używa zachłannego przydziału
+        przez indeks przestrzenny (bez budowania macierzy kosztów).
+        
+        Args:
+            num_orders: Liczba zamówień w rundzie
+            num_couriers: Liczba dostępnych kurierów
+        
+        Returns:
+            bool: True jeśli strategia może rozwiązać rundę
+        """
+        return True
+    
+    @abstractmethod
+    def assign(self, context: DispatchContext) -> List[Tuple[int, int]]:
+        """
+        Wyznacza przydział zamówień do kurierów
+        
+        Args:
+            context: Kontekst rundy
+        
+        Returns:
+            list: Pary (indeks zamówienia, indeks kuriera) w kolejności zatwierdzania
+        """
+        pass
+    
+    def solve(self, context: DispatchContext) -> Tuple[List[Tuple[int, int]], Optional[dict]]:
+        """
+        Wyznacza przydział bez zmiany stanu strategii (np. w innym procesie)
+        
+        Statystyki rundy wracają osobno i są doliczane przez record_round
+        w procesie głównym - kopia strategii w innym procesie ich nie zachowa.
+        
+        Args:
+            context: Kontekst rundy
+        
+        Returns:
+            tuple: (pary jak z assign, statystyki rundy lub None)
+        """
+        return self.assign(context), None
+    
+    def record_round(self, round_stats: dict):
+        """
+        Dolicza statystyki rundy rozwiązanej przez solve
+        
+        Args:
+            round_stats: Statystyki rundy zwrócone przez solve
+        """
+        pass
+    
+    @abstractmethod
+    def get_name(self) -> str:
+        """
+        Nazwa strategii
+        
+        Returns:
+            str: Nazwa
+        """
+        pass
+    
+    def get_stats(self) -> dict:
+        """
+        Statystyki strategii (np. odległość od dolnego ograniczenia kosztu)
+        
+        Returns:
+            dict: Statystyki (pusty słownik gdy strategia ich nie zbiera)
+        """
+        return {}
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
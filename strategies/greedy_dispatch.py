@@ -0,0 +1,69 @@
+"""
+Strategia dispatchu: Zachłanny przydział na macierzy kosztów
+
+Kolejne zamówienia z kolejki dostają najtańszego wolnego kuriera -
+to samo co przydział przez indeks przestrzenny, ale cała runda
+liczona jest jedną macierzą NumPy.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from strategies.dispatch_strategy import DispatchStrategy, DispatchContext
+import config
+
+
+class GreedyDispatch(DispatchStrategy):
+    """
+    Zachłanny przydział (najbliższy kurier dla kolejnego zamówienia)
+    
+    Macierz kosztów (zamówienia x kurierzy) liczona jest jednym broadcastem,
+    a wybór kuriera to argmin po wierszu z zamaskowanymi zajętymi kurierami.
+    Argmin zwraca pierwszy indeks przy remisie, a kurierzy są w kolejności ID -
+    wynik jest identyczny z przydziałem przez indeks przestrzenny.
+    
+    Dla dużych rund (powyżej DISPATCH_GREEDY_MAX_PAIRS par) macierz jest
+    za duża - DispatchService używa wtedy indeksu przestrzennego.
+    """
+    
+    def __init__(self, max_pairs: int = None):
+        """
+        Args:
+            max_pairs: Maksymalny rozmiar macierzy (None = z config)
+        """
+        self.max_pairs = max_pairs if max_pairs is not None else config.DISPATCH_GREEDY_MAX_PAIRS
+    
+    def can_solve(self, num_orders: int, num_couriers: int) -> bool:
+        return num_orders * num_couriers <= self.max_pairs
+    
+    def assign(self, context: DispatchContext) -> List[Tuple[int, int]]:
+        """
+        Przydziela zamówienia po kolei najtańszym wolnym kurierom
+        
+        Args:
+            context: Kontekst rundy
+        
+        Returns:
+            list: Pary (indeks zamówienia, indeks kuriera) w kolejności kolejki
+        """
+        if context.num_orders == 0 or context.num_couriers == 0:
+            return []
+        
+        ranking = context.ranking_matrix()
+        taken = np.zeros(context.num_couriers, dtype=bool)
+        
+        pairs = []
+        for order_index in range(context.num_orders):
+            row = np.where(taken, np.inf, ranking[order_index])
+            courier_index = int(np.argmin(row))
+            if taken[courier_index]:
+                # Wszyscy kurierzy zajęci
+                break
+            taken[courier_index] = True
+            pairs.append((order_index, courier_index))
+        
+        return pairs
+    
+    def get_name(self) -> str:
+        return "Greedy (nearest)"
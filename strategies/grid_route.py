@@ -4,8 +4,9 @@ Strategia routingu: Siatka ulic (Manhattan distance)
 Symuluje jazdę po siatce ulic - tylko poziomo i pionowo
 """
 
+import numpy as np
 from strategies.routing_strategy import RoutingStrategy
-from typing import TYPE_CHECKING
+from typing import Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from models.location import Location
@@ -43,6 +44,20 @@ class GridRoute(RoutingStrategy):
         """
         return start.manhattan_distance_to(end)
     
+    def calculate_distance_matrix(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Odległości Manhattan wszystkich par jednym broadcastem
+        
+        Args:
+            starts: Tablica (C, 2) punktów startowych
+            ends: Tablica (P, 2) punktów końcowych
+        
+        Returns:
+            np.ndarray: Macierz (P, C)
+        """
+        return (np.abs(ends[:, 0:1] - starts[:, 0]) +
+                np.abs(ends[:, 1:2] - starts[:, 1]))
+    
     def get_name(self) -> str:
         return "Grid Route (Manhattan)"
     
@@ -61,24 +76,70 @@ class GridRoute(RoutingStrategy):
         Returns:
             Location: Nowa lokalizacja
         """
-        from models.location import Location
+        new_location = current.copy()
+        self.advance(new_location, target, distance)
+        return new_location
         
-        dx = target.x - current.x
-        dy = target.y - current.y
+    def advance(self, location: 'Location', target: 'Location', distance: float) -> float:
+        """
+        Przesuwa lokalizację w miejscu po gridzie ulic (najpierw X, potem Y)
+        
+        Args:
+            location: Lokalizacja do przesunięcia (modyfikowana)
+            target: Cel
+            distance: Maksymalny dystans przesunięcia
+            
+        Returns:
+            float: Przebyty dystans (suma ruchu w poziomie i pionie)
+        """
+        dx = target.x - location.x
+        dy = target.y - location.y
         
         remaining = distance
-        new_x = current.x
-        new_y = current.y
         
         # Najpierw jedź w poziomie (X)
         if abs(dx) > 0.1:
             move_x = min(remaining, abs(dx))
-            new_x = current.x + (move_x if dx > 0 else -move_x)
+            location.x += move_x if dx > 0 else -move_x
             remaining -= move_x
         
         # Potem jedź w pionie (Y)
         if remaining > 0.1 and abs(dy) > 0.1:
             move_y = min(remaining, abs(dy))
-            new_y = current.y + (move_y if dy > 0 else -move_y)
+            location.y += move_y if dy > 0 else -move_y
+            remaining -= move_y
+        
+        return distance - remaining
+
+    def advance_batch(self, positions: np.ndarray, targets: np.ndarray, distances: np.ndarray,
+                      threshold: float = 5.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ruch po gridzie ulic całej floty naraz (najpierw X, potem Y - jak advance)
+        
+        Tolerancje 0.1 z advance są zachowane maskami: ruch w X tylko gdy
+        |dx| > 0.1, ruch w Y tylko gdy zostało więcej niż 0.1 dystansu i |dy| > 0.1.
+        
+        Args:
+            positions: Tablica (N, 2) obecnych pozycji
+            targets: Tablica (N, 2) celów
+            distances: Tablica (N,) maksymalnych dystansów przesunięcia
+            threshold: Próg odległości uznawany za dotarcie
+        
+        Returns:
+            tuple: (nowe pozycje (N, 2), dotarcie (N,) bool, przebyty dystans (N,))
+        """
+        dx = targets[:, 0] - positions[:, 0]
+        dy = targets[:, 1] - positions[:, 1]
+        
+        # Najpierw jedź w poziomie (X)
+        move_x = np.where(np.abs(dx) > 0.1, np.minimum(distances, np.abs(dx)), 0.0)
+        new_x = positions[:, 0] + np.where(dx > 0, move_x, -move_x)
+        remaining = distances - move_x
+        
+        # Potem jedź w pionie (Y)
+        move_y = np.where((remaining > 0.1) & (np.abs(dy) > 0.1), np.minimum(remaining, np.abs(dy)), 0.0)
+        new_y = positions[:, 1] + np.where(dy > 0, move_y, -move_y)
+        remaining = remaining - move_y
         
-        return Location(new_x, new_y)
+        new_positions = np.stack((new_x, new_y), axis=1)
+        return new_positions, self._reached(new_positions, targets, threshold), distances - remaining
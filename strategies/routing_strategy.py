@@ -5,10 +5,12 @@ Demonstracja Strategy Pattern dla wyznaczania tras
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import numpy as np
     from models.location import Location
+    from routing.route_leg import RouteLeg
 
 
 class RoutingStrategy(ABC):
@@ -37,6 +39,30 @@ class RoutingStrategy(ABC):
         """
         pass
     
+    def calculate_distance_matrix(self, starts: 'np.ndarray', ends: 'np.ndarray') -> 'np.ndarray':
+        """
+        Oblicza odległości między wieloma punktami naraz
+        
+        Domyślnie wywołuje calculate_distance dla każdej pary - strategie
+        powinny nadpisać tę metodę wersją zwektoryzowaną (NumPy).
+        
+        Args:
+            starts: Tablica (C, 2) punktów startowych (np. kurierzy)
+            ends: Tablica (P, 2) punktów końcowych (np. restauracje)
+        
+        Returns:
+            np.ndarray: Macierz (P, C) - odległość od starts[j] do ends[i]
+        """
+        import numpy as np
+        from models.location import Location
+        
+        matrix = np.empty((len(ends), len(starts)))
+        for i, (end_x, end_y) in enumerate(ends):
+            end = Location(end_x, end_y)
+            for j, (start_x, start_y) in enumerate(starts):
+                matrix[i, j] = self.calculate_distance(Location(start_x, start_y), end)
+        return matrix
+    
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -64,5 +90,79 @@ class RoutingStrategy(ABC):
         """
         pass
     
+    def advance(self, location: 'Location', target: 'Location', distance: float) -> float:
+        """
+        Przesuwa lokalizację w miejscu w kierunku celu (ruch kuriera w kroku)
+        
+        Domyślnie korzysta z move_towards i kopiuje współrzędne - strategie
+        powinny nadpisać tę metodę wersją bez tworzenia obiektów.
+        
+        Args:
+            location: Lokalizacja do przesunięcia (modyfikowana)
+            target: Cel
+            distance: Maksymalny dystans przesunięcia
+            
+        Returns:
+            float: Przebyty dystans wzdłuż trasy strategii
+        """
+        new_location = self.move_towards(location, target, distance)
+        moved = self.calculate_distance(location, new_location)
+        location.x = new_location.x
+        location.y = new_location.y
+        return moved
+    
+    def advance_batch(self, positions: 'np.ndarray', targets: 'np.ndarray', distances: 'np.ndarray',
+                      threshold: float = 5.0) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Przesuwa wielu kurierów tej strategii naraz (ruch floty w kroku)
+        
+        Domyślnie wywołuje advance dla każdego kuriera - strategie
+        powinny nadpisać tę metodę wersją zwektoryzowaną (NumPy)
+        dającą dokładnie te same pozycje co advance.
+        
+        Args:
+            positions: Tablica (N, 2) obecnych pozycji
+            targets: Tablica (N, 2) celów
+            distances: Tablica (N,) maksymalnych dystansów przesunięcia
+            threshold: Próg odległości uznawany za dotarcie (jak Courier.has_reached_target)
+        
+        Returns:
+            tuple: (nowe pozycje (N, 2), dotarcie (N,) bool, przebyty dystans (N,))
+        """
+        import numpy as np
+        from models.location import Location
+        
+        new_positions = np.empty((len(positions), 2))
+        moved = np.empty(len(positions))
+        for i, ((x, y), (target_x, target_y)) in enumerate(zip(positions, targets)):
+            location = Location(float(x), float(y))
+            moved[i] = self.advance(location, Location(float(target_x), float(target_y)), float(distances[i]))
+            new_positions[i] = location.x, location.y
+        return new_positions, self._reached(new_positions, targets, threshold), moved
+    
+    @staticmethod
+    def _reached(positions: 'np.ndarray', targets: 'np.ndarray', threshold: float) -> 'np.ndarray':
+        """Dotarcie do celu - kwadrat odległości poniżej kwadratu progu (bez sqrt)"""
+        dx = targets[:, 0] - positions[:, 0]
+        dy = targets[:, 1] - positions[:, 1]
+        return dx * dx + dy * dy < threshold * threshold
+    
+    def plan_leg(self, start: 'Location', target: 'Location') -> Optional['RouteLeg']:
+        """
+        Wyznacza cały odcinek trasy z góry (łamana z długościami narastającymi)
+        
+        Domyślnie None - kurier porusza się krok po kroku przez advance().
+        Strategie, dla których wyznaczenie kierunku w każdym kroku jest
+        kosztowne (graf ulic), zwracają łamaną liczoną raz na odcinek.
+        
+        Args:
+            start: Punkt startowy odcinka
+            target: Cel odcinka
+        
+        Returns:
+            RouteLeg: Odcinek trasy lub None
+        """
+        return None
+    
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
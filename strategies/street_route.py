@@ -0,0 +1,356 @@
+"""
+Strategia routingu: Sieć ulic (graf skrzyżowań, A*)
+
+Kurier jedzie ulicami grafu StreetGraph - omija zamknięte skrzyżowania
+i nie jedzie pod prąd ulic jednokierunkowych.
+"""
+
+import math
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from routing.astar import astar, distances_to
+from routing.contraction_hierarchy import ContractionHierarchy
+from routing.route_cache import RouteCache
+from routing.route_leg import RouteLeg
+from routing.route_table import RouteTable
+from routing.street_graph import StreetGraph, path_points
+from strategies.routing_strategy import RoutingStrategy
+
+if TYPE_CHECKING:
+    from models.location import Location
+
+
+class StreetRoute(RoutingStrategy):
+    """
+    Strategia routingu: najkrótsza trasa w sieci ulic (A*, heurystyka Manhattan)
+    
+    Trasa punktu A do punktu B:
+    - dojazd z A do jednego z rogów jego kwartału (najpierw X, potem Y)
+    - najkrótsza trasa A* ulicami do jednego z rogów kwartału B
+    - dojazd od rogu do B (najpierw X, potem Y)
+    Punkty w tym samym kwartale łączy bezpośredni dystans Manhattan.
+    
+    Kurier dostaje trasę raz na odcinek (plan_leg) i w każdym kroku tylko
+    przesuwa postęp na łamanej; advance() wyznacza trasę od bieżącej pozycji.
+    Trasy do restauracji i klientów z puli (oraz od restauracji) są
+    odczytywane z RouteTable. Dla pozostałych punktów trasa to najlepsza
+    kombinacja rogów kwartału startu i celu, a trasy między rogami
+    pochodzą z cache LRU (RouteCache) - A* tylko przy chybieniu.
+    Z indeksem CH (STREET_CH_PATH) długości tras liczy hierarchia
+    kontrakcji, a skróty rozwijane są tylko dla trasy, którą kurier jedzie.
+    Gdy cel jest nieosiągalny (np. odcięty zamkniętymi skrzyżowaniami),
+    kurier jedzie jak GridRoute - najpierw X, potem Y.
+    """
+    
+    def __init__(
+        self,
+        graph: StreetGraph = None,
+        route_table: RouteTable = None,
+        route_cache: RouteCache = None,
+        courier_type: str = "biker",
+        hierarchy: ContractionHierarchy = None
+    ):
+        """
+        Args:
+            graph: Graf ulic (None = graf mapy z config, współdzielony)
+            route_table: Tablica tras (None = tablica grafu mapy; dla własnego grafu - bez tablicy)
+            route_cache: Cache tras (None = cache grafu mapy; dla własnego grafu - bez cache)
+            courier_type: Typ kuriera (część klucza cache tras)
+            hierarchy: Indeks CH grafu (None = indeks mapy z STREET_CH_PATH; dla własnego grafu - bez CH)
+        """
+        self.graph = graph if graph is not None else StreetGraph.default()
+        if graph is None:
+            route_table = route_table if route_table is not None else RouteTable.default()
+            route_cache = route_cache if route_cache is not None else RouteCache.default()
+            hierarchy = hierarchy if hierarchy is not None else ContractionHierarchy.default()
+        self.route_table = route_table
+        self.route_cache = route_cache
+        self.courier_type = courier_type
+        self.hierarchy = hierarchy
+    
+    def calculate_distance(self, start: 'Location', end: 'Location') -> float:
+        """
+        Długość najkrótszej trasy ulicami
+        
+        Args:
+            start: Punkt startowy
+            end: Punkt końcowy
+        
+        Returns:
+            float: Długość trasy w jednostkach mapy
+        """
+        if self.hierarchy is None:
+            return self.plan(start, end)[0]
+        
+        # Z indeksem CH - sama długość, bez odtwarzania trasy
+        direct = abs(end.x - start.x) + abs(end.y - start.y)
+        if self._same_block(np.array([[start.x, start.y]]), end.x, end.y)[0]:
+            return direct
+        length = self.route_table.distance(start, end) if self.route_table is not None else None
+        if length is None:
+            length = self.hierarchy.distance(self._corner_costs(start.x, start.y),
+                                             self._corner_costs(end.x, end.y))
+        return direct if math.isinf(length) else length
+    
+    def calculate_distance_matrix(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Długości tras wszystkich par - tablica tras celu, indeks CH albo jedna Dijkstra (graf odwrócony)
+        
+        Args:
+            starts: Tablica (C, 2) punktów startowych
+            ends: Tablica (P, 2) punktów końcowych
+        
+        Returns:
+            np.ndarray: Macierz (P, C)
+        """
+        graph = self.graph
+        corners, offsets = self._corner_arrays(starts)
+        manhattan = (np.abs(ends[:, 0:1] - starts[:, 0]) + np.abs(ends[:, 1:2] - starts[:, 1]))
+        matrix = np.empty((len(ends), len(starts)))
+        
+        untabled = []
+        for row, (end_x, end_y) in enumerate(ends):
+            to_end = self.route_table.distances_to(end_x, end_y) if self.route_table is not None else None
+            if to_end is None and self.hierarchy is not None:
+                untabled.append(row)
+                continue
+            if to_end is None:
+                to_end = distances_to(graph, self._corner_costs(end_x, end_y))
+            matrix[row] = np.min(offsets + to_end[corners], axis=1)
+        
+        if untabled:
+            # Cele bez tablicy - wszystkie naraz z indeksu CH (kubełki)
+            sources = [{int(node): float(offset) for node, offset in zip(row_corners, row_offsets)
+                        if not np.isinf(offset)}
+                       for row_corners, row_offsets in zip(corners, offsets)]
+            matrix[untabled] = self.hierarchy.distance_matrix(
+                sources, [self._corner_costs(ends[row, 0], ends[row, 1]) for row in untabled]
+            )
+        
+        for row, (end_x, end_y) in enumerate(ends):
+            matrix[row] = np.where(self._same_block(starts, end_x, end_y), manhattan[row], matrix[row])
+        
+        # Nieosiągalne cele - jak GridRoute
+        return np.where(np.isinf(matrix), manhattan, matrix)
+    
+    def get_name(self) -> str:
+        return "Street Route (A*)"
+    
+    def move_towards(self, current: 'Location', target: 'Location', distance: float) -> 'Location':
+        """
+        Porusza się ulicami po najkrótszej trasie
+        
+        Args:
+            current: Obecna lokalizacja
+            target: Cel
+            distance: Dystans do przesunięcia
+        
+        Returns:
+            Location: Nowa lokalizacja
+        """
+        new_location = current.copy()
+        self.advance(new_location, target, distance)
+        return new_location
+    
+    def advance(self, location: 'Location', target: 'Location', distance: float) -> float:
+        """
+        Przesuwa lokalizację w miejscu wzdłuż najkrótszej trasy ulicami
+        
+        Args:
+            location: Lokalizacja do przesunięcia (modyfikowana)
+            target: Cel
+            distance: Maksymalny dystans przesunięcia
+        
+        Returns:
+            float: Przebyty dystans
+        """
+        _, points = self.plan(location, target)
+        return walk_polyline(location, points, distance)
+    
+    def plan_leg(self, start: 'Location', target: 'Location') -> RouteLeg:
+        """
+        Wyznacza odcinek ulicami raz, na jego początku
+        
+        Args:
+            start: Punkt startowy odcinka
+            target: Cel odcinka
+        
+        Returns:
+            RouteLeg: Łamana trasy z długościami narastającymi
+        """
+        return RouteLeg(self.plan(start, target)[1])
+    
+    def plan(self, start: 'Location', end: 'Location') -> Tuple[float, List[Tuple[float, float]]]:
+        """
+        Wyznacza trasę ulicami od punktu do punktu
+        
+        Args:
+            start: Punkt startowy
+            end: Punkt końcowy
+        
+        Returns:
+            tuple: (długość trasy, wierzchołki łamanej od start do end)
+        """
+        graph = self.graph
+        direct = abs(end.x - start.x) + abs(end.y - start.y)
+        direct_points = [(start.x, start.y), (end.x, start.y), (end.x, end.y)]
+        if self._same_block(np.array([[start.x, start.y]]), end.x, end.y)[0]:
+            return direct, direct_points
+        
+        route = self.route_table.route(start, end) if self.route_table is not None else None
+        if route is None:
+            sources = self._corner_costs(start.x, start.y)
+            if self.route_cache is not None:
+                route = self._cached_route(sources, self._corner_costs(end.x, end.y))
+            elif self.hierarchy is not None:
+                route = self.hierarchy.route(sources, self._corner_costs(end.x, end.y))
+            else:
+                route = astar(graph, sources, self._corner_costs(end.x, end.y))
+        
+        length, nodes = route
+        if not nodes:
+            # Cel odcięty od sieci ulic - jak GridRoute
+            return direct, direct_points
+        
+        return length, path_points(graph, (start.x, start.y), nodes, (end.x, end.y))
+    
+    def _cached_route(self, sources: Dict[int, float], exits: Dict[int, float]) -> Tuple[float, List[int]]:
+        """
+        Najlepsza trasa po parach (róg startu, róg celu) z tras w cache
+        
+        Pary są sprawdzane rosnąco po dolnym ograniczeniu (dojazdy + dystans
+        Manhattan między rogami) - para, której ograniczenie nie jest lepsze
+        od znalezionej trasy, nie jest ani wyszukiwana, ani pobierana z cache.
+        
+        Args:
+            sources: Róg kwartału startu -> dojazd do niego
+            exits: Róg kwartału celu -> dojazd od niego do celu
+        
+        Returns:
+            tuple: (długość trasy z dojazdami, skrzyżowania) lub (inf, [])
+        """
+        graph = self.graph
+        pairs = sorted(
+            (origin_offset + graph.offset(*graph.node_xy(origin), destination) + destination_offset,
+             origin, origin_offset, destination, destination_offset)
+            for origin, origin_offset in sources.items()
+            for destination, destination_offset in exits.items()
+        )
+        
+        best_length, best_nodes = math.inf, ()
+        for bound, origin, origin_offset, destination, destination_offset in pairs:
+            if bound >= best_length:
+                break
+            
+            route = self.route_cache.get(origin, destination, self.courier_type)
+            if route is None:
+                if self.hierarchy is not None:
+                    length, nodes = self.hierarchy.route({origin: 0.0}, {destination: 0.0})
+                else:
+                    length, nodes = astar(graph, {origin: 0.0}, {destination: 0.0})
+                route = (length, tuple(nodes))
+                self.route_cache.put(origin, destination, self.courier_type, route)
+            
+            length = origin_offset + route[0] + destination_offset
+            if length < best_length:
+                best_length, best_nodes = length, route[1]
+        
+        return best_length, list(best_nodes)
+    
+    def _corner_costs(self, x: float, y: float) -> Dict[int, float]:
+        """
+        Rogi kwartału punktu -> dojazd (Manhattan) między punktem a rogiem
+        
+        Dla startu to skrzyżowania, w których trasa wjeżdża do sieci ulic,
+        a dla celu - w których z niej zjeżdża.
+        """
+        return {node: self.graph.offset(x, y, node) for node in self.graph.corner_nodes(x, y)}
+    
+    def _corner_arrays(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rogi kwartałów wielu punktów naraz (zamknięte rogi mają dojazd inf)
+        
+        Args:
+            points: Tablica (C, 2) punktów
+        
+        Returns:
+            tuple: (węzły (C, 4), dojazdy Manhattan (C, 4))
+        """
+        graph = self.graph
+        column = np.clip(points[:, 0] / graph.spacing, 0, graph.columns - 1)
+        row = np.clip(points[:, 1] / graph.spacing, 0, graph.rows - 1)
+        columns = np.stack((np.floor(column), np.ceil(column), np.floor(column), np.ceil(column)), axis=1)
+        rows = np.stack((np.floor(row), np.floor(row), np.ceil(row), np.ceil(row)), axis=1)
+        corners = (rows * graph.columns + columns).astype(np.int64)
+        offsets = (np.abs(columns * graph.spacing - points[:, 0:1]) +
+                   np.abs(rows * graph.spacing - points[:, 1:2]))
+        offsets = np.where(graph.open[corners], offsets, np.inf)
+        
+        # Wszystkie rogi zamknięte - najbliższe otwarte skrzyżowanie
+        for index in np.flatnonzero(np.isinf(offsets).all(axis=1)):
+            node = graph.nearest_open_node(points[index, 0], points[index, 1])
+            corners[index] = node
+            offsets[index] = graph.offset(points[index, 0], points[index, 1], node)
+        
+        return corners, offsets
+    
+    def _same_block(self, points: np.ndarray, x: float, y: float) -> np.ndarray:
+        """
+        Czy punkty mają wspólny kwartał z (x, y)
+        
+        Punkt na ulicy należy do obu przylegających kwartałów, ale sąsiednie
+        kwartały (wspólna tylko ulica) nie są tym samym kwartałem.
+        
+        Args:
+            points: Tablica (C, 2) punktów
+            x: Współrzędna X punktu odniesienia
+            y: Współrzędna Y punktu odniesienia
+        
+        Returns:
+            np.ndarray: Maska (C,)
+        """
+        # Kwartały zawierające współrzędną c (w jednostkach siatki): od ceil(c) - 1 do floor(c)
+        spacing = self.graph.spacing
+        column, row = x / spacing, y / spacing
+        point_columns = points[:, 0] / spacing
+        point_rows = points[:, 1] / spacing
+        return ((np.maximum(np.ceil(point_columns) - 1, math.ceil(column) - 1) <=
+                 np.minimum(np.floor(point_columns), math.floor(column))) &
+                (np.maximum(np.ceil(point_rows) - 1, math.ceil(row) - 1) <=
+                 np.minimum(np.floor(point_rows), math.floor(row))))
+    
+    def __repr__(self) -> str:
+        return f"StreetRoute({self.graph!r})"
+
+
+def walk_polyline(location: 'Location', points: List[Tuple[float, float]], distance: float) -> float:
+    """
+    Przesuwa lokalizację w miejscu wzdłuż łamanej o odcinkach poziomych i pionowych
+    
+    Args:
+        location: Lokalizacja (równa pierwszemu wierzchołkowi łamanej)
+        points: Wierzchołki łamanej
+        distance: Maksymalny dystans przesunięcia
+    
+    Returns:
+        float: Przebyty dystans (mniejszy tylko na końcu łamanej)
+    """
+    remaining = distance
+    x, y = points[0]
+    for next_x, next_y in points[1:]:
+        segment = abs(next_x - x) + abs(next_y - y)
+        if segment >= remaining:
+            if segment > 0:
+                ratio = remaining / segment
+                x += (next_x - x) * ratio
+                y += (next_y - y) * ratio
+            remaining = 0.0
+            break
+        remaining -= segment
+        x, y = next_x, next_y
+    
+    location.x = x
+    location.y = y
+    return distance - remaining
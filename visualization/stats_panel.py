@@ -90,6 +90,7 @@ class StatsPanel:
             f"  Total: {order_stats['total_orders']}",
             f"  Delivered: {order_stats['delivered_orders']}",
             f"  Cancelled: {order_stats['cancelled_orders']}",
+            f"  Requeued: {order_stats['requeued_orders']}",
             f"  Active: {order_stats['active_orders']}",
             f"  Pending: {order_stats['pending_orders']}",
             f"  Avg time: {order_stats['average_delivery_time']:.1f}s"
@@ -105,9 +106,9 @@ class StatsPanel:
         self._render_text(screen, "COURIERS", self.x + 10, y_offset, self.font_normal, COLOR_UI_HEADER)
         y_offset += 25
         
-        available = len(engine.courier_manager.get_available_couriers())
-        active = len(engine.courier_manager.get_active_couriers())
-        total_accidents = sum(c.accidents for c in engine.couriers)
+        available = engine.courier_manager.num_available
+        active = engine.courier_manager.num_active
+        total_accidents = engine.courier_manager.total_accidents
         
         courier_text = [
             f"  Available: {available}",
@@ -5,6 +5,8 @@ Demonstracja wzorca Strategy i Open/Closed Principle
 """
 
 from abc import ABC, abstractmethod
+from typing import FrozenSet
+import config
 
 
 class WeatherCondition(ABC):
@@ -20,6 +22,12 @@ class WeatherCondition(ABC):
     - Interface Segregation: minimalny interfejs
     """
     
+    def __init__(self):
+        """Wylicza raz zbiór uziemionych typów kurierów (z config)"""
+        self._grounded_courier_types: FrozenSet[str] = frozenset(
+            config.WEATHER_GROUNDED_COURIER_TYPES.get(self.get_name(), ())
+        )
+    
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -80,6 +88,15 @@ class WeatherCondition(ABC):
         """
         pass
     
+    def get_grounded_courier_types(self) -> FrozenSet[str]:
+        """
+        Typy kurierów które nie mogą pracować w tej pogodzie
+        
+        Returns:
+            frozenset: Uziemione typy (np. {"drone"} w deszczu)
+        """
+        return self._grounded_courier_types
+    
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
     